@@ -37,7 +37,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import m5
-from m5.objects import *
+from m5.objects import BaseCPU, RedirectPath
 from m5.util.convert import *
 
 from functools import reduce
@@ -122,7 +122,18 @@
 import argparse
 
 import m5
-from m5.objects import *
+from m5.objects import (
+    AddrRange,
+    BadAddr,
+    Bridge,
+    CommMonitor,
+    NoncoherentXBar,
+    Self,
+    SerialLink,
+    SrcClockDomain,
+    SubSystem,
+    VoltageDomain,
+)
 from m5.util import *
 
 
@@ -61,6 +61,11 @@ class ObjectList(object):
         """Get a sub class from a user provided class name or alias."""
 
         real_name = self._aliases.get(name, name)
+        if self._objects is None and real_name in dir(m5.objects):
+            # Avoid importing every SimObject module to find one class
+            cls = getattr(m5.objects, real_name)
+            if self._is_obj_class(cls):
+                return cls
         try:
             sub_cls = self._sub_classes[real_name]
             return sub_cls
@@ -106,18 +111,33 @@ class ObjectList(object):
                 if target in self._sub_classes:
                     self._aliases[alias] = target
 
+    @property
+    def _sub_classes(self):
+        # Finding the sub-classes imports every SimObject module, so it is
+        # only done once the list is needed
+        if self._objects is None:
+            self._objects = {}
+            self._add_objects()
+        return self._objects
+
+    @property
+    def _aliases(self):
+        if self._filtered_aliases is None:
+            self._filtered_aliases = {}
+            self._add_aliases(self._all_aliases)
+        return self._filtered_aliases
+
     def __init__(self, base_cls, aliases=None):
         # Base class that will be used to determine if models are of this
         # object class
         self.base_cls = base_cls
         # Dictionary that maps names of real models to classes
-        self._sub_classes = {}
-        self._add_objects()
+        self._objects = None
 
         # Filtered list of aliases. Only aliases for existing objects exist
         # in this list.
-        self._aliases = {}
-        self._add_aliases(aliases)
+        self._all_aliases = aliases
+        self._filtered_aliases = None
 
 
 class CPUList(ObjectList):
@@ -163,7 +183,6 @@ class EnumList(ObjectList):
 
     def _add_objects(self):
         """Add all enum values to the ObjectList"""
-        self._sub_classes = {}
         for (key, value) in list(self.base_cls.__members__.items()):
             # All Enums have a value Num_NAME at the end which we
             # do not want to include
@@ -190,14 +209,13 @@ platform_list = ObjectList(
 
 
 def _subclass_tester(name):
-    sub_class = getattr(m5.objects, name, None)
-
+    # The class is looked up on first use, as probing m5.objects for a
+    # class this build doesn't know imports every SimObject module
     def tester(cls):
-        return (
-            sub_class is not None
-            and cls is not None
-            and issubclass(cls, sub_class)
-        )
+        if cls is None:
+            return False
+        sub_class = getattr(m5.objects, name, None)
+        return sub_class is not None and issubclass(cls, sub_class)
 
     return tester
 
@@ -37,10 +37,10 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import argparse
+import sys
 
 import m5
 from m5.defines import buildEnv
-from m5.objects import *
 
 from common.Benchmarks import *
 from common import ObjectList
@@ -129,11 +129,12 @@ def addNoISAOptions(parser):
         nargs=0,
         help="List available memory types",
     )
+    # No choices: listing the memory types imports every SimObject module.
+    # ObjectList.mem_list.get() rejects unknown types instead.
     parser.add_argument(
         "--mem-type",
         default="DDR3_1600_8x8",
-        choices=ObjectList.mem_list.get_names(),
-        help="type of memory to use",
+        help="type of memory to use (see --list-mem-types)",
     )
     parser.add_argument(
         "--mem-channels", type=int, default=1, help="number of memory channels"
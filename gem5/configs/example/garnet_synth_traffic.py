@@ -27,15 +27,24 @@
 # Author: Tushar Krishna
 
 import m5
-from m5.objects import *
+from m5.objects import (
+    AddrRange,
+    GarnetSyntheticTraffic,
+    GarnetTraceTraffic,
+    Root,
+    SrcClockDomain,
+    System,
+    VoltageDomain,
+)
 from m5.defines import buildEnv
 from m5.util import addToPath
-import os, argparse, sys
+import os, argparse, sys, traceback
 
 addToPath("../")
 
 from common import Options
 from ruby import Ruby
+from network.GarnetStats import GarnetStats, STATS_FILE
 
 # Get paths we might need.  It's expected this file is in m5/configs/example.
 config_path = os.path.dirname(os.path.abspath(__file__))
@@ -57,7 +66,13 @@ parser.add_argument(
         "neighbor",
         "shuffle",
         "transpose",
+        "fattree_intra_pod",
+        "fattree_inter_pod",
+        "fattree_pod_permutation",
+        "fattree_stride",
+        "fattree_hotspot",
     ],
+    help="Traffic pattern; the fattree_* patterns need --topology=FatTree",
 )
 
 parser.add_argument(
@@ -79,10 +94,38 @@ parser.add_argument(
                         for injection rate",
 )
 
+parser.add_argument(
+    "--injection-process",
+    default="bernoulli",
+    choices=["bernoulli", "geometric"],
+    help="bernoulli: every node draws whether to inject each cycle \
+                        (rate quantized to --precision digits); \
+                        geometric: every node draws the cycles to its next \
+                        injection and sleeps until then (exact rate, \
+                        faster at low load)",
+)
+
 parser.add_argument(
     "--sim-cycles", type=int, default=1000, help="Number of simulation cycles"
 )
 
+parser.add_argument(
+    "--warmup-cycles",
+    type=int,
+    default=0,
+    help="Network cycles before the network stats are reset",
+)
+
+parser.add_argument(
+    "--measure-cycles",
+    type=int,
+    default=0,
+    help="Network cycles in which injected packets are measured after\
+                        warm-up. The simulation ends once they are\
+                        received; --sim-cycles only caps the run.\
+                        Set to 0 to measure until --sim-cycles.",
+)
+
 parser.add_argument(
     "--num-packets-max",
     type=int,
@@ -117,6 +160,40 @@ parser.add_argument(
                         Set to -1 to inject randomly in all vnets.",
 )
 
+parser.add_argument(
+    "--trace",
+    type=str,
+    default=None,
+    help="Inject the packets of this binary trace (see\
+                        util/encode_garnet_trace.py) instead of\
+                        synthetic traffic.",
+)
+
+parser.add_argument(
+    "--sweep-rates",
+    type=str,
+    default=None,
+    help="Comma-separated injection rates. The system is instantiated\
+                        once and one child simulation per rate (and per\
+                        --sweep-synthetic pattern) is forked from it, each\
+                        writing to <outdir>/<pattern>-<rate>.",
+)
+
+parser.add_argument(
+    "--sweep-synthetic",
+    type=str,
+    default=None,
+    help="Comma-separated traffic patterns to sweep (default:\
+                        --synthetic)",
+)
+
+parser.add_argument(
+    "--sweep-jobs",
+    type=int,
+    default=os.cpu_count(),
+    help="Number of sweep children simulating at the same time",
+)
+
 #
 # Add the ruby specific and protocol specific options
 #
@@ -124,20 +201,78 @@ Ruby.define_options(parser)
 
 args = parser.parse_args()
 
-cpus = [
-    GarnetSyntheticTraffic(
-        num_packets_max=args.num_packets_max,
-        single_sender=args.single_sender_id,
-        single_dest=args.single_dest_id,
-        sim_cycles=args.sim_cycles,
-        traffic_type=args.synthetic,
-        inj_rate=args.injectionrate,
-        inj_vnet=args.inj_vnet,
-        precision=args.precision,
-        num_dest=args.num_dirs,
+if (
+    args.measure_cycles > 0
+    and args.sim_cycles <= args.warmup_cycles + args.measure_cycles
+):
+    parser.error(
+        "--sim-cycles must exceed --warmup-cycles + --measure-cycles "
+        "to leave time for the measured packets to drain"
     )
-    for i in range(args.num_cpus)
-]
+
+# Sweep points as (pattern, rate)
+sweep = []
+if args.sweep_rates:
+    if args.trace:
+        parser.error("--sweep-rates needs synthetic traffic, not --trace")
+    if args.sweep_jobs < 1:
+        parser.error("--sweep-jobs must be at least 1")
+    patterns = (args.sweep_synthetic or args.synthetic).split(",")
+    sweep = [
+        (pattern, float(rate))
+        for pattern in patterns
+        for rate in args.sweep_rates.split(",")
+    ]
+    args.synthetic = patterns[0]
+else:
+    patterns = [args.synthetic]
+
+# The FatTree patterns pick destinations by the edge routers the testers
+# and the directories attach to
+fattree_args = {}
+fattree_patterns = [p for p in patterns if p.startswith("fattree_")]
+if fattree_patterns:
+    if args.topology != "FatTree":
+        parser.error(
+            f"--synthetic={fattree_patterns[0]} needs --topology=FatTree"
+        )
+    from topologies.FatTree import ext_node_routers
+
+    node_routers = ext_node_routers(
+        args.num_cpus + args.num_dirs, args.num_pods
+    )
+    fattree_args = dict(
+        num_pods=args.num_pods, dest_routers=node_routers[args.num_cpus :]
+    )
+
+if args.trace:
+    cpus = [
+        GarnetTraceTraffic(
+            trace_file=args.trace,
+            source_id=i,
+            num_dest=args.num_dirs,
+            sim_cycles=args.sim_cycles,
+        )
+        for i in range(args.num_cpus)
+    ]
+else:
+    cpus = [
+        GarnetSyntheticTraffic(
+            num_packets_max=args.num_packets_max,
+            single_sender=args.single_sender_id,
+            single_dest=args.single_dest_id,
+            sim_cycles=args.sim_cycles,
+            traffic_type=args.synthetic,
+            inj_rate=args.injectionrate,
+            inj_vnet=args.inj_vnet,
+            precision=args.precision,
+            injection_process=args.injection_process,
+            num_dest=args.num_dirs,
+            src_router=node_routers[i] if fattree_args else -1,
+            **fattree_args,
+        )
+        for i in range(args.num_cpus)
+    ]
 
 # create the desired simulated system
 system = System(cpu=cpus, mem_ranges=[AddrRange(args.mem_size)])
@@ -157,6 +292,10 @@ system.ruby.clk_domain = SrcClockDomain(
     clock=args.ruby_clock, voltage_domain=system.voltage_domain
 )
 
+if args.network == "garnet":
+    system.ruby.network.warmup_cycles = args.warmup_cycles
+    system.ruby.network.measure_cycles = args.measure_cycles
+
 i = 0
 for ruby_port in system.ruby._cpu_ports:
     #
@@ -172,13 +311,117 @@ for ruby_port in system.ruby._cpu_ports:
 root = Root(full_system=False, system=system)
 root.system.mem_mode = "timing"
 
+# Event queues synchronize every quantum, one link latency
+if args.network_partitions > 1:
+    from m5.util.convert import toFrequency
+
+    root.sim_quantum = round(
+        args.link_latency * toFrequency("2GHz") / toFrequency(args.ruby_clock)
+    )
+
 # Not much point in this being higher than the L1 latency
 m5.ticks.setGlobalFrequency("2GHz")
 
+# The sweep children are forked, which needs the listeners off
+if sweep:
+    m5.disableAllListeners()
+
 # instantiate configuration
 m5.instantiate()
 
-# simulate until program terminates
-exit_event = m5.simulate(args.abs_max_tick)
 
-print("Exiting @ tick", m5.curTick(), "because", exit_event.getCause())
+def simulate():
+    # simulate until program terminates
+    exit_event = m5.simulate(args.abs_max_tick)
+
+    print("Exiting @ tick", m5.curTick(), "because", exit_event.getCause())
+
+    # Structured network stats for sweep drivers (see network/GarnetStats.py)
+    if args.network == "garnet":
+        GarnetStats.collect(system).dump(
+            os.path.join(m5.options.outdir, STATS_FILE)
+        )
+
+
+# Traceback of a sweep point whose simulation raised, in its outdir
+SWEEP_ERROR_FILE = "sweep_error.txt"
+
+
+def sweep_outdir(pattern, rate):
+    return os.path.join(m5.options.outdir, f"{pattern}-{rate:g}")
+
+
+def run_sweep():
+    """Fork a child simulation per sweep point from the instantiated (and
+    never simulated) system, at most --sweep-jobs at a time. The children
+    only pay for the simulation itself, not for building the system.
+
+    The per-point results are the GarnetStats records in the children's
+    output directories; the stats text file is opened once by the parent
+    and is not written by the children. With --injection-process=geometric
+    the random draws of a child differ from those of a standalone run.
+    """
+    running = {}
+    failed = []
+
+    def reap():
+        pid, status = os.wait()
+        point = running.pop(pid)
+        if status != 0:
+            failed.append(point)
+
+    for pattern, rate in sweep:
+        while len(running) >= args.sweep_jobs:
+            reap()
+        outdir = sweep_outdir(pattern, rate)
+        pid = m5.fork(outdir)
+        if pid == 0:
+            status = 1
+            try:
+                for cpu in cpus:
+                    cpu.setTrafficType(pattern)
+                    cpu.setInjectionRate(rate)
+                simulate()
+                status = 0
+            except BaseException:
+                # The parent only learns the exit status, keep the reason
+                # next to the point's other output
+                traceback.print_exc()
+                os.makedirs(outdir, exist_ok=True)
+                with open(os.path.join(outdir, SWEEP_ERROR_FILE), "w") as f:
+                    traceback.print_exc(file=f)
+            finally:
+                # Skip the exit handlers, the parent owns the stats file
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(status)
+        running[pid] = (pattern, rate, outdir)
+    while running:
+        reap()
+
+    if args.network == "garnet":
+        print(f"{'pattern':<24} {'rate':>8} {'latency':>10} {'received':>10}")
+        for pattern, rate in sweep:
+            path = os.path.join(sweep_outdir(pattern, rate), STATS_FILE)
+            try:
+                stats = GarnetStats.load(path)
+            except (OSError, ValueError):
+                continue
+            print(
+                f"{pattern:<24} {rate:8g} "
+                f"{stats.average_packet_latency:10.2f} "
+                f"{stats.reception_rate:10.4f}"
+            )
+    for pattern, rate, outdir in failed:
+        # A simulator error rather than a Python one only goes to stderr
+        error_file = os.path.join(outdir, SWEEP_ERROR_FILE)
+        see = error_file if os.path.exists(error_file) else outdir
+        print(f"sweep point {pattern} at rate {rate:g} failed, see {see}")
+    if failed:
+        sys.exit(1)
+
+
+if sweep:
+    run_sweep()
+else:
+    simulate()
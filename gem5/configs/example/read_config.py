@@ -57,7 +57,7 @@ import m5.ticks as ticks
 
 sim_object_classes_by_name = {
     cls.__name__: cls
-    for cls in list(m5.objects.__dict__.values())
+    for cls in (getattr(m5.objects, name) for name in m5.objects.__all__)
     if inspect.isclass(cls) and issubclass(cls, m5.objects.SimObject)
 }
 
@@ -0,0 +1,143 @@
+"""Structured access to the Garnet network statistics.
+
+``GarnetStats.collect(system)`` reads ``system.ruby.network.*`` straight
+from the m5 stats registry once ``m5.simulate()`` has returned, so sweep
+drivers do not have to scrape stats.txt.  ``dump()`` writes the record as
+an ``m5.ext.pystats`` SimStat JSON file and ``load()`` reads such a file
+back with nothing but the standard library, which lets host-side tools use
+this module without a gem5 binary.
+"""
+
+import json
+from dataclasses import dataclass, fields
+
+# Name of the file garnet_synth_traffic.py writes into its output directory
+STATS_FILE = "garnet_stats.json"
+
+_DESCRIPTIONS = {
+    "packets_injected": ("Count", "Packets injected into the network"),
+    "packets_received": ("Count", "Packets received from the network"),
+    "average_packet_queueing_latency": (
+        "Cycle",
+        "Average queueing latency of packets",
+    ),
+    "average_packet_network_latency": (
+        "Cycle",
+        "Average network latency of packets",
+    ),
+    "average_packet_latency": ("Cycle", "Average latency of packets"),
+    "average_hops": ("Count", "Average number of hops traversed by flits"),
+    "reception_rate": (
+        "Count/Cycle",
+        "Packets received per node per cycle",
+    ),
+    "num_nodes": ("Count", "Number of traffic injecting nodes"),
+    "sim_cycles": ("Cycle", "Network cycles covered by the statistics"),
+}
+
+
+@dataclass
+class GarnetStats:
+    """Network-wide statistics of one Garnet run.
+
+    Latencies are in network (ruby) cycles and are averaged over all
+    received packets of all vnets.
+    """
+
+    packets_injected: float
+    packets_received: float
+    average_packet_queueing_latency: float
+    average_packet_network_latency: float
+    average_packet_latency: float
+    average_hops: float
+    reception_rate: float
+    num_nodes: int
+    sim_cycles: float
+
+    @classmethod
+    def collect(cls, system, num_nodes=None):
+        """Build the record from the live stats of ``system.ruby.network``.
+
+        ``num_nodes`` defaults to the number of CPUs (traffic generators)
+        of the system.
+        """
+        import m5
+
+        prefix = system.ruby.network.path()
+        cycle_ticks = system.ruby.clk_domain.clock[0].getValue()
+
+        def total(stat_name):
+            try:
+                stat = m5.stats.stats_dict[f"{prefix}.{stat_name}"]
+            except KeyError:
+                raise KeyError(f"Garnet stat '{stat_name}' not found")
+            return float(stat.total)
+
+        def ratio(num, denom):
+            return num / denom if denom else float("nan")
+
+        if num_nodes is None:
+            num_nodes = len(system.cpu)
+
+        received = total("packets_received")
+        network_latency = ratio(
+            total("packet_network_latency") / cycle_ticks, received
+        )
+        queueing_latency = ratio(
+            total("packet_queueing_latency") / cycle_ticks, received
+        )
+        # With a measurement window the stats only cover the packets
+        # created inside it (see GarnetNetwork.measure_cycles). A run can
+        # also end inside the window, e.g. on convergence or at
+        # --sim-cycles, which then only covers the part that elapsed.
+        network = system.ruby.network
+        sim_cycles = max(
+            0.0, m5.curTick() / cycle_ticks - int(network.warmup_cycles)
+        )
+        if int(network.measure_cycles) > 0:
+            sim_cycles = min(sim_cycles, float(int(network.measure_cycles)))
+
+        return cls(
+            packets_injected=total("packets_injected"),
+            packets_received=received,
+            average_packet_queueing_latency=queueing_latency,
+            average_packet_network_latency=network_latency,
+            average_packet_latency=network_latency + queueing_latency,
+            average_hops=total("average_hops"),
+            reception_rate=ratio(received, num_nodes * sim_cycles),
+            num_nodes=num_nodes,
+            sim_cycles=sim_cycles,
+        )
+
+    def to_simstat(self):
+        """The record as an ``m5.ext.pystats`` SimStat."""
+        from m5.ext.pystats.group import Group
+        from m5.ext.pystats.simstat import SimStat
+        from m5.ext.pystats.statistic import Scalar
+
+        stats = {
+            f.name: Scalar(
+                value=getattr(self, f.name),
+                unit=_DESCRIPTIONS[f.name][0],
+                description=_DESCRIPTIONS[f.name][1],
+            )
+            for f in fields(self)
+        }
+        return SimStat(network=Group(**stats))
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            self.to_simstat().dump(f)
+
+    @classmethod
+    def load(cls, path):
+        """Read a record written by ``dump()``.
+
+        Raises ValueError if the file does not hold every field.
+        """
+        with open(path) as f:
+            network = json.load(f).get("network", {})
+        missing = [f.name for f in fields(cls) if f.name not in network]
+        if missing:
+            raise ValueError(f"{path}: missing stats {', '.join(missing)}")
+        return cls(**{f.name: network[f.name]["value"] for f in fields(cls)})
@@ -26,7 +26,20 @@
 
 import math
 import m5
-from m5.objects import *
+from m5.objects import (
+    FaultModel,
+    GarnetExtLink,
+    GarnetIntLink,
+    GarnetNetwork,
+    GarnetNetworkInterface,
+    GarnetRouter,
+    NetworkBridge,
+    SimpleExtLink,
+    SimpleIntLink,
+    SimpleNetwork,
+    Switch,
+    SwitchAllocatorPolicy,
+)
 from m5.defines import buildEnv
 from m5.util import addToPath, fatal, warn
 
@@ -95,7 +108,9 @@ def define_options(parser):
         help="""routing algorithm in network.
             0: weight-based table
             1: XY (for Mesh. see garnet/RoutingUnit.cc)
-            2: Custom (see garnet/RoutingUnit.cc""",
+            2: Custom (see garnet/RoutingUnit.cc)
+            3: FatTree, 4: FatTree adaptive
+            5: FoldedClos tree, 6: FoldedClos tree adaptive""",
     )
     parser.add_argument(
         "--network-fault-model",
@@ -118,6 +133,65 @@ def define_options(parser):
         help="""SimpleNetwork links uses a separate physical
             channel for each virtual network""",
     )
+    parser.add_argument(
+        "--convergence-window",
+        type=int,
+        default=0,
+        help="""garnet: sample latency and throughput every this many
+            cycles and stop the simulation once they converged or the
+            network saturated (0 disables early termination).""",
+    )
+    parser.add_argument(
+        "--convergence-tolerance",
+        type=float,
+        default=0.05,
+        help="""garnet: relative 95%% confidence interval half-width
+            at which latency and throughput count as converged.""",
+    )
+    parser.add_argument(
+        "--convergence-min-windows",
+        type=int,
+        default=5,
+        help="garnet: sample windows needed before stopping early.",
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=int,
+        default=0,
+        help="""garnet: write the flits buffered per router, flits sent
+            per link and stall cycles per VC to garnet_samples.bin every
+            this many cycles (0 disables sampling, see
+            util/garnet_samples.py).""",
+    )
+    parser.add_argument(
+        "--activity-tracking",
+        action="store_true",
+        default=False,
+        help="""garnet: routers only visit ports with pending flits or
+            credits, and idle routers and NIs stay off the event queue.""",
+    )
+    parser.add_argument(
+        "--switch-allocator",
+        default="round_robin",
+        choices=SwitchAllocatorPolicy.vals,
+        help="""garnet: switch allocation policy. bitmask makes the same
+            decisions as round_robin on request bitmasks; islip runs
+            iterative matching.""",
+    )
+    parser.add_argument(
+        "--islip-iterations",
+        type=int,
+        default=1,
+        help="garnet: iSLIP matching iterations per cycle.",
+    )
+    parser.add_argument(
+        "--network-partitions",
+        type=int,
+        default=1,
+        help="""garnet: number of event queues (host threads) to spread
+            the routers over. Links between them need at least one
+            quantum of latency.""",
+    )
     ### Lab 4: Add Pod Number for Fat Tree Topology
     parser.add_argument(
         "--num-pods",
@@ -125,6 +199,20 @@ def define_options(parser):
         default=4,
         help="number of pods in the Fat Tree topology",
     )
+    parser.add_argument(
+        "--tree-children",
+        default="4,4,4",
+        help="""children per switch of each level of the FoldedClos
+            topology, from the edge switches up; the first entry is the
+            number of hosts per edge switch""",
+    )
+    parser.add_argument(
+        "--tree-parents",
+        default="4,4",
+        help="""parents per switch of each level of the FoldedClos
+            topology but the top one; fewer parents than children
+            oversubscribe the level""",
+    )
 
 
 def create_network(options, ruby):
@@ -177,6 +265,13 @@ def init_network(options, network, InterfaceClass):
         network.ni_flit_size = options.link_width_bits / 8
         network.routing_algorithm = options.routing_algorithm
         network.garnet_deadlock_threshold = options.garnet_deadlock_threshold
+        network.convergence_window = options.convergence_window
+        network.convergence_tolerance = options.convergence_tolerance
+        network.convergence_min_windows = options.convergence_min_windows
+        network.sample_interval = options.sample_interval
+        network.activity_tracking = options.activity_tracking
+        network.switch_allocator = options.switch_allocator
+        network.islip_iterations = options.islip_iterations
 
         # Create Bridges and connect them to the corresponding links
         for intLink in network.int_links:
@@ -287,3 +382,87 @@ def init_network(options, network, InterfaceClass):
         assert options.network == "garnet"
         network.enable_fault_model = True
         network.fault_model = FaultModel()
+
+
+def partition_network(options, network, topology):
+    """Spread the routers over options.network_partitions event queues.
+
+    Links run on the event queue of their source and hand their flits over
+    at arrival, so a link only needs its latency to cover the simulation
+    quantum. The network interfaces stay on event queue 0 with the
+    controllers they exchange messages with.
+    """
+    num_partitions = options.network_partitions
+    if num_partitions <= 1:
+        return
+    if options.network != "garnet":
+        fatal("--network-partitions needs --network=garnet")
+
+    partitions = topology.partitionRouters(
+        options, network.routers, num_partitions
+    )
+    router_partition = {}
+    for router, index in zip(network.routers, partitions):
+        router.eventq_index = index
+        router_partition[router.router_id] = index
+
+    # A link runs on the event queue of its source and hands its flits
+    # over to the other end. A bridge sits on the event queue of the
+    # router or NI at its end, next to the bridge it shares its credit
+    # bookkeeping with and the object it delivers to.
+    def place(link, src_bridge, dst_bridge, src, dst):
+        link.eventq_index = src
+        src_bridge.eventq_index = src
+        dst_bridge.eventq_index = dst
+
+    for link in network.int_links:
+        src = router_partition[link.src_node.router_id]
+        dst = router_partition[link.dst_node.router_id]
+        place(
+            link.network_link,
+            link.src_net_bridge,
+            link.dst_net_bridge,
+            src,
+            dst,
+        )
+        # credits flow from the destination back to the source
+        place(
+            link.credit_link,
+            link.dst_cred_bridge,
+            link.src_cred_bridge,
+            dst,
+            src,
+        )
+
+    for link in network.ext_links:
+        router = router_partition[link.int_node.router_id]
+        # In: the NI sends flits and the router credits
+        place(
+            link.network_links[0],
+            link.ext_net_bridge[0],
+            link.int_net_bridge[0],
+            0,
+            router,
+        )
+        place(
+            link.credit_links[0],
+            link.int_cred_bridge[0],
+            link.ext_cred_bridge[0],
+            router,
+            0,
+        )
+        # Out: the router sends flits and the NI credits
+        place(
+            link.network_links[1],
+            link.int_net_bridge[1],
+            link.ext_net_bridge[1],
+            router,
+            0,
+        )
+        place(
+            link.credit_links[1],
+            link.ext_cred_bridge[1],
+            link.int_cred_bridge[1],
+            0,
+            router,
+        )
@@ -26,9 +26,14 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import m5
-from m5.objects import *
+from m5.objects import (
+    L1Cache_Controller,
+    MessageBuffer,
+    RubyCache,
+    RubySequencer,
+)
 from m5.defines import buildEnv
-from m5.util import addToPath
+from m5.util import addToPath, panic
 from .Ruby import create_topology, create_directories
 
 #
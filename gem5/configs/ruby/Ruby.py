@@ -39,7 +39,14 @@
 
 import math
 import m5
-from m5.objects import *
+from m5.objects import (
+    DRAMInterface,
+    IOXBar,
+    RubyDirectoryMemory,
+    RubyPortProxy,
+    RubySystem,
+    SimpleMemory,
+)
 from m5.defines import buildEnv
 from m5.util import addToPath, fatal
 from gem5.isas import ISA
@@ -264,6 +271,7 @@ def create_system(
 
     # Initialize network based on topology
     Network.init_network(options, network, InterfaceClass)
+    Network.partition_network(options, network, topology)
 
     # Create a port proxy for connecting the system port. This is
     # independent of the protocol and kept in the protocol-agnostic
@@ -299,6 +307,9 @@ def create_system(
 
 
 def create_directories(options, bootmem, ruby_system, system):
+    # Only the protocols using this function define a Directory_Controller
+    from m5.objects import Directory_Controller
+
     dir_cntrl_nodes = []
     for i in range(options.num_dirs):
         dir_cntrl = Directory_Controller()
@@ -47,6 +47,18 @@ class BaseTopology(object):
         """
         m5.util.fatal("BaseTopology should have been overridden!!")
 
+    def partitionRouters(self, options, routers, num_partitions):
+        """Called from configs/network/Network.py
+        Returns the event queue of each router when the network is
+        simulated on num_partitions event queues. Every link between two
+        event queues has to cover a simulation quantum, so routers that
+        exchange much traffic should share one. The default splits the
+        routers into contiguous blocks of router ids.
+        """
+        return [
+            i * num_partitions // len(routers) for i in range(len(routers))
+        ]
+
     def registerTopology(self, options):
         """Called from configs/ruby/Ruby.py
         There is no return value. This should only be called in
@@ -74,3 +86,30 @@ class SimpleTopology(BaseTopology):
 
     def __len__(self):
         return len(self.nodes)
+
+    def makeIntLinks(self, options, network, IntLink, rows, first_link_id):
+        """Creates the internal links from (src router id, dst router id,
+        src outport, dst inport, latency, weight) rows, with ids from
+        first_link_id on. network.routers must be indexed by router id.
+        Garnet takes the rows as a link table (see GarnetNetwork.py), which
+        is much faster to build and instantiate for topologies with
+        thousands of links than one IntLink object per link.
+        """
+        if options.network == "garnet":
+            network.set_int_link_table(rows, first_link_id)
+            return
+        routers = network.routers
+        int_links = []
+        for i, (src, dst, outport, inport, latency, weight) in enumerate(rows):
+            int_links.append(
+                IntLink(
+                    link_id=first_link_id + i,
+                    src_node=routers[src],
+                    dst_node=routers[dst],
+                    src_outport=outport,
+                    dst_inport=inport,
+                    latency=latency,
+                    weight=weight,
+                )
+            )
+        network.int_links = int_links
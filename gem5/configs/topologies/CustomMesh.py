@@ -38,7 +38,6 @@ import math
 
 from m5.util import fatal
 from m5.params import *
-from m5.objects import *
 
 from m5.defines import buildEnv
 
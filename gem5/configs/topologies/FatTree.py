@@ -1,210 +1,301 @@
-# Copyright (c) 2010 Advanced Micro Devices, Inc.
-#               2016 Georgia Institute of Technology
-# All rights reserved.
-#
-# Redistribution and use in source and binary forms, with or without
-# modification, are permitted provided that the following conditions are
-# met: redistributions of source code must retain the above copyright
-# notice, this list of conditions and the following disclaimer;
-# redistributions in binary form must reproduce the above copyright
-# notice, this list of conditions and the following disclaimer in the
-# documentation and/or other materials provided with the distribution;
-# neither the name of the copyright holders nor the names of its
-# contributors may be used to endorse or promote products derived from
-# this software without specific prior written permission.
-#
-# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
-# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
-# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
-# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
-# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
-# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
-# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
-# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
-# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
-# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
-# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
-
-from m5.params import *
-from m5.objects import *
-
-from common import FileSystemConfig
-
-from topologies.BaseTopology import SimpleTopology
-
-# Creates FatTree Topology.
-# Uses FatTreeAdaptive routing.
-
-
-class FatTree(SimpleTopology):
-    description = "FatTree"
-
-    def __init__(self, controllers):
-        self.nodes = controllers
-
-    # Makes a generic mesh
-    # assuming an equal number of cache and directory cntrls
-
-    def makeTopology(self, options, network, IntLink, ExtLink, Router):
-        # Router is the class of router, here it is GarnetRouter
-        nodes = self.nodes
-
-        num_cpus = options.num_cpus
-        num_degree = options.num_pods # k
-        half_degree = (num_degree // 2) # k / 2
-
-        # Structure of the FatTree:
-        # - Edge layer having k ^ 2 / 2 nodes
-        # - Aggregation layer having k ^ 2 / 2 nodes
-        # - Core layer having k ^ 2 / 4 nodes 
-        # - k pods, each pod containing k / 2 edge switches and k / 2 aggregation switches
-        num_edge_layer = half_degree * num_degree 
-        num_agg_layer = half_degree * num_degree 
-        num_core_layer = half_degree ** 2 
-        num_routers = num_edge_layer + num_agg_layer + num_core_layer
-        # print(f"num_routers: {num_routers}")
-        # assert num_routers == num_cpus
-
-        # Default values for link latency and router latency.
-        # Can be over-ridden on a per link/router basis
-        link_latency = options.link_latency  # used by simple and garnet
-        router_latency = options.router_latency  # only used by garnet
-
-        # There must be an evenly divisible number of cntrls to routers
-        # Also, obviously the number or rows must be <= the number of routers
-        cntrls_per_router, remainder = divmod(len(nodes), num_edge_layer)
-
-        # Create the routers in the mesh
-        routers = [
-            Router(router_id=i, latency=router_latency)
-            for i in range(num_routers) # edge / agg / core
-        ]
-        network.routers = routers
-
-        # link counter to set unique link ids
-        link_count = 0
-
-        # Add all but the remainder nodes to the list of nodes to be uniformly
-        # distributed across the network.
-        network_nodes = []
-        remainder_nodes = []
-        for node_index in range(len(nodes)):
-            if node_index < (len(nodes) - remainder):
-                network_nodes.append(nodes[node_index])
-            else:
-                remainder_nodes.append(nodes[node_index])
-
-        # Connect each node to the appropriate router (only to edge routers)
-        ext_links = []
-        for (i, n) in enumerate(network_nodes):
-            cntrl_level, router_id = divmod(i, num_edge_layer)
-            assert cntrl_level < cntrls_per_router
-            ext_links.append(
-                ExtLink(
-                    link_id=link_count,
-                    ext_node=n,
-                    int_node=routers[router_id],
-                    latency=link_latency,
-                )
-            )
-            link_count += 1
-
-        # Connect the remainding nodes to router 0.  These should only be
-        # DMA nodes.
-        for (i, node) in enumerate(remainder_nodes):
-            # assert node.type == "DMA_Controller"
-            assert i < remainder
-            ext_links.append(
-                ExtLink(
-                    link_id=link_count,
-                    ext_node=node,
-                    int_node=routers[i],
-                    latency=link_latency,
-                )
-            )
-            link_count += 1
-
-        network.ext_links = ext_links
-
-        # Create the internal links.
-        int_links = []
-
-        # Router indexing: edge -> agg -> core
-        # (Edge, Agg) links (weight = 1)
-        for pod_id in range(num_degree):
-            for edge_router_id in range(half_degree):
-                for agg_router_id in range(half_degree):
-                    edge_out = (0) + edge_router_id + (pod_id * half_degree)
-                    agg_in = (num_edge_layer) + agg_router_id + (pod_id * half_degree)
-                    int_links.append(
-                        IntLink(
-                            link_id=link_count,
-                            src_node=routers[edge_out],
-                            dst_node=routers[agg_in],
-                            src_outport=f"Agg{agg_router_id}",
-                            dst_inport=f"Edge{edge_router_id}",
-                            latency=link_latency,
-                            weight=1,
-                        )
-                    )
-                    link_count += 1
-
-                    edge_in = (0) + edge_router_id + (pod_id * half_degree)
-                    agg_out = (num_edge_layer) + agg_router_id + (pod_id * half_degree)
-                    int_links.append(
-                        IntLink(
-                            link_id=link_count,
-                            src_node=routers[agg_out],
-                            dst_node=routers[edge_in],
-                            src_outport=f"Edge{edge_router_id}",
-                            dst_inport=f"Agg{agg_router_id}",
-                            latency=link_latency,
-                            weight=1,
-                        )
-                    )
-                    link_count += 1
-
-
-        # (Agg, Core) links (weight = 1)
-        for core_type in range(half_degree):
-            for core_router_id in range(half_degree):
-                for pod_id in range(num_degree):
-                    agg_router_id = core_type
-                    agg_out = (num_edge_layer) + agg_router_id + (pod_id * half_degree)
-                    core_in = (num_edge_layer + num_agg_layer) + core_router_id + (core_type * half_degree)
-                    int_links.append(
-                        IntLink(
-                            link_id=link_count,
-                            src_node=routers[agg_out],
-                            dst_node=routers[core_in],
-                            src_outport=f"Core{core_router_id}",
-                            dst_inport=f"Agg{pod_id}",
-                            latency=link_latency,
-                            weight=1,
-                        )
-                    )
-                    link_count += 1
-
-                    agg_in = (num_edge_layer) + agg_router_id + (pod_id * half_degree)
-                    core_out = (num_edge_layer + num_agg_layer) + core_router_id + (core_type * half_degree)
-                    int_links.append(
-                        IntLink(
-                            link_id=link_count,
-                            src_node=routers[core_out],
-                            dst_node=routers[agg_in],
-                            src_outport=f"Agg{pod_id}",
-                            dst_inport=f"Core{core_router_id}",
-                            latency=link_latency,
-                            weight=1,
-                        )
-                    )
-                    link_count += 1
-
-        network.int_links = int_links
-
-    # Register nodes with filesystem
-    def registerTopology(self, options):
-        for i in range(options.num_cpus):
-            FileSystemConfig.register_node(
-                [i], MemorySize(options.mem_size) // options.num_cpus, i
-            )
+# Copyright (c) 2010 Advanced Micro Devices, Inc.
+#               2016 Georgia Institute of Technology
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from m5.params import *
+
+from common import FileSystemConfig
+
+from topologies.BaseTopology import SimpleTopology
+
+import re
+
+# Creates FatTree Topology.
+# Uses FatTreeAdaptive routing.
+
+
+def fattree_routes(k):
+    """Routing tables of a k-ary FatTree, as built by
+    RoutingUnit::initFatTreeRoutes().
+
+    Returns {router_id: {dest_edge_router: (outport, up_outports)}} where
+    outport is the direction taken by deterministic FatTree routing and
+    up_outports lists the equal-cost upward directions adaptive routing
+    picks from (empty for downward hops).  A router has no entry for
+    itself.
+    """
+    half_k = k // 2
+    num_edge_layer = half_k * k
+    num_agg_layer = half_k * k
+    num_routers = num_edge_layer + num_agg_layer + half_k**2
+
+    tables = {}
+    for my_id in range(num_routers):
+        my_pos = my_id % half_k
+        if my_id < num_edge_layer:
+            up = [f"Agg{i}" for i in range(half_k)]
+        elif my_id < num_edge_layer + num_agg_layer:
+            up = [f"Core{i}" for i in range(half_k)]
+        else:
+            up = []
+        table = {}
+        for dest_id in range(num_edge_layer):
+            if dest_id == my_id:
+                continue
+            if my_id < num_edge_layer:
+                table[dest_id] = (f"Agg{my_pos}", up)
+            elif my_id < num_edge_layer + num_agg_layer:
+                my_pod = (my_id - num_edge_layer) // half_k
+                if dest_id // half_k == my_pod:
+                    table[dest_id] = (f"Edge{dest_id % half_k}", [])
+                else:
+                    table[dest_id] = (f"Core{my_pos}", up)
+            else:
+                table[dest_id] = (f"Agg{dest_id // half_k}", [])
+        tables[my_id] = table
+    return tables
+
+
+def ext_node_routers(num_nodes, k):
+    """Edge router of each of num_nodes controllers, in node order.
+
+    Mirrors the placement of FatTree.makeTopology(): nodes are spread
+    round-robin over the k * k / 2 edge routers and the remainder goes
+    to routers 0, 1, ...
+    """
+    num_edge_layer = (k // 2) * k
+    num_network_nodes = num_nodes - num_nodes % num_edge_layer
+    return [
+        i % num_edge_layer if i < num_network_nodes else i - num_network_nodes
+        for i in range(num_nodes)
+    ]
+
+
+_ROUTE_TRACE = re.compile(
+    r"FatTree route: router (\d+) dest (\d+) outport (\S+) up (\d)"
+)
+
+
+def check_route_trace(k, trace):
+    """Compare the routes printed by a --debug-flags=RubyNetwork run with
+    fattree_routes(k).
+
+    Returns a list of (router, dest, expected, found) mismatches;
+    routes missing from the trace are reported with found set to None.
+    """
+    expected = {
+        (router, dest): (outport, bool(up))
+        for router, table in fattree_routes(k).items()
+        for dest, (outport, up) in table.items()
+    }
+    found = {}
+    for line in trace:
+        match = _ROUTE_TRACE.search(line)
+        if match:
+            router, dest, outport, up = match.groups()
+            found[(int(router), int(dest))] = (outport, up == "1")
+    return [
+        (router, dest, route, found.get((router, dest)))
+        for (router, dest), route in sorted(expected.items())
+        if found.get((router, dest)) != route
+    ]
+
+
+class FatTree(SimpleTopology):
+    description = "FatTree"
+
+    def __init__(self, controllers):
+        self.nodes = controllers
+
+    # Makes a generic mesh
+    # assuming an equal number of cache and directory cntrls
+
+    def makeTopology(self, options, network, IntLink, ExtLink, Router):
+        # Router is the class of router, here it is GarnetRouter
+        nodes = self.nodes
+
+        num_cpus = options.num_cpus
+        num_degree = options.num_pods  # k
+        half_degree = num_degree // 2  # k / 2
+
+        # Structure of the FatTree:
+        # - Edge layer having k ^ 2 / 2 nodes
+        # - Aggregation layer having k ^ 2 / 2 nodes
+        # - Core layer having k ^ 2 / 4 nodes
+        # - k pods, each pod containing k / 2 edge switches and k / 2
+        #   aggregation switches
+        num_edge_layer = half_degree * num_degree
+        num_agg_layer = half_degree * num_degree
+        num_core_layer = half_degree**2
+        num_routers = num_edge_layer + num_agg_layer + num_core_layer
+        # print(f"num_routers: {num_routers}")
+        # assert num_routers == num_cpus
+
+        # Default values for link latency and router latency.
+        # Can be over-ridden on a per link/router basis
+        link_latency = options.link_latency  # used by simple and garnet
+        router_latency = options.router_latency  # only used by garnet
+
+        # There must be an evenly divisible number of cntrls to routers
+        # Also, obviously the number or rows must be <= the number of routers
+        cntrls_per_router, remainder = divmod(len(nodes), num_edge_layer)
+
+        # Create the routers in the mesh
+        routers = [
+            Router(router_id=i, latency=router_latency)
+            for i in range(num_routers)  # edge / agg / core
+        ]
+        network.routers = routers
+
+        # link counter to set unique link ids
+        link_count = 0
+
+        # Add all but the remainder nodes to the list of nodes to be uniformly
+        # distributed across the network.
+        network_nodes = []
+        remainder_nodes = []
+        for node_index in range(len(nodes)):
+            if node_index < (len(nodes) - remainder):
+                network_nodes.append(nodes[node_index])
+            else:
+                remainder_nodes.append(nodes[node_index])
+
+        # Connect each node to the appropriate router (only to edge routers)
+        ext_links = []
+        for (i, n) in enumerate(network_nodes):
+            cntrl_level, router_id = divmod(i, num_edge_layer)
+            assert cntrl_level < cntrls_per_router
+            ext_links.append(
+                ExtLink(
+                    link_id=link_count,
+                    ext_node=n,
+                    int_node=routers[router_id],
+                    latency=link_latency,
+                )
+            )
+            link_count += 1
+
+        # Connect the remainding nodes to router 0.  These should only be
+        # DMA nodes.
+        for (i, node) in enumerate(remainder_nodes):
+            # assert node.type == "DMA_Controller"
+            assert i < remainder
+            ext_links.append(
+                ExtLink(
+                    link_id=link_count,
+                    ext_node=node,
+                    int_node=routers[i],
+                    latency=link_latency,
+                )
+            )
+            link_count += 1
+
+        network.ext_links = ext_links
+
+        # Create the internal links, as (src, dst, src_outport,
+        # dst_inport, latency, weight) rows
+        int_links = []
+
+        # Router indexing: edge -> agg -> core
+        # (Edge, Agg) links (weight = 1)
+        for pod_id in range(num_degree):
+            for edge_router_id in range(half_degree):
+                for agg_router_id in range(half_degree):
+                    edge = edge_router_id + pod_id * half_degree
+                    agg = num_edge_layer + agg_router_id + pod_id * half_degree
+                    int_links.append(
+                        (
+                            edge,
+                            agg,
+                            f"Agg{agg_router_id}",
+                            f"Edge{edge_router_id}",
+                            link_latency,
+                            1,
+                        )
+                    )
+                    int_links.append(
+                        (
+                            agg,
+                            edge,
+                            f"Edge{edge_router_id}",
+                            f"Agg{agg_router_id}",
+                            link_latency,
+                            1,
+                        )
+                    )
+
+        # (Agg, Core) links (weight = 1)
+        core_base = num_edge_layer + num_agg_layer
+        for core_type in range(half_degree):
+            for core_router_id in range(half_degree):
+                for pod_id in range(num_degree):
+                    agg_router_id = core_type
+                    agg = num_edge_layer + agg_router_id + pod_id * half_degree
+                    core = core_base + core_router_id + core_type * half_degree
+                    int_links.append(
+                        (
+                            agg,
+                            core,
+                            f"Core{core_router_id}",
+                            f"Agg{pod_id}",
+                            link_latency,
+                            1,
+                        )
+                    )
+                    int_links.append(
+                        (
+                            core,
+                            agg,
+                            f"Agg{pod_id}",
+                            f"Core{core_router_id}",
+                            link_latency,
+                            1,
+                        )
+                    )
+
+        self.makeIntLinks(options, network, IntLink, int_links, link_count)
+
+    # Keep the edge and aggregation routers of a pod on one event queue,
+    # so that only the links to the core routers cross event queues
+    def partitionRouters(self, options, routers, num_partitions):
+        num_degree = options.num_pods
+        half_degree = num_degree // 2
+        num_edge_layer = half_degree * num_degree
+        partitions = []
+        for i in range(len(routers)):
+            if i < 2 * num_edge_layer:
+                pod_id = (i % num_edge_layer) // half_degree
+                partitions.append(pod_id * num_partitions // num_degree)
+            else:
+                partitions.append((i - 2 * num_edge_layer) % num_partitions)
+        return partitions
+
+    # Register nodes with filesystem
+    def registerTopology(self, options):
+        for i in range(options.num_cpus):
+            FileSystemConfig.register_node(
+                [i], MemorySize(options.mem_size) // options.num_cpus, i
+            )
@@ -0,0 +1,179 @@
+# Copyright (c) 2026 The gem5 Authors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from m5.params import *
+from m5.util import fatal
+
+from common import FileSystemConfig
+
+from topologies.BaseTopology import SimpleTopology
+
+# Creates a folded-Clos (extended generalized fat tree) topology of any
+# height. Use with --routing-algorithm=5 (tree) or 6 (adaptive tree).
+#
+# The tree is described by --tree-children m1,...,mh and
+# --tree-parents w2,...,wh: a switch of level l has m_l children and,
+# below the top level, w_(l+1) parents. Level 0 are the controllers, so
+# m1 is the number of hosts per edge switch, and m_l / w_(l+1) is the
+# oversubscription of level l. A k-ary n-tree is m = (k, ..., k),
+# w = (k, ..., k); the 3-level FatTree with k pods is m = (k/2, k/2, k),
+# w = (k/2, k/2).
+#
+# Routers are numbered level by level from the edge switches up. Within a
+# level, switch s * W + y is the y-th of the W switches above subtree s,
+# where W is the product of the parents below. Ports are named "Up<j>"
+# and "Down<c>", so RoutingUnit::initTreeRoutes() can work out every
+# route from these numbers and tree_children/tree_parents alone.
+
+
+def tree_levels(children, parents):
+    """(number of subtrees, switches per subtree) of each level, from
+    the edge switches up."""
+    if not children or len(parents) != len(children) - 1:
+        raise ValueError(
+            "a tree of h levels needs h children and h - 1 parents counts"
+        )
+    levels = []
+    num_subtrees = 1
+    for m in children[1:]:
+        num_subtrees *= m
+    switches_per_subtree = 1
+    for l in range(len(children)):
+        levels.append((num_subtrees, switches_per_subtree))
+        if l < len(parents):
+            num_subtrees //= children[l + 1]
+            switches_per_subtree *= parents[l]
+    return levels
+
+
+def tree_links(children, parents):
+    """Yields (child, parent, up, down) for every link between two levels:
+    router child reaches router parent through its port Up<up>, and parent
+    reaches child through Down<down>."""
+    levels = tree_levels(children, parents)
+    first_id = 0
+    for l in range(len(parents)):
+        num_subtrees, per_subtree = levels[l]
+        num_switches = num_subtrees * per_subtree
+        parent_first_id = first_id + num_switches
+        parent_per_subtree = per_subtree * parents[l]
+        m = children[l + 1]
+        for idx in range(num_switches):
+            subtree, y = divmod(idx, per_subtree)
+            parent_subtree, down = divmod(subtree, m)
+            parent_base = parent_first_id + parent_subtree * parent_per_subtree
+            for up in range(parents[l]):
+                yield (
+                    first_id + idx,
+                    parent_base + y + up * per_subtree,
+                    up,
+                    down,
+                )
+        first_id = parent_first_id
+
+
+def parse_tree(options):
+    children = [int(m) for m in options.tree_children.split(",")]
+    parents = [int(w) for w in options.tree_parents.split(",") if w]
+    return children, parents
+
+
+class FoldedClos(SimpleTopology):
+    description = "FoldedClos"
+
+    def __init__(self, controllers):
+        self.nodes = controllers
+
+    def makeTopology(self, options, network, IntLink, ExtLink, Router):
+        nodes = self.nodes
+        children, parents = parse_tree(options)
+        levels = tree_levels(children, parents)
+        num_routers = sum(n * s for n, s in levels)
+        num_edge = levels[0][0]
+
+        if len(nodes) > children[0] * num_edge:
+            fatal(
+                f"{len(nodes)} controllers do not fit on {num_edge} edge "
+                f"switches with {children[0]} hosts each"
+            )
+
+        link_latency = options.link_latency  # used by simple and garnet
+        router_latency = options.router_latency  # only used by garnet
+
+        routers = [
+            Router(router_id=i, latency=router_latency)
+            for i in range(num_routers)
+        ]
+        network.routers = routers
+        if options.network == "garnet":
+            network.tree_children = children
+            network.tree_parents = parents
+
+        # Controllers are spread round-robin over the edge switches, so
+        # that no edge switch gets more than children[0] of them
+        ext_links = [
+            ExtLink(
+                link_id=i,
+                ext_node=n,
+                int_node=routers[i % num_edge],
+                latency=link_latency,
+            )
+            for i, n in enumerate(nodes)
+        ]
+        network.ext_links = ext_links
+
+        rows = []
+        for child, parent, up, down in tree_links(children, parents):
+            rows.append(
+                (child, parent, f"Up{up}", f"Down{down}", link_latency, 1)
+            )
+            rows.append(
+                (parent, child, f"Down{down}", f"Up{up}", link_latency, 1)
+            )
+        self.makeIntLinks(options, network, IntLink, rows, len(ext_links))
+
+    # The switches below the top level are kept together with the other
+    # switches of their top-level subtree (pod), the top-level switches are
+    # dealt round-robin
+    def partitionRouters(self, options, routers, num_partitions):
+        children, parents = parse_tree(options)
+        levels = tree_levels(children, parents)
+        num_pods = levels[-2][0] if len(levels) > 1 else 1
+        partitions = []
+        for num_subtrees, per_subtree in levels[:-1]:
+            for idx in range(num_subtrees * per_subtree):
+                pod = (idx // per_subtree) * num_pods // num_subtrees
+                partitions.append(pod * num_partitions // num_pods)
+        num_top = levels[-1][0] * levels[-1][1]
+        partitions += [i % num_partitions for i in range(num_top)]
+        return partitions
+
+    # Register nodes with filesystem
+    def registerTopology(self, options):
+        for i in range(options.num_cpus):
+            FileSystemConfig.register_node(
+                [i], MemorySize(options.mem_size) // options.num_cpus, i
+            )
@@ -1,5 +1,4 @@
 from m5.params import *
-from m5.objects import *
 
 from common import FileSystemConfig
 from topologies.BaseTopology import SimpleTopology
@@ -0,0 +1,607 @@
+"""Parallel, resumable injection-rate sweeps over garnet_synth_traffic.py.
+
+Every (topology, routing, size, rate) point is simulated in its own output
+directory below the sweep cache.  The directory is named after a hash of
+the full gem5 command line and a finished point leaves a ``result.json``
+behind, so rerunning a sweep after a crash or after changing one curve only
+simulates the points that are missing.  The stats of a point come from the
+GarnetStats record (configs/network/GarnetStats.py) that
+garnet_synth_traffic.py writes into its output directory.
+
+Usage as a script (from the gem5 directory):
+
+    python3 garnet_sweep.py --topology=FatTree --routing-algorithm=4 \\
+        --num-cpus=64 --num-dirs=64 --num-pods=8 -j 16
+
+Adding ``--saturation`` searches the saturation throughput first and only
+samples the curve below it, instead of simulating every rate of the grid.
+Several topologies, routing algorithms or traffic patterns give one series
+each, and all series share the worker pool.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "configs"))
+
+from network.GarnetStats import STATS_FILE, GarnetStats
+
+GEM5_BINARY = "./build/NULL/gem5.opt"
+CONFIG_SCRIPT = "configs/example/garnet_synth_traffic.py"
+SWEEP_DIR = "m5out/sweep"
+RESULT_FILE = "result.json"
+
+DEFAULT_RATES = [0.01] + [round(0.05 * i, 2) for i in range(1, 15)]
+
+# GarnetSyntheticTraffic draws injections with --precision=3 digits, finer
+# rates would only produce distinct cache entries for the same run.
+RATE_DIGITS = 3
+
+# Probes per round of the saturation search (see find_saturations())
+PROBES_PER_ROUND = 3
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One garnet_synth_traffic.py run."""
+
+    topology: str
+    routing_algorithm: int
+    num_cpus: int
+    num_dirs: int
+    injection_rate: float
+    synthetic: str = "uniform_random"
+    num_pods: int = 0
+    mesh_rows: int = 0
+    sim_cycles: int = 100000
+    extra_args: Tuple[str, ...] = field(default_factory=tuple)
+
+    def config_args(self) -> List[str]:
+        args = [
+            "--network=garnet",
+            "--inj-vnet=0",
+            f"--num-cpus={self.num_cpus}",
+            f"--num-dirs={self.num_dirs}",
+            f"--topology={self.topology}",
+            f"--synthetic={self.synthetic}",
+            f"--sim-cycles={self.sim_cycles}",
+            f"--routing-algorithm={self.routing_algorithm}",
+        ]
+        if self.num_pods > 0:
+            args.append(f"--num-pods={self.num_pods}")
+        if self.mesh_rows > 0:
+            args.append(f"--mesh-rows={self.mesh_rows}")
+        args.extend(self.extra_args)
+        args.append(f"--injectionrate={self.injection_rate}")
+        return args
+
+
+def point_command(
+    point: SweepPoint,
+    gem5: str = GEM5_BINARY,
+    config: str = CONFIG_SCRIPT,
+) -> List[str]:
+    """The gem5 command line of a point, without the output directory."""
+    return [gem5, config] + point.config_args()
+
+
+def point_key(command: List[str]) -> str:
+    """Content hash naming the output directory of a command line."""
+    return hashlib.sha256("\0".join(command).encode()).hexdigest()[:16]
+
+
+def point_outdir(
+    point: SweepPoint,
+    cache_dir: str = SWEEP_DIR,
+    gem5: str = GEM5_BINARY,
+    config: str = CONFIG_SCRIPT,
+) -> str:
+    return os.path.join(
+        cache_dir, point_key(point_command(point, gem5, config))
+    )
+
+
+def _write_json(path: str, data) -> None:
+    # Write-then-rename so an interrupted run never leaves a truncated
+    # result that would be mistaken for a finished point.
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def load_result(outdir: str) -> Optional[Dict[str, float]]:
+    """The cached result of a point, or None if it has not finished."""
+    try:
+        with open(os.path.join(outdir, RESULT_FILE)) as f:
+            return json.load(f)["stats"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def run_point(
+    point: SweepPoint,
+    cache_dir: str = SWEEP_DIR,
+    gem5: str = GEM5_BINARY,
+    config: str = CONFIG_SCRIPT,
+) -> Dict[str, float]:
+    """Simulate one point unless its result is already cached."""
+    command = point_command(point, gem5, config)
+    outdir = os.path.join(cache_dir, point_key(command))
+    result = load_result(outdir)
+    if result is not None:
+        return result
+
+    os.makedirs(outdir, exist_ok=True)
+    # gem5 options go before the config script
+    subprocess.run(
+        command[:1]
+        + [f"--outdir={outdir}", "-re", "--silent-redirect"]
+        + command[1:],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    result = asdict(GarnetStats.load(os.path.join(outdir, STATS_FILE)))
+    _write_json(
+        os.path.join(outdir, RESULT_FILE),
+        {"point": asdict(point), "command": command, "stats": result},
+    )
+    return result
+
+
+def run_sweep(
+    points: Iterable[SweepPoint],
+    jobs: Optional[int] = None,
+    cache_dir: str = SWEEP_DIR,
+    gem5: str = GEM5_BINARY,
+    config: str = CONFIG_SCRIPT,
+    verbose: bool = True,
+) -> Dict[SweepPoint, Dict[str, float]]:
+    """Simulate all points on a process pool and return their results.
+
+    Cached points are returned without starting a worker.  A failing point
+    does not stop the others; the failures are reported together once the
+    rest of the sweep has finished.
+    """
+    points = list(dict.fromkeys(points))
+    results = {}
+    pending = []
+    for point in points:
+        result = load_result(point_outdir(point, cache_dir, gem5, config))
+        if result is None:
+            pending.append(point)
+        else:
+            results[point] = result
+
+    if verbose:
+        print(
+            f"sweep: {len(points)} points, {len(results)} cached, "
+            f"{len(pending)} to simulate"
+        )
+
+    failures = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(run_point, point, cache_dir, gem5, config): point
+                for point in pending
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                point = futures[future]
+                status = "done"
+                try:
+                    results[point] = future.result()
+                except Exception as e:
+                    failures.append((point, e))
+                    status = "FAILED"
+                if verbose:
+                    print(
+                        f"sweep: [{done}/{len(pending)}] {point.topology} "
+                        f"routing={point.routing_algorithm} "
+                        f"rate={point.injection_rate:g} {status}"
+                    )
+
+    if failures:
+        raise RuntimeError(
+            f"{len(failures)} sweep points failed:\n"
+            + "\n".join(
+                f"  {point_outdir(p, cache_dir, gem5, config)}: {e}"
+                for p, e in failures
+            )
+        )
+    return {point: results[point] for point in points}
+
+
+def is_saturated(
+    stats: Dict[str, float],
+    rate: float,
+    zero_load_latency: float,
+    zero_load_acceptance: float,
+    latency_factor: float = 3.0,
+    min_acceptance: float = 0.9,
+) -> bool:
+    """Whether a point is past the saturation throughput.
+
+    A point is saturated once its average packet latency exceeds
+    ``latency_factor`` times the zero-load latency, or once the network
+    accepts less than ``min_acceptance`` of the offered load.
+
+    The injection rate is per tester cycle while the reception rate is
+    per network cycle, so the offered load is scaled by
+    ``zero_load_acceptance``, the reception rate per unit of injection
+    rate at zero load.
+    """
+    latency = stats["average_packet_latency"]
+    if latency != latency:  # nan: nothing made it through
+        return True
+    offered = zero_load_acceptance * rate
+    return (
+        latency > latency_factor * zero_load_latency
+        or stats["reception_rate"] < min_acceptance * offered
+    )
+
+
+def _search_saturation(
+    low: float,
+    high: float,
+    tolerance: float,
+    probes_per_round: int,
+    latency_factor: float,
+    min_acceptance: float,
+):
+    """Saturation search of one series, driven by find_saturations().
+
+    Yields the rates to simulate next and is sent their stats back in the
+    same order.  Returns the highest unsaturated rate found.
+    """
+    (zero_load,) = yield [low]
+    zero_load_latency = zero_load["average_packet_latency"]
+    if zero_load_latency != zero_load_latency:
+        return low
+    zero_load_acceptance = zero_load["reception_rate"] / low
+
+    def saturated(rate, stats):
+        return is_saturated(
+            stats,
+            rate,
+            zero_load_latency,
+            zero_load_acceptance,
+            latency_factor,
+            min_acceptance,
+        )
+
+    (at_high,) = yield [high]
+    if not saturated(high, at_high):
+        return high
+
+    while high - low > tolerance:
+        step = (high - low) / (probes_per_round + 1)
+        probes = sorted(
+            {
+                round(low + step * i, RATE_DIGITS)
+                for i in range(1, probes_per_round + 1)
+            }
+            - {round(low, RATE_DIGITS), round(high, RATE_DIGITS)}
+        )
+        if not probes:
+            break
+        # Latency grows monotonically with load, so the bracket shrinks to
+        # the interval in front of the first saturated probe.
+        for rate, stats in zip(probes, (yield probes)):
+            if saturated(rate, stats):
+                high = rate
+                break
+            low = rate
+
+    return round(low, RATE_DIGITS)
+
+
+def find_saturations(
+    bases: Iterable[SweepPoint],
+    low: float = 0.01,
+    high: float = 1.0,
+    tolerance: float = 0.01,
+    jobs: Optional[int] = None,
+    latency_factor: float = 3.0,
+    min_acceptance: float = 0.9,
+    **sweep_args,
+) -> Tuple[Dict[SweepPoint, float], Dict[SweepPoint, Dict[str, float]]]:
+    """Search the saturation throughput of several series at once.
+
+    Each series is a base point whose injection rate is varied.  ``low``
+    must be below saturation; it is simulated first to get the zero-load
+    latency and the zero-load acceptance.  Each round then splits the
+    bracketing interval of every series with up to PROBES_PER_ROUND
+    probes, which is plain bisection for ``jobs=1``.  More probes per
+    round would hardly save any rounds but cost many more simulations, so
+    the probes of all series share the workers instead.  A search stops
+    once its bracket is narrower than ``tolerance``.
+
+    Returns the saturation throughput of every base point and the stats
+    of every simulated point.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    probes_per_round = min(jobs, PROBES_PER_ROUND)
+    searches = {
+        base: _search_saturation(
+            low,
+            high,
+            tolerance,
+            probes_per_round,
+            latency_factor,
+            min_acceptance,
+        )
+        for base in dict.fromkeys(bases)
+    }
+    requests = {base: next(search) for base, search in searches.items()}
+    saturations = {}
+    results = {}
+
+    while requests:
+        points = {
+            base: [
+                replace(base, injection_rate=round(r, RATE_DIGITS))
+                for r in rates
+            ]
+            for base, rates in requests.items()
+        }
+        results.update(
+            run_sweep(
+                [p for series in points.values() for p in series],
+                jobs=jobs,
+                **sweep_args,
+            )
+        )
+        requests = {}
+        for base, series in points.items():
+            try:
+                requests[base] = searches[base].send(
+                    [results[p] for p in series]
+                )
+            except StopIteration as done:
+                saturations[base] = done.value
+
+    return saturations, results
+
+
+def find_saturation(
+    base: SweepPoint, *args, **kwargs
+) -> Tuple[float, Dict[SweepPoint, Dict[str, float]]]:
+    """Search the saturation throughput of one series, see
+    find_saturations()."""
+    saturations, results = find_saturations([base], *args, **kwargs)
+    return saturations[base], results
+
+
+def sweep_saturations(
+    bases: Iterable[SweepPoint],
+    num_points: int = 10,
+    low: float = 0.01,
+    high: float = 1.0,
+    tolerance: float = 0.01,
+    jobs: Optional[int] = None,
+    latency_factor: float = 3.0,
+    min_acceptance: float = 0.9,
+    **sweep_args,
+) -> Dict[SweepPoint, Tuple[float, Dict[SweepPoint, Dict[str, float]]]]:
+    """Latency-throughput curves sampled only below saturation.
+
+    The saturation throughput of every series is searched first (see
+    find_saturations()), then ``num_points`` rates evenly spread over
+    ``[low, saturation]`` are simulated for all series together.  Probes
+    of the search are reused when they coincide with a sample and are part
+    of the returned curve either way.
+
+    Returns the saturation throughput and the curve ordered by rate of
+    every base point.
+    """
+    bases = list(dict.fromkeys(bases))
+    saturations, results = find_saturations(
+        bases,
+        low,
+        high,
+        tolerance,
+        jobs,
+        latency_factor,
+        min_acceptance,
+        **sweep_args,
+    )
+    samples = []
+    for base in bases:
+        step = (saturations[base] - low) / max(num_points - 1, 1)
+        rates = {round(low + step * i, RATE_DIGITS) for i in range(num_points)}
+        samples += [replace(base, injection_rate=r) for r in sorted(rates)]
+    results.update(run_sweep(samples, jobs=jobs, **sweep_args))
+
+    curves = {}
+    for base in bases:
+        curve = {
+            point: stats
+            for point, stats in results.items()
+            if replace(point, injection_rate=base.injection_rate) == base
+        }
+        curves[base] = (
+            saturations[base],
+            dict(sorted(curve.items(), key=lambda i: i[0].injection_rate)),
+        )
+    return curves
+
+
+def sweep_saturation(
+    base: SweepPoint, *args, **kwargs
+) -> Tuple[float, Dict[SweepPoint, Dict[str, float]]]:
+    """Latency-throughput curve of one series, see sweep_saturations()."""
+    return sweep_saturations([base], *args, **kwargs)[base]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--topology",
+        nargs="+",
+        required=True,
+        help="Topologies to sweep, one series each",
+    )
+    parser.add_argument(
+        "--routing-algorithm",
+        type=int,
+        nargs="+",
+        default=[0],
+        help="Routing algorithms to sweep, one series each",
+    )
+    parser.add_argument("--num-cpus", type=int, default=16)
+    parser.add_argument("--num-dirs", type=int, default=16)
+    parser.add_argument("--num-pods", type=int, default=0)
+    parser.add_argument("--mesh-rows", type=int, default=0)
+    parser.add_argument(
+        "--synthetic",
+        nargs="+",
+        default=["uniform_random"],
+        help="Traffic patterns to sweep, one series each",
+    )
+    parser.add_argument("--sim-cycles", type=int, default=100000)
+    parser.add_argument(
+        "--warmup-cycles",
+        type=int,
+        default=0,
+        help="Cycles before the network stats are reset",
+    )
+    parser.add_argument(
+        "--measure-cycles",
+        type=int,
+        default=0,
+        help="Cycles in which created packets are measured, each run ends "
+        "once they drained",
+    )
+    parser.add_argument(
+        "--convergence-window",
+        type=int,
+        default=0,
+        help="Stop each run early once its stats converged, sampling "
+        "every this many cycles (0 runs all --sim-cycles)",
+    )
+    parser.add_argument(
+        "--injection-process",
+        default="bernoulli",
+        choices=["bernoulli", "geometric"],
+        help="Injection process of the traffic generators "
+        "[default: %(default)s]",
+    )
+    parser.add_argument(
+        "--rates",
+        type=float,
+        nargs="+",
+        default=DEFAULT_RATES,
+        help="Injection rates to simulate",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of parallel simulations [default: all cores]",
+    )
+    parser.add_argument(
+        "--saturation",
+        action="store_true",
+        help="Search the saturation throughput instead of sweeping "
+        "--rates, then sample the curve below it",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.01,
+        help="Saturation search resolution [default: %(default)s]",
+    )
+    parser.add_argument(
+        "--points",
+        type=int,
+        default=10,
+        help="Rates sampled below saturation [default: %(default)s]",
+    )
+    parser.add_argument("--cache-dir", default=SWEEP_DIR)
+    parser.add_argument("--gem5", default=GEM5_BINARY)
+    args = parser.parse_args(argv)
+
+    extra_args = [
+        f"--{name.replace('_', '-')}={value}"
+        for name, value in (
+            ("warmup_cycles", args.warmup_cycles),
+            ("measure_cycles", args.measure_cycles),
+            ("convergence_window", args.convergence_window),
+        )
+        if value > 0
+    ]
+    if args.injection_process != "bernoulli":
+        extra_args.append(f"--injection-process={args.injection_process}")
+
+    bases = [
+        SweepPoint(
+            topology=topology,
+            routing_algorithm=routing_algorithm,
+            num_cpus=args.num_cpus,
+            num_dirs=args.num_dirs,
+            injection_rate=min(args.rates),
+            synthetic=synthetic,
+            num_pods=args.num_pods,
+            mesh_rows=args.mesh_rows,
+            sim_cycles=args.sim_cycles,
+            extra_args=tuple(extra_args),
+        )
+        for topology in args.topology
+        for routing_algorithm in args.routing_algorithm
+        for synthetic in args.synthetic
+    ]
+    if args.saturation:
+        curves = sweep_saturations(
+            bases,
+            num_points=args.points,
+            low=min(args.rates),
+            high=max(args.rates),
+            tolerance=args.tolerance,
+            jobs=args.jobs,
+            cache_dir=args.cache_dir,
+            gem5=args.gem5,
+        )
+    else:
+        results = run_sweep(
+            [
+                replace(base, injection_rate=rate)
+                for base in bases
+                for rate in args.rates
+            ],
+            jobs=args.jobs,
+            cache_dir=args.cache_dir,
+            gem5=args.gem5,
+        )
+        curves = {}
+        for base in bases:
+            points = [replace(base, injection_rate=r) for r in args.rates]
+            curves[base] = (None, {p: results[p] for p in points})
+
+    for base, (saturation, curve) in curves.items():
+        print(
+            f"\n{base.topology} routing={base.routing_algorithm} "
+            f"{base.synthetic}"
+        )
+        if saturation is not None:
+            print(f"saturation throughput: {saturation:g}")
+        print(f"{'rate':>6} {'latency':>10} {'hops':>6} {'reception':>10}")
+        for point, stats in curve.items():
+            print(
+                f"{point.injection_rate:6.3f} "
+                f"{stats['average_packet_latency']:10.3f} "
+                f"{stats['average_hops']:6.3f} "
+                f"{stats['reception_rate']:10.5f}"
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
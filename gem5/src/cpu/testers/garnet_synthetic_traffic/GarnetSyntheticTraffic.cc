@@ -28,6 +28,7 @@
 
 #include "cpu/testers/garnet_synthetic_traffic/GarnetSyntheticTraffic.hh"
 
+#include <algorithm>
 #include <cmath>
 #include <iomanip>
 #include <set>
@@ -87,9 +88,14 @@ GarnetSyntheticTraffic::GarnetSyntheticTraffic(const Params &p)
       singleSender(p.single_sender),
       singleDest(p.single_dest),
       trafficType(p.traffic_type),
+      numPods(p.num_pods),
+      srcRouter(p.src_router),
+      destRouters(p.dest_routers),
       injRate(p.inj_rate),
       injVnet(p.inj_vnet),
       precision(p.precision),
+      nextInjectionTick(MaxTick),
+      tickGap(1),
       responseLimit(p.response_limit),
       requestorId(p.system->getRequestorId(this))
 {
@@ -98,10 +104,15 @@ GarnetSyntheticTraffic::GarnetSyntheticTraffic(const Params &p)
     schedule(tickEvent, 0);
 
     initTrafficType();
-    if (trafficStringToEnum.count(trafficType) == 0) {
-        fatal("Unknown Traffic Type: %s!\n", traffic);
+    setTrafficType(p.traffic_type);
+
+    if (p.injection_process == "bernoulli") {
+        injectionProcess = BERNOULLI_;
+    } else if (p.injection_process == "geometric") {
+        injectionProcess = GEOMETRIC_;
+    } else {
+        fatal("Unknown injection process: %s!\n", p.injection_process);
     }
-    traffic = trafficStringToEnum[trafficType];
 
     id = TESTER_NETWORK++;
     DPRINTF(GarnetSyntheticTraffic,"Config Created: Name = %s , and id = %d\n",
@@ -121,8 +132,47 @@ void
 GarnetSyntheticTraffic::init()
 {
     numPacketsSent = 0;
+    if (injectionProcess == GEOMETRIC_)
+        nextInjectionTick = drawNextInjection(clockEdge());
+}
+
+// The simulation ends at simCycles. The exit is scheduled up front, as
+// with several event queues exitSimLoop() can only end the simulation a
+// quantum after the tick it is called at.
+void
+GarnetSyntheticTraffic::startup()
+{
+    exitSimLoop("Network Tester completed simCycles", 0,
+                simCycles - std::min(simCycles, simQuantum));
 }
 
+void
+GarnetSyntheticTraffic::setInjectionRate(double rate)
+{
+    injRate = rate;
+
+    // A geometric tester may sleep until an injection drawn for the old
+    // rate, draw again and wake up now
+    if (injectionProcess == GEOMETRIC_) {
+        nextInjectionTick = drawNextInjection(clockEdge());
+        if (tickEvent.scheduled() && tickEvent.when() > clockEdge()) {
+            tickGap = Cycles(1);
+            reschedule(tickEvent, clockEdge());
+        }
+    }
+}
+
+void
+GarnetSyntheticTraffic::setTrafficType(const std::string &traffic_type)
+{
+    if (trafficStringToEnum.count(traffic_type) == 0) {
+        fatal("Unknown Traffic Type: %s!\n", traffic_type);
+    }
+    trafficType = traffic_type;
+    traffic = trafficStringToEnum[trafficType];
+    if (traffic >= FATTREE_INTRA_POD_)
+        initFatTreeDestinations();
+}
 
 void
 GarnetSyntheticTraffic::completeRequest(PacketPtr pkt)
@@ -141,21 +191,28 @@ GarnetSyntheticTraffic::completeRequest(PacketPtr pkt)
 void
 GarnetSyntheticTraffic::tick()
 {
-    if (++noResponseCycles >= responseLimit) {
+    noResponseCycles += tickGap;
+    if (noResponseCycles >= responseLimit) {
         fatal("%s deadlocked at cycle %d\n", name(), curTick());
     }
 
-    // make new request based on injection rate
-    // (injection rate's range depends on precision)
-    // - generate a random number between 0 and 10^precision /// Lab1-3: Usage of injection rate
-    // - send pkt if this number is < injRate*(10^precision)
     bool sendAllowedThisCycle;
-    double injRange = pow((double) 10, (double) precision);
-    unsigned trySending = random_mt.random<unsigned>(0, (int) injRange);
-    if (trySending < injRate*injRange) /// Lab1-3: Usage of injection rate
-        sendAllowedThisCycle = true;
-    else
-        sendAllowedThisCycle = false;
+    if (injectionProcess == GEOMETRIC_) {
+        sendAllowedThisCycle = curTick() >= nextInjectionTick;
+        if (sendAllowedThisCycle)
+            nextInjectionTick = drawNextInjection(clockEdge(Cycles(1)));
+    } else {
+        // make new request based on injection rate
+        // (injection rate's range depends on precision)
+        // - generate a random number between 0 and 10^precision /// Lab1-3: Usage of injection rate
+        // - send pkt if this number is < injRate*(10^precision)
+        double injRange = pow((double) 10, (double) precision);
+        unsigned trySending = random_mt.random<unsigned>(0, (int) injRange);
+        if (trySending < injRate*injRange) /// Lab1-3: Usage of injection rate
+            sendAllowedThisCycle = true;
+        else
+            sendAllowedThisCycle = false;
+    }
 
     // always generatePkt unless fixedPkts or singleSender is enabled
     if (sendAllowedThisCycle) {
@@ -171,17 +228,42 @@ GarnetSyntheticTraffic::tick()
             generatePkt();
     }
 
-    // Schedule wakeup
-    if (curTick() >= simCycles)
-        exitSimLoop("Network Tester completed simCycles");
-    else {
-        if (!tickEvent.scheduled())
-            schedule(tickEvent, clockEdge(Cycles(1)));
+    // Schedule wakeup, the simulation ends at simCycles (see startup())
+    if (curTick() < simCycles) {
+        if (!tickEvent.scheduled()) {
+            tickGap = Cycles(1);
+            if (injectionProcess == GEOMETRIC_) {
+                // Sleep until the next injection, or until simCycles
+                Tick wakeup = std::min(nextInjectionTick, simCycles);
+                if (wakeup > curTick())
+                    tickGap = ticksToCycles(wakeup - curTick());
+            }
+            schedule(tickEvent, clockEdge(tickGap));
+        }
     }
 }
 
-void
-GarnetSyntheticTraffic::generatePkt()
+// Tick of the first injection at or after the cycle starting at from,
+// when every cycle injects with probability injRate: the number of
+// cycles up to it is geometric on {1, 2, ...} and drawn by inversion.
+// A zero rate never injects.
+Tick
+GarnetSyntheticTraffic::drawNextInjection(Tick from)
+{
+    if (injRate <= 0.0)
+        return MaxTick;
+
+    double cycles = 1;
+    if (injRate < 1.0) {
+        double u = 1.0 - random_mt.random<double>(); // (0, 1]
+        cycles = std::floor(std::log(u) / std::log1p(-injRate)) + 1;
+    }
+    double when = from + (cycles - 1) * clockPeriod();
+    return when >= (double)MaxTick ? MaxTick : (Tick)when;
+}
+
+unsigned
+GarnetSyntheticTraffic::chooseDestination()
 {
     int num_destinations = numDestinations;
     int radix = (int) sqrt(num_destinations);
@@ -236,11 +318,82 @@ GarnetSyntheticTraffic::generatePkt()
         dest_x = (src_x + (int) ceil(radix/2) - 1) % radix;
         dest_y = src_y;
         destination = dest_y*radix + dest_x;
+    } else if (traffic >= FATTREE_INTRA_POD_) {
+        destination = fatTreeDestinations[random_mt.random<unsigned>(
+            0, fatTreeDestinations.size() - 1)];
     }
     else {
         fatal("Unknown Traffic Type: %s!\n", traffic);
     }
 
+    return destination;
+}
+
+// Destinations of this tester for the FatTree patterns, from the edge
+// routers of the tester and of the destinations (see
+// configs/topologies/FatTree.py). With k pods of k/2 edge routers:
+//   fattree_intra_pod:        hosts in the same pod, other edge routers
+//   fattree_inter_pod:        hosts in all other pods
+//   fattree_pod_permutation:  hosts of the same edge position in pod
+//                             (pod + k/2) % k, pods are paired up
+//   fattree_stride:           hosts of edge router (router + k/2) % (k*k/2),
+//                             i.e. the same position in the next pod
+//   fattree_hotspot:          hosts in pod 0, so all inter-pod traffic
+//                             crosses the core into a single pod
+void
+GarnetSyntheticTraffic::initFatTreeDestinations()
+{
+    fatal_if(numPods <= 0 || numPods % 2,
+             "%s: %s traffic needs an even num_pods\n", name(), trafficType);
+    fatal_if((int)destRouters.size() != numDestinations,
+             "%s: %s traffic needs the router of each of the %d "
+             "destinations\n", name(), trafficType, numDestinations);
+
+    int half_k = numPods / 2;
+    int num_edge_layer = half_k * numPods;
+    fatal_if(srcRouter < 0 || srcRouter >= num_edge_layer,
+             "%s: src_router %d is not an edge router\n", name(),
+             srcRouter);
+    int src_pod = srcRouter / half_k;
+
+    fatTreeDestinations.clear();
+    for (int dest = 0; dest < numDestinations; dest++) {
+        int router = destRouters[dest];
+        int pod = router / half_k;
+        bool match = false;
+        switch (traffic) {
+          case FATTREE_INTRA_POD_:
+            match = pod == src_pod && router != srcRouter;
+            break;
+          case FATTREE_INTER_POD_:
+            match = pod != src_pod;
+            break;
+          case FATTREE_POD_PERMUTATION_:
+            match = pod == (src_pod + half_k) % numPods &&
+                    router % half_k == srcRouter % half_k;
+            break;
+          case FATTREE_STRIDE_:
+            match = router == (srcRouter + half_k) % num_edge_layer;
+            break;
+          case FATTREE_HOTSPOT_:
+            match = pod == 0;
+            break;
+          default:
+            panic("Not a FatTree traffic type: %s\n", trafficType);
+        }
+        if (match)
+            fatTreeDestinations.push_back(dest);
+    }
+    fatal_if(fatTreeDestinations.empty(),
+             "%s: no destination for %s traffic from router %d\n", name(),
+             trafficType, srcRouter);
+}
+
+void
+GarnetSyntheticTraffic::generatePkt()
+{
+    unsigned destination = chooseDestination();
+
     // The source of the packets is a cache.
     // The destination of the packets is a directory.
     // The destination bits are embedded in the address after byte-offset.
@@ -334,6 +487,11 @@ GarnetSyntheticTraffic::initTrafficType()
     trafficStringToEnum["tornado"] = TORNADO_;
     trafficStringToEnum["transpose"] = TRANSPOSE_;
     trafficStringToEnum["uniform_random"] = UNIFORM_RANDOM_;
+    trafficStringToEnum["fattree_intra_pod"] = FATTREE_INTRA_POD_;
+    trafficStringToEnum["fattree_inter_pod"] = FATTREE_INTER_POD_;
+    trafficStringToEnum["fattree_pod_permutation"] = FATTREE_POD_PERMUTATION_;
+    trafficStringToEnum["fattree_stride"] = FATTREE_STRIDE_;
+    trafficStringToEnum["fattree_hotspot"] = FATTREE_HOTSPOT_;
 }
 
 void
@@ -51,8 +51,17 @@ enum TrafficType {BIT_COMPLEMENT_ = 0,
                   TORNADO_ = 5,
                   TRANSPOSE_ = 6,
                   UNIFORM_RANDOM_ = 7,
+                  FATTREE_INTRA_POD_ = 8,
+                  FATTREE_INTER_POD_ = 9,
+                  FATTREE_POD_PERMUTATION_ = 10,
+                  FATTREE_STRIDE_ = 11,
+                  FATTREE_HOTSPOT_ = 12,
                   NUM_TRAFFIC_PATTERNS_};
 
+enum InjectionProcess {BERNOULLI_ = 0,
+                       GEOMETRIC_ = 1,
+                       NUM_INJECTION_PROCESSES_};
+
 class Packet;
 class GarnetSyntheticTraffic : public ClockedObject
 {
@@ -61,6 +70,7 @@ class GarnetSyntheticTraffic : public ClockedObject
     GarnetSyntheticTraffic(const Params &p);
 
     void init() override;
+    void startup() override;
 
     // main simulation loop (one cycle)
     void tick();
@@ -74,6 +84,12 @@ class GarnetSyntheticTraffic : public ClockedObject
      */
     void printAddr(Addr a);
 
+    // Change the traffic of an instantiated tester, so that sweeps can
+    // fork one simulation per point from a single configuration
+    // (garnet_synth_traffic.py --sweep-rates)
+    void setInjectionRate(double rate);
+    void setTrafficType(const std::string &traffic_type);
+
   protected:
     EventFunctionWrapper tickEvent;
 
@@ -127,9 +143,23 @@ class GarnetSyntheticTraffic : public ClockedObject
 
     std::string trafficType; // string
     TrafficType traffic; // enum from string
+
+    // FatTree patterns: placement of this tester and of the
+    // destinations, and the destinations the pattern allows for this
+    // tester (one is picked uniformly at random per packet)
+    int numPods;
+    int srcRouter;
+    std::vector<int> destRouters;
+    std::vector<unsigned> fatTreeDestinations;
     double injRate;
     int injVnet;
     int precision;
+    InjectionProcess injectionProcess;
+
+    // Geometric injection: time of the next injection and the cycles
+    // since the previous tick
+    Tick nextInjectionTick;
+    Cycles tickGap;
 
     const Cycles responseLimit;
 
@@ -137,6 +167,9 @@ class GarnetSyntheticTraffic : public ClockedObject
 
     void completeRequest(PacketPtr pkt);
 
+    Tick drawNextInjection(Tick from);
+    void initFatTreeDestinations();
+    unsigned chooseDestination();
     void generatePkt();
     void sendPkt(PacketPtr pkt);
     void initTrafficType();
@@ -27,6 +27,7 @@
 from m5.objects.ClockedObject import ClockedObject
 from m5.params import *
 from m5.proxy import *
+from m5.SimObject import cxxMethod
 
 
 class GarnetSyntheticTraffic(ClockedObject):
@@ -56,6 +57,13 @@ class GarnetSyntheticTraffic(ClockedObject):
                                  Default depends on traffic_type",
     )
     traffic_type = Param.String("uniform_random", "Traffic type")
+    num_pods = Param.Int(0, "Number of pods k of the FatTree (fattree_*)")
+    src_router = Param.Int(
+        -1, "Edge router this tester is attached to (fattree_* traffic)"
+    )
+    dest_routers = VectorParam.Int(
+        [], "Edge router of each destination (fattree_* traffic)"
+    )
     inj_rate = Param.Float(0.1, "Packet injection rate")
     inj_vnet = Param.Int(
         -1,
@@ -68,6 +76,12 @@ class GarnetSyntheticTraffic(ClockedObject):
         "Number of digits of precision \
                               after decimal point",
     )
+    injection_process = Param.String(
+        "bernoulli",
+        "bernoulli: wake up every cycle and inject with probability "
+        "inj_rate (quantized to precision digits); geometric: draw the "
+        "gap to the next injection and only wake up then",
+    )
     response_limit = Param.Cycles(
         5000000,
         "Cycles before exiting \
@@ -75,3 +89,13 @@ class GarnetSyntheticTraffic(ClockedObject):
     )
     test = RequestPort("Port to the memory system to test")
     system = Param.System(Parent.any, "System we belong to")
+
+    @cxxMethod
+    def setInjectionRate(self, rate):
+        """Change inj_rate of the instantiated tester"""
+        pass
+
+    @cxxMethod
+    def setTrafficType(self, traffic_type):
+        """Change traffic_type of the instantiated tester"""
+        pass
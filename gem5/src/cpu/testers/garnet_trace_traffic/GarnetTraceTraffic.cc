@@ -0,0 +1,287 @@
+/*
+ * Copyright (c) 2026 The gem5 Authors
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include "cpu/testers/garnet_trace_traffic/GarnetTraceTraffic.hh"
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <algorithm>
+#include <cerrno>
+#include <cstdint>
+#include <cstring>
+
+#include "base/logging.hh"
+#include "base/trace.hh"
+#include "debug/GarnetTraceTraffic.hh"
+#include "mem/packet.hh"
+#include "mem/request.hh"
+#include "sim/sim_exit.hh"
+#include "sim/system.hh"
+
+namespace gem5
+{
+
+static_assert(sizeof(GarnetTraceHeader) == 16, "Bad trace header layout");
+static_assert(sizeof(GarnetTraceSection) == 16, "Bad trace section layout");
+static_assert(sizeof(GarnetTraceRecord) == 16, "Bad trace record layout");
+
+bool
+GarnetTraceTraffic::CpuPort::recvTimingResp(PacketPtr pkt)
+{
+    tester->completeRequest(pkt);
+    return true;
+}
+
+void
+GarnetTraceTraffic::CpuPort::recvReqRetry()
+{
+    tester->doRetry();
+}
+
+GarnetTraceTraffic::GarnetTraceTraffic(const Params &p)
+    : ClockedObject(p),
+      tickEvent([this]{ tick(); }, "GarnetTraceTraffic tick",
+                false, Event::CPU_Tick_Pri),
+      cachePort("GarnetTraceTraffic", this),
+      retryPkt(nullptr),
+      blockSizeBits(p.block_offset),
+      numDestinations(p.num_dest),
+      simCycles(p.sim_cycles),
+      sourceId(p.source_id),
+      traceFile(p.trace_file),
+      traceMap(nullptr),
+      traceSize(0),
+      records(nullptr),
+      numRecords(0),
+      nextRecord(0),
+      requestorId(p.system->getRequestorId(this))
+{
+    schedule(tickEvent, 0);
+}
+
+GarnetTraceTraffic::~GarnetTraceTraffic()
+{
+    if (traceMap)
+        munmap(traceMap, traceSize);
+}
+
+Port &
+GarnetTraceTraffic::getPort(const std::string &if_name, PortID idx)
+{
+    if (if_name == "test")
+        return cachePort;
+    else
+        return ClockedObject::getPort(if_name, idx);
+}
+
+void
+GarnetTraceTraffic::init()
+{
+    mapTrace();
+}
+
+// Ends the simulation at simCycles, see GarnetSyntheticTraffic::startup()
+void
+GarnetTraceTraffic::startup()
+{
+    exitSimLoop("Network Tester completed simCycles", 0,
+                simCycles - std::min(simCycles, simQuantum));
+}
+
+// Map the trace read-only and locate the section of this source. Pages
+// are only read in as the tester reaches them, so traces much larger
+// than memory can be replayed.
+void
+GarnetTraceTraffic::mapTrace()
+{
+    int fd = open(traceFile.c_str(), O_RDONLY);
+    fatal_if(fd < 0, "%s: cannot open trace %s: %s\n", name(), traceFile,
+             strerror(errno));
+    struct stat st;
+    fatal_if(fstat(fd, &st) < 0, "%s: cannot stat trace %s: %s\n", name(),
+             traceFile, strerror(errno));
+    traceSize = st.st_size;
+    fatal_if(traceSize < sizeof(GarnetTraceHeader),
+             "%s: trace %s is truncated\n", name(), traceFile);
+
+    traceMap = mmap(nullptr, traceSize, PROT_READ, MAP_SHARED, fd, 0);
+    close(fd);
+    fatal_if(traceMap == MAP_FAILED, "%s: cannot map trace %s: %s\n",
+             name(), traceFile, strerror(errno));
+
+    const char *base = static_cast<const char *>(traceMap);
+    const auto *header = reinterpret_cast<const GarnetTraceHeader *>(base);
+    fatal_if(std::memcmp(header->magic, "GNTRACE1", 8) != 0,
+             "%s: %s is not a Garnet packet trace\n", name(), traceFile);
+    fatal_if(sizeof(GarnetTraceHeader) +
+             header->num_sources * sizeof(GarnetTraceSection) > traceSize,
+             "%s: trace %s is truncated\n", name(), traceFile);
+
+    if (sourceId < 0 || (uint32_t)sourceId >= header->num_sources) {
+        warn("%s: trace %s has no packets of source %d\n", name(),
+             traceFile, sourceId);
+        return;
+    }
+
+    const auto *sections = reinterpret_cast<const GarnetTraceSection *>(
+        base + sizeof(GarnetTraceHeader));
+    const GarnetTraceSection &section = sections[sourceId];
+    fatal_if(section.offset % sizeof(GarnetTraceRecord) ||
+             section.offset +
+             section.num_records * sizeof(GarnetTraceRecord) > traceSize,
+             "%s: trace %s is truncated\n", name(), traceFile);
+
+    records = reinterpret_cast<const GarnetTraceRecord *>(
+        base + section.offset);
+    numRecords = section.num_records;
+
+    // The section starts anywhere in the map, but madvise() wants a
+    // page aligned address
+    const uintptr_t page_mask = sysconf(_SC_PAGESIZE) - 1;
+    const char *start = reinterpret_cast<const char *>(
+        reinterpret_cast<uintptr_t>(records) & ~page_mask);
+    const char *end = reinterpret_cast<const char *>(records + numRecords);
+    warn_if(madvise(const_cast<char *>(start), end - start,
+                    MADV_SEQUENTIAL) != 0,
+            "%s: madvise on trace %s failed: %s\n", name(), traceFile,
+            strerror(errno));
+
+    DPRINTF(GarnetTraceTraffic, "Source %d: %d packets in %s\n", sourceId,
+            numRecords, traceFile);
+}
+
+void
+GarnetTraceTraffic::tick()
+{
+    if (curTick() >= simCycles)
+        return;
+
+    // One packet per cycle; packets delayed by RubyPort backpressure
+    // are sent as soon as it accepts them again
+    if (!retryPkt && nextRecord < numRecords &&
+        records[nextRecord].cycle <= curTick()) {
+        sendPkt(makePkt(records[nextRecord++]));
+    }
+
+    scheduleTick();
+}
+
+// Wake up at the cycle of the next record, or at simCycles to end the
+// simulation. Like sim_cycles, record cycles are compared with curTick().
+void
+GarnetTraceTraffic::scheduleTick()
+{
+    Tick next = simCycles;
+    if (!retryPkt && nextRecord < numRecords)
+        next = std::min<Tick>(next, records[nextRecord].cycle);
+
+    Tick when = clockEdge(Cycles(1));
+    if (next > curTick())
+        when = std::max(when, clockEdge(ticksToCycles(next - curTick())));
+
+    if (!tickEvent.scheduled())
+        schedule(tickEvent, when);
+    else if (when < tickEvent.when())
+        reschedule(tickEvent, when);
+}
+
+// Same request encoding as GarnetSyntheticTraffic::generatePkt(): the
+// destination is embedded in the address and the vnet selects the
+// request type (see Network_test-cache.sm).
+PacketPtr
+GarnetTraceTraffic::makePkt(const GarnetTraceRecord &record)
+{
+    fatal_if((int)record.dest >= numDestinations,
+             "%s: trace destination %d out of range (%d destinations)\n",
+             name(), record.dest, numDestinations);
+    fatal_if(record.vnet > 2, "%s: trace vnet %d out of range\n", name(),
+             record.vnet);
+
+    Addr paddr = record.dest;
+    paddr <<= blockSizeBits;
+    unsigned access_size = 1; // Does not affect Ruby simulation
+
+    MemCmd::Command requestType;
+    RequestPtr req = nullptr;
+    Request::Flags flags;
+
+    if (record.vnet == 0) {
+        requestType = MemCmd::ReadReq;
+        req = std::make_shared<Request>(paddr, access_size, flags,
+                                        requestorId);
+    } else if (record.vnet == 1) {
+        requestType = MemCmd::ReadReq;
+        flags.set(Request::INST_FETCH);
+        req = std::make_shared<Request>(
+            0x0, access_size, flags, requestorId, 0x0, 0);
+        req->setPaddr(paddr);
+    } else {
+        requestType = MemCmd::WriteReq;
+        req = std::make_shared<Request>(paddr, access_size, flags,
+                                        requestorId);
+    }
+    req->setContext(sourceId);
+
+    DPRINTF(GarnetTraceTraffic, "Trace packet of cycle %d to destination "
+            "%d on vnet %d, injected at %d\n", record.cycle, record.dest,
+            record.vnet, curTick());
+
+    PacketPtr pkt = new Packet(req, requestType);
+    pkt->dataDynamic(new uint8_t[req->getSize()]);
+    pkt->senderState = nullptr;
+    return pkt;
+}
+
+void
+GarnetTraceTraffic::sendPkt(PacketPtr pkt)
+{
+    if (!cachePort.sendTimingReq(pkt)) {
+        retryPkt = pkt; // RubyPort will retry sending
+    }
+}
+
+void
+GarnetTraceTraffic::completeRequest(PacketPtr pkt)
+{
+    assert(pkt->isResponse());
+    delete pkt;
+}
+
+void
+GarnetTraceTraffic::doRetry()
+{
+    if (cachePort.sendTimingReq(retryPkt)) {
+        retryPkt = nullptr;
+        scheduleTick();
+    }
+}
+
+} // namespace gem5
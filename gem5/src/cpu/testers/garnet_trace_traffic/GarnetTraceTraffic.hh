@@ -0,0 +1,142 @@
+/*
+ * Copyright (c) 2026 The gem5 Authors
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __CPU_GARNET_TRACE_TRAFFIC_HH__
+#define __CPU_GARNET_TRACE_TRAFFIC_HH__
+
+#include <cstdint>
+#include <string>
+
+#include "mem/port.hh"
+#include "params/GarnetTraceTraffic.hh"
+#include "sim/clocked_object.hh"
+#include "sim/eventq.hh"
+
+namespace gem5
+{
+
+/*
+ * Binary packet trace, as written by util/encode_garnet_trace.py.
+ * All fields are little-endian:
+ *   header:   magic "GNTRACE1", uint32 number of sources, uint32 0,
+ *             then one section per source
+ *   section:  uint64 file offset and uint64 number of its records
+ *   record:   uint64 cycle, uint32 destination, uint8 vnet, uint8 0,
+ *             uint16 size in bytes
+ * The records of a source are contiguous and sorted by cycle, so each
+ * tester streams its own section of the memory-mapped file.
+ */
+struct GarnetTraceHeader
+{
+    char magic[8];
+    uint32_t num_sources;
+    uint32_t reserved;
+};
+
+struct GarnetTraceSection
+{
+    uint64_t offset;
+    uint64_t num_records;
+};
+
+struct GarnetTraceRecord
+{
+    uint64_t cycle;
+    uint32_t dest;
+    uint8_t vnet;
+    uint8_t reserved;
+    uint16_t size;
+};
+
+class GarnetTraceTraffic : public ClockedObject
+{
+  public:
+    typedef GarnetTraceTrafficParams Params;
+    GarnetTraceTraffic(const Params &p);
+    ~GarnetTraceTraffic();
+
+    void init() override;
+    void startup() override;
+
+    // Injects the next trace record once its cycle has come
+    void tick();
+
+    Port &getPort(const std::string &if_name,
+                  PortID idx=InvalidPortID) override;
+
+  protected:
+    EventFunctionWrapper tickEvent;
+
+    class CpuPort : public RequestPort
+    {
+        GarnetTraceTraffic *tester;
+
+      public:
+
+        CpuPort(const std::string &_name, GarnetTraceTraffic *_tester)
+            : RequestPort(_name), tester(_tester)
+        { }
+
+      protected:
+
+        virtual bool recvTimingResp(PacketPtr pkt);
+
+        virtual void recvReqRetry();
+    };
+
+    CpuPort cachePort;
+
+    // The packet RubyPort could not take yet. Injection stalls while
+    // it is pending, so at most one packet is buffered here.
+    PacketPtr retryPkt;
+
+    unsigned blockSizeBits;
+    int numDestinations;
+    Tick simCycles;
+    int sourceId;
+
+    std::string traceFile;
+    void *traceMap;
+    size_t traceSize;
+    const GarnetTraceRecord *records;
+    uint64_t numRecords;
+    uint64_t nextRecord;
+
+    RequestorID requestorId;
+
+    void mapTrace();
+    void scheduleTick();
+    PacketPtr makePkt(const GarnetTraceRecord &record);
+    void sendPkt(PacketPtr pkt);
+    void completeRequest(PacketPtr pkt);
+    void doRetry();
+};
+
+} // namespace gem5
+
+#endif // __CPU_GARNET_TRACE_TRAFFIC_HH__
@@ -30,6 +30,9 @@
 #include "mem/ruby/network/Topology.hh"
 
 #include <cassert>
+#include <climits>
+#include <functional>
+#include <queue>
 
 #include "base/trace.hh"
 #include "debug/RubyNetwork.hh"
@@ -93,22 +96,27 @@ Topology::Topology(uint32_t num_nodes, uint32_t num_routers,
     // Internal Links
     for (std::vector<BasicIntLink*>::const_iterator i = int_links.begin();
          i != int_links.end(); ++i) {
-        BasicIntLink *int_link = (*i);
-        BasicRouter *router_src = int_link->params().src_node;
-        BasicRouter *router_dst = int_link->params().dst_node;
+        addIntLink(*i);
+    }
+}
 
-        PortDirection src_outport = int_link->params().src_outport;
-        PortDirection dst_inport = int_link->params().dst_inport;
+void
+Topology::addIntLink(BasicIntLink *int_link)
+{
+    BasicRouter *router_src = int_link->params().src_node;
+    BasicRouter *router_dst = int_link->params().dst_node;
 
-        // Store the IntLink pointers for later
-        m_int_link_vector.push_back(int_link);
+    PortDirection src_outport = int_link->params().src_outport;
+    PortDirection dst_inport = int_link->params().dst_inport;
 
-        int src = router_src->params().router_id + 2*m_nodes;
-        int dst = router_dst->params().router_id + 2*m_nodes;
+    // Store the IntLink pointers for later
+    m_int_link_vector.push_back(int_link);
 
-        // create the internal uni-directional link from src to dst
-        addLink(src, dst, int_link, src_outport, dst_inport);
-    }
+    int src = router_src->params().router_id + 2*m_nodes;
+    int dst = router_dst->params().router_id + 2*m_nodes;
+
+    // create the internal uni-directional link from src to dst
+    addLink(src, dst, int_link, src_outport, dst_inport);
 }
 
 void
@@ -123,34 +131,24 @@ Topology::createLinks(Network *net)
         max_switch_id = std::max(max_switch_id, src_dest.second);
     }
 
-    // Initialize weight, latency, and inter switched vectors
+    // Weight of each configured src-dest pair per vnet (in m_link_map
+    // order) and the links into each switch per vnet
     int num_switches = max_switch_id+1;
-    Matrix topology_weights(m_vnets,
-            std::vector<std::vector<int>>(num_switches,
-            std::vector<int>(num_switches, INFINITE_LATENCY)));
-    Matrix component_latencies(num_switches,
-            std::vector<std::vector<int>>(num_switches,
-            std::vector<int>(m_vnets, -1)));
-    Matrix component_inter_switches(num_switches,
-            std::vector<std::vector<int>>(num_switches,
-            std::vector<int>(m_vnets, 0)));
-
-    // Set identity weights to zero
-    for (int i = 0; i < topology_weights[0].size(); i++) {
-        for (int v = 0; v < m_vnets; v++) {
-            topology_weights[v][i][i] = 0;
-        }
-    }
+    std::vector<std::vector<int>> link_weights;
+    link_weights.reserve(m_link_map.size());
+    std::vector<AdjacencyList> in_links(m_vnets,
+            AdjacencyList(num_switches));
 
     // Fill in the topology weights and bandwidth multipliers
-    for (auto link_group : m_link_map) {
+    for (const auto &link_group : m_link_map) {
         std::pair<int, int> src_dest = link_group.first;
         std::vector<bool> vnet_done(m_vnets, 0);
+        std::vector<int> weights(m_vnets, INFINITE_LATENCY);
         int src = src_dest.first;
         int dst = src_dest.second;
 
         // Iterate over all links for this source and destination
-        std::vector<LinkEntry> link_entries = link_group.second;
+        const std::vector<LinkEntry> &link_entries = link_group.second;
         for (int l = 0; l < link_entries.size(); l++) {
             BasicLink* link = link_entries[l].link;
             if (link->mVnets.size() == 0) {
@@ -160,8 +158,7 @@ Topology::createLinks(Network *net)
                     fatal_if(vnet_done[v], "Two links connecting same src"
                     " and destination cannot support same vnets");
 
-                    component_latencies[src][dst][v] = link->m_latency;
-                    topology_weights[v][src][dst] = link->m_weight;
+                    weights[v] = link->m_weight;
                     vnet_done[v] = true;
                 }
             } else {
@@ -174,43 +171,54 @@ Topology::createLinks(Network *net)
                     fatal_if(vnet_done[vnet], "Two links connecting same src"
                     " and destination cannot support same vnets");
 
-                    component_latencies[src][dst][vnet] = link->m_latency;
-                    topology_weights[vnet][src][dst] = link->m_weight;
+                    weights[vnet] = link->m_weight;
                     vnet_done[vnet] = true;
                 }
             }
         }
+
+        for (int v = 0; v < m_vnets; v++) {
+            if (src != dst && weights[v] != INFINITE_LATENCY)
+                in_links[v][dst].emplace_back(src, weights[v]);
+        }
+        link_weights.push_back(weights);
     }
 
     // Walk topology and hookup the links
-    Matrix dist = shortest_path(topology_weights, component_latencies,
-                                component_inter_switches);
-
-    for (int i = 0; i < topology_weights[0].size(); i++) {
-        for (int j = 0; j < topology_weights[0][i].size(); j++) {
-            std::vector<NetDest> routingMap;
-            routingMap.resize(m_vnets);
-
-            // Not all sources and destinations are connected
-            // by direct links. We only construct the links
-            // which have been configured in topology.
-            bool realLink = false;
-
-            for (int v = 0; v < m_vnets; v++) {
-                int weight = topology_weights[v][i][j];
-                if (weight > 0 && weight != INFINITE_LATENCY) {
-                    realLink = true;
-                    routingMap[v] =
-                        shortest_path_to_node(i, j, topology_weights, dist, v);
-                }
-            }
-            // Make one link for each set of vnets between
-            // a given source and destination. We do not
-            // want to create one link for each vnet.
-            if (realLink) {
-                makeLink(net, i, j, routingMap);
+    Matrix dist = shortest_path(in_links);
+
+    // Links are made in (src, dest) order, which fixes the port
+    // numbering of the routers
+    int l = 0;
+    for (const auto &link_group : m_link_map) {
+        int i = link_group.first.first;
+        int j = link_group.first.second;
+        const std::vector<int> &weights = link_weights[l++];
+        if (i == j)
+            continue;
+
+        std::vector<NetDest> routingMap;
+        routingMap.resize(m_vnets);
+
+        // Not all sources and destinations are connected
+        // by direct links. We only construct the links
+        // which have been configured in topology.
+        bool realLink = false;
+
+        for (int v = 0; v < m_vnets; v++) {
+            int weight = weights[v];
+            if (weight > 0 && weight != INFINITE_LATENCY) {
+                realLink = true;
+                routingMap[v] =
+                    shortest_path_to_node(i, j, weight, dist, v);
             }
         }
+        // Make one link for each set of vnets between
+        // a given source and destination. We do not
+        // want to create one link for each vnet.
+        if (realLink) {
+            makeLink(net, i, j, routingMap);
+        }
     }
 }
 
@@ -330,88 +338,65 @@ Topology::makeLink(Network *net, SwitchID src, SwitchID dest,
     }
 }
 
-// The following all-pairs shortest path algorithm is based on the
-// discussion from Cormen et al., Chapter 26.1.
-void
-Topology::extend_shortest_path(Matrix &current_dist, Matrix &latencies,
-    Matrix &inter_switches)
+// Distances to the network output endpoints (switches
+// [m_nodes, 2*m_nodes)) for every vnet: one Dijkstra run per endpoint
+// over the reversed graph, so the cost grows with the number of
+// endpoints times the number of links rather than with the cube of
+// the number of switches. Distances are capped at INFINITE_LATENCY,
+// which also marks unreachable switches.
+Matrix
+Topology::shortest_path(const std::vector<AdjacencyList> &in_links)
 {
-    int nodes = current_dist[0].size();
+    int num_switches = in_links[0].size();
+    Matrix dist(m_vnets, std::vector<std::vector<int>>(m_nodes));
 
-    // We find the shortest path for each vnet for a given pair of
-    // source and destinations. This is done simply by traversing via
-    // all other nodes and finding the minimum distance.
+    typedef std::pair<int, SwitchID> QueueEntry; // (distance, switch)
     for (int v = 0; v < m_vnets; v++) {
-        // There is a different topology for each vnet. Here we try to
-        // build a topology by finding the minimum number of intermediate
-        // switches needed to reach the destination
-        bool change = true;
-        while (change) {
-            change = false;
-            for (int i = 0; i < nodes; i++) {
-                for (int j = 0; j < nodes; j++) {
-                    // We follow an iterative process to build the shortest
-                    // path tree:
-                    // 1. Start from the direct connection (if there is one,
-                    // otherwise assume a hypothetical infinite weight link).
-                    // 2. Then we iterate through all other nodes considering
-                    // new potential intermediate switches. If we find any
-                    // lesser weight combination, we set(update) that as the
-                    // new weight between the source and destination.
-                    // 3. Repeat for all pairs of nodes.
-                    // 4. Go to step 1 if there was any new update done in
-                    // Step 2.
-                    int minimum = current_dist[v][i][j];
-                    int previous_minimum = minimum;
-                    int intermediate_switch = -1;
-                    for (int k = 0; k < nodes; k++) {
-                        minimum = std::min(minimum,
-                            current_dist[v][i][k] + current_dist[v][k][j]);
-                        if (previous_minimum != minimum) {
-                            intermediate_switch = k;
-                            inter_switches[i][j][v] =
-                                inter_switches[i][k][v] +
-                                inter_switches[k][j][v] + 1;
-                        }
-                        previous_minimum = minimum;
-                    }
-                    if (current_dist[v][i][j] != minimum) {
-                        change = true;
-                        current_dist[v][i][j] = minimum;
-                        assert(intermediate_switch >= 0);
-                        assert(intermediate_switch < latencies[i].size());
-                        latencies[i][j][v] =
-                            latencies[i][intermediate_switch][v] +
-                            latencies[intermediate_switch][j][v];
+        for (NodeID d = 0; d < m_nodes; d++) {
+            std::vector<int> &dist_to = dist[v][d];
+            dist_to.assign(num_switches, INT_MAX);
+
+            SwitchID final = d + m_nodes;
+            if ((int)final >= num_switches)
+                continue;
+
+            std::priority_queue<QueueEntry, std::vector<QueueEntry>,
+                                std::greater<QueueEntry>> queue;
+            dist_to[final] = 0;
+            queue.emplace(0, final);
+            while (!queue.empty()) {
+                QueueEntry entry = queue.top();
+                queue.pop();
+                if (entry.first > dist_to[entry.second])
+                    continue;
+                for (const auto &link : in_links[v][entry.second]) {
+                    int new_dist = entry.first + link.second;
+                    if (new_dist < dist_to[link.first]) {
+                        dist_to[link.first] = new_dist;
+                        queue.emplace(new_dist, link.first);
                     }
                 }
             }
+
+            for (int &value : dist_to)
+                value = std::min(value, INFINITE_LATENCY);
         }
     }
-}
-
-Matrix
-Topology::shortest_path(const Matrix &weights, Matrix &latencies,
-                        Matrix &inter_switches)
-{
-    Matrix dist = weights;
-    extend_shortest_path(dist, latencies, inter_switches);
     return dist;
 }
 
 bool
 Topology::link_is_shortest_path_to_node(SwitchID src, SwitchID next,
-                                        SwitchID final, const Matrix &weights,
+                                        NodeID final, int weight,
                                         const Matrix &dist, int vnet)
 {
-    return weights[vnet][src][next] + dist[vnet][next][final] ==
-        dist[vnet][src][final];
+    const std::vector<int> &dist_to = dist[vnet][final];
+    return weight + dist_to[next] == dist_to[src];
 }
 
 NetDest
-Topology::shortest_path_to_node(SwitchID src, SwitchID next,
-                                const Matrix &weights, const Matrix &dist,
-                                int vnet)
+Topology::shortest_path_to_node(SwitchID src, SwitchID next, int weight,
+                                const Matrix &dist, int vnet)
 {
     NetDest result;
     int d = 0;
@@ -423,13 +408,10 @@ Topology::shortest_path_to_node(SwitchID src, SwitchID next,
 
     for (int m = 0; m < machines; m++) {
         for (NodeID i = 0; i < MachineType_base_count((MachineType)m); i++) {
-            // we use "d+max_machines" below since the "destination"
-            // switches for the machines are numbered
-            // [MachineType_base_number(MachineType_NUM)...
-            //  2*MachineType_base_number(MachineType_NUM)-1] for the
-            // component network
-            if (link_is_shortest_path_to_node(src, next, d + max_machines,
-                    weights, dist, vnet)) {
+            // dist is indexed by the machine number d, whose
+            // "destination" switch is d+max_machines (see shortest_path())
+            if (link_is_shortest_path_to_node(src, next, d, weight,
+                    dist, vnet)) {
                 MachineID mach = {(MachineType)m, i};
                 result.add(mach);
             }
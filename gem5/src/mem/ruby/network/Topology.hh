@@ -58,13 +58,18 @@ class NetDest;
 class Network;
 
 /*
- * We use a three-dimensional vector matrix for calculating
- * the shortest paths for each pair of source and destination
- * and for each type of virtual network. The three dimensions
- * represent the source ID, destination ID, and vnet number.
+ * Shortest-path distances indexed by vnet, destination machine and
+ * source switch: dist[vnet][d][src] is the distance from switch src to
+ * the output endpoint of machine d.
  */
 typedef std::vector<std::vector<std::vector<int>>> Matrix;
 
+/*
+ * Weighted links into each switch, for one vnet: entry dst holds the
+ * (src, weight) pair of every link ending at dst.
+ */
+typedef std::vector<std::vector<std::pair<SwitchID, int>>> AdjacencyList;
+
 struct LinkEntry
 {
     BasicLink *link;
@@ -83,6 +88,9 @@ class Topology
              const std::vector<BasicIntLink *> &int_links);
 
     uint32_t numSwitches() const { return m_number_of_switches; }
+    // Internal links made by the network itself rather than passed in
+    // the int_links parameter; must be added before createLinks()
+    void addIntLink(BasicIntLink *int_link);
     void createLinks(Network *net);
     void print(std::ostream& out) const { out << "[Topology]"; }
 
@@ -93,20 +101,14 @@ class Topology
     void makeLink(Network *net, SwitchID src, SwitchID dest,
                   std::vector<NetDest>& routing_table_entry);
 
-    // Helper functions based on chapter 29 of Cormen et al.
-    void extend_shortest_path(Matrix &current_dist, Matrix &latencies,
-                              Matrix &inter_switches);
-
-    Matrix shortest_path(const Matrix &weights,
-            Matrix &latencies, Matrix &inter_switches);
+    // Single-destination shortest paths (Dijkstra) to every endpoint
+    Matrix shortest_path(const std::vector<AdjacencyList> &in_links);
 
     bool link_is_shortest_path_to_node(SwitchID src, SwitchID next,
-            SwitchID final, const Matrix &weights, const Matrix &dist,
-            int vnet);
+            NodeID final, int weight, const Matrix &dist, int vnet);
 
-    NetDest shortest_path_to_node(SwitchID src, SwitchID next,
-                                  const Matrix &weights, const Matrix &dist,
-                                  int vnet);
+    NetDest shortest_path_to_node(SwitchID src, SwitchID next, int weight,
+                                  const Matrix &dist, int vnet);
 
     const uint32_t m_nodes;
     const uint32_t m_number_of_switches;
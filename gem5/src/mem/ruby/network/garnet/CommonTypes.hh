@@ -31,6 +31,11 @@
 #ifndef __MEM_RUBY_NETWORK_GARNET_0_COMMONTYPES_HH__
 #define __MEM_RUBY_NETWORK_GARNET_0_COMMONTYPES_HH__
 
+#include <algorithm>
+#include <cstdint>
+#include <vector>
+
+#include "base/bitfield.hh"
 #include "mem/ruby/common/NetDest.hh"
 
 namespace gem5
@@ -51,7 +56,8 @@ enum VNET_type {CTRL_VNET_, DATA_VNET_, NULL_VNET_, NUM_VNET_TYPE_};
 enum flit_stage {I_, VA_, SA_, ST_, LT_, NUM_FLIT_STAGE_};
 enum link_type { EXT_IN_, EXT_OUT_, INT_, NUM_LINK_TYPES_ };
 enum RoutingAlgorithm { TABLE_ = 0, XY_ = 1, CUSTOM_ = 2, FATTREE_ = 3, 
-                        FATTREE_ADAPTIVE_ = 4, NUM_ROUTING_ALGORITHM_};
+                        FATTREE_ADAPTIVE_ = 4, TREE_ = 5, TREE_ADAPTIVE_ = 6,
+                        NUM_ROUTING_ALGORITHM_};
 
 struct RouteInfo
 {
@@ -74,6 +80,72 @@ struct RouteInfo
 
 #define INFINITE_ 10000
 
+// Set of router port indices, used by routers with activity tracking
+// to visit only the ports that have work pending, and by the bitmask
+// switch allocators to hold requests and grants
+class PortMask
+{
+  public:
+    void resize(int num_ports) { m_words.assign((num_ports + 63) / 64, 0); }
+    void set(int port) { m_words[port / 64] |= 1ULL << (port % 64); }
+    void clear(int port) { m_words[port / 64] &= ~(1ULL << (port % 64)); }
+    void clearAll() { std::fill(m_words.begin(), m_words.end(), 0); }
+
+    bool
+    empty() const
+    {
+        for (uint64_t word : m_words) {
+            if (word)
+                return false;
+        }
+        return true;
+    }
+
+    bool
+    test(int port) const
+    {
+        return m_words[port / 64] & (1ULL << (port % 64));
+    }
+
+    // Calls f(port) for every port in the set, in increasing order.
+    // f may clear ports from the set.
+    template <typename F>
+    void
+    forEach(F f) const
+    {
+        for (int w = 0; w < m_words.size(); w++) {
+            uint64_t bits = m_words[w];
+            while (bits) {
+                int bit = ctz64(bits);
+                bits &= bits - 1;
+                f(w * 64 + bit);
+            }
+        }
+    }
+
+    // Round-robin search: the first port in the set at or after start,
+    // wrapping around to the lowest port. Returns -1 if the set is empty.
+    int
+    findNext(int start) const
+    {
+        int num_words = m_words.size();
+        if (num_words == 0)
+            return -1;
+        int w = start / 64;
+        uint64_t bits = m_words[w] & (~0ULL << (start % 64));
+        for (int i = 0; i <= num_words; i++) {
+            if (bits)
+                return w * 64 + ctz64(bits);
+            w = (w + 1 == num_words) ? 0 : w + 1;
+            bits = m_words[w];
+        }
+        return -1;
+    }
+
+  private:
+    std::vector<uint64_t> m_words;
+};
+
 } // namespace garnet
 } // namespace ruby
 } // namespace gem5
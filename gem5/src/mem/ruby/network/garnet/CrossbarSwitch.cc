@@ -56,6 +56,13 @@ CrossbarSwitch::init()
     switchBuffers.resize(m_router->get_num_inports());
 }
 
+void
+CrossbarSwitch::update_sw_winner(int inport, flit *t_flit)
+{
+    switchBuffers[inport].insert(t_flit);
+    m_router->getSwitchInports().set(inport);
+}
+
 /*
  * The wakeup function of the CrossbarSwitch loops through all input ports,
  * and sends the winning flit (from SA) out of its output port on to the
@@ -69,7 +76,14 @@ CrossbarSwitch::wakeup()
             "at time: %lld\n",
             m_router->get_id(), m_router->curCycle());
 
-    for (auto& switch_buffer : switchBuffers) {
+    bool activity_tracking = m_router->isActivityTracking();
+    PortMask &switch_inports = m_router->getSwitchInports();
+    for (int inport = 0; inport < switchBuffers.size(); inport++) {
+        // With activity tracking, skip inports without SA winners
+        if (activity_tracking && !switch_inports.test(inport))
+            continue;
+
+        flitBuffer &switch_buffer = switchBuffers[inport];
         if (!switch_buffer.isReady(curTick())) {
             continue;
         }
@@ -87,6 +101,8 @@ CrossbarSwitch::wakeup()
             m_router->getOutputUnit(outport)->insert_flit(t_flit);
             switch_buffer.getTopFlit();
             m_crossbar_activity++;
+            if (switch_buffer.isEmpty())
+                switch_inports.clear(inport);
         }
     }
 }
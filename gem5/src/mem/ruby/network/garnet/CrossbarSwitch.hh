@@ -59,11 +59,7 @@ class CrossbarSwitch : public Consumer
     void init();
     void print(std::ostream& out) const {};
 
-    inline void
-    update_sw_winner(int inport, flit *t_flit)
-    {
-        switchBuffers[inport].insert(t_flit);
-    }
+    void update_sw_winner(int inport, flit *t_flit);
 
     inline double get_crossbar_activity() { return m_crossbar_activity; }
 
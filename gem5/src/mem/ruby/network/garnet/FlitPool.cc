@@ -0,0 +1,235 @@
+/*
+ * Copyright (c) 2026 The gem5 Authors
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+#include "mem/ruby/network/garnet/FlitPool.hh"
+
+#include <atomic>
+#include <mutex>
+#include <new>
+#include <vector>
+
+namespace gem5
+{
+
+namespace ruby
+{
+
+namespace garnet
+{
+
+namespace
+{
+
+struct FreeBlock
+{
+    FreeBlock *next;
+};
+
+// flit and Credit are the only objects allocated through the pool
+const int maxSizeClasses = 4;
+
+// Blocks a thread keeps on each of its free lists. Beyond that, a batch
+// of them goes to the shared depot, where threads that allocate more
+// than they free pick them up again.
+const unsigned maxThreadFree = 1024;
+const unsigned batchSize = maxThreadFree / 2;
+
+struct SizeClasses
+{
+    std::size_t sizes[maxSizeClasses] = {};
+
+    int
+    sizeClass(std::size_t size)
+    {
+        for (int i = 0; i < maxSizeClasses; i++) {
+            if (sizes[i] == size)
+                return i;
+            if (sizes[i] == 0) {
+                sizes[i] = size;
+                return i;
+            }
+        }
+        return -1;
+    }
+};
+
+struct ThreadPool : public SizeClasses
+{
+    FreeBlock *freeLists[maxSizeClasses] = {};
+    unsigned numFree[maxSizeClasses] = {};
+
+    // Written by the owning thread only, read when stats are collated
+    std::atomic<uint64_t> hits{0};
+    std::atomic<uint64_t> misses{0};
+};
+
+// Batches of batchSize blocks, each a null-terminated chain, handed
+// over between threads
+struct Depot : public SizeClasses
+{
+    std::mutex lock;
+    std::vector<FreeBlock *> batches[maxSizeClasses];
+    // Lets allocating threads skip the lock while the depot is empty
+    std::atomic<unsigned> numBatches{0};
+};
+
+Depot &
+depot()
+{
+    static Depot depot;
+    return depot;
+}
+
+std::mutex poolsLock;
+
+// Pools of all threads, kept for the lifetime of the process so that
+// their counters can be summed up
+std::vector<ThreadPool *> &
+allPools()
+{
+    static std::vector<ThreadPool *> pools;
+    return pools;
+}
+
+ThreadPool &
+threadPool()
+{
+    thread_local ThreadPool *pool = nullptr;
+    if (!pool) {
+        pool = new ThreadPool;
+        std::lock_guard<std::mutex> guard(poolsLock);
+        allPools().push_back(pool);
+    }
+    return *pool;
+}
+
+void
+increment(std::atomic<uint64_t> &counter)
+{
+    counter.store(counter.load(std::memory_order_relaxed) + 1,
+                  std::memory_order_relaxed);
+}
+
+// Refill an empty free list with a batch from the depot, if it has one
+bool
+refill(ThreadPool &pool, int cls, std::size_t size)
+{
+    Depot &shared = depot();
+    if (shared.numBatches.load(std::memory_order_relaxed) == 0)
+        return false;
+
+    std::lock_guard<std::mutex> guard(shared.lock);
+    int depot_cls = shared.sizeClass(size);
+    if (depot_cls < 0 || shared.batches[depot_cls].empty())
+        return false;
+    pool.freeLists[cls] = shared.batches[depot_cls].back();
+    pool.numFree[cls] = batchSize;
+    shared.batches[depot_cls].pop_back();
+    shared.numBatches.fetch_sub(1, std::memory_order_relaxed);
+    return true;
+}
+
+// Move a batch off a full free list to the depot
+void
+spill(ThreadPool &pool, int cls, std::size_t size)
+{
+    FreeBlock *batch = pool.freeLists[cls];
+    FreeBlock *last = batch;
+    for (unsigned i = 1; i < batchSize; i++)
+        last = last->next;
+    pool.freeLists[cls] = last->next;
+    pool.numFree[cls] -= batchSize;
+    last->next = nullptr;
+
+    Depot &shared = depot();
+    std::lock_guard<std::mutex> guard(shared.lock);
+    int depot_cls = shared.sizeClass(size);
+    if (depot_cls < 0) {
+        while (batch) {
+            FreeBlock *next = batch->next;
+            ::operator delete(batch);
+            batch = next;
+        }
+        return;
+    }
+    shared.batches[depot_cls].push_back(batch);
+    shared.numBatches.fetch_add(1, std::memory_order_relaxed);
+}
+
+} // anonymous namespace
+
+void *
+FlitPool::allocate(std::size_t size)
+{
+    ThreadPool &pool = threadPool();
+    int cls = pool.sizeClass(size);
+    if (cls >= 0 && (pool.freeLists[cls] || refill(pool, cls, size))) {
+        FreeBlock *block = pool.freeLists[cls];
+        pool.freeLists[cls] = block->next;
+        pool.numFree[cls]--;
+        increment(pool.hits);
+        return block;
+    }
+    increment(pool.misses);
+    return ::operator new(size);
+}
+
+void
+FlitPool::release(void *ptr, std::size_t size)
+{
+    if (!ptr)
+        return;
+    ThreadPool &pool = threadPool();
+    int cls = pool.sizeClass(size);
+    if (cls < 0) {
+        ::operator delete(ptr);
+        return;
+    }
+    FreeBlock *block = static_cast<FreeBlock *>(ptr);
+    block->next = pool.freeLists[cls];
+    pool.freeLists[cls] = block;
+    if (++pool.numFree[cls] > maxThreadFree)
+        spill(pool, cls, size);
+}
+
+FlitPool::Counters
+FlitPool::counters()
+{
+    Counters total;
+    std::lock_guard<std::mutex> guard(poolsLock);
+    for (auto pool : allPools()) {
+        total.hits += pool->hits.load(std::memory_order_relaxed);
+        total.misses += pool->misses.load(std::memory_order_relaxed);
+    }
+    return total;
+}
+
+} // namespace garnet
+} // namespace ruby
+} // namespace gem5
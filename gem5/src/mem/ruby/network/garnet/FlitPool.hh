@@ -0,0 +1,79 @@
+/*
+ * Copyright (c) 2026 The gem5 Authors
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+#ifndef __MEM_RUBY_NETWORK_GARNET_0_FLITPOOL_HH__
+#define __MEM_RUBY_NETWORK_GARNET_0_FLITPOOL_HH__
+
+#include <cstddef>
+#include <cstdint>
+
+namespace gem5
+{
+
+namespace ruby
+{
+
+namespace garnet
+{
+
+// Free-list allocator behind flit::operator new/delete.
+//
+// Flits and credits are created and freed for every packet and every
+// hop, so freed objects are kept on a free list of their size class
+// and handed out again instead of going back to the heap. The free
+// lists are per thread, which keeps allocation a pointer pop without
+// any locking when the network is spread over several event queues.
+// A flit freed by another thread than the one that allocated it goes
+// to that thread's free list. Each list holds at most 1024 blocks; the
+// surplus moves in batches to a shared, locked depot that threads
+// which allocate more than they free refill from before going to the
+// heap, so one-sided traffic between partitions neither grows a list
+// without bound nor misses on every allocation.
+class FlitPool
+{
+  public:
+    struct Counters
+    {
+        uint64_t hits = 0;   // allocations served from a free list
+        uint64_t misses = 0; // allocations that went to the heap
+    };
+
+    static void *allocate(std::size_t size);
+    static void release(void *ptr, std::size_t size);
+
+    // Totals over all threads. Only meaningful while the event queues
+    // are synchronized, e.g. when the stats are dumped.
+    static Counters counters();
+};
+
+} // namespace garnet
+} // namespace ruby
+} // namespace gem5
+
+#endif // __MEM_RUBY_NETWORK_GARNET_0_FLITPOOL_HH__
@@ -31,20 +31,31 @@
 
 #include "mem/ruby/network/garnet/GarnetNetwork.hh"
 
+#include <algorithm>
 #include <cassert>
+#include <cmath>
+#include <numeric>
+#include <unordered_map>
+#include <utility>
 
 #include "base/cast.hh"
 #include "base/compiler.hh"
+#include "base/output.hh"
 #include "debug/RubyNetwork.hh"
 #include "mem/ruby/common/NetDest.hh"
 #include "mem/ruby/network/MessageBuffer.hh"
+#include "mem/ruby/network/Topology.hh"
 #include "mem/ruby/network/garnet/CommonTypes.hh"
 #include "mem/ruby/network/garnet/CreditLink.hh"
+#include "mem/ruby/network/garnet/FlitPool.hh"
 #include "mem/ruby/network/garnet/GarnetLink.hh"
+#include "mem/ruby/network/garnet/InputUnit.hh"
 #include "mem/ruby/network/garnet/NetworkInterface.hh"
 #include "mem/ruby/network/garnet/NetworkLink.hh"
 #include "mem/ruby/network/garnet/Router.hh"
 #include "mem/ruby/system/RubySystem.hh"
+#include "sim/sim_exit.hh"
+#include "sim/stat_control.hh"
 
 namespace gem5
 {
@@ -55,6 +66,35 @@ namespace ruby
 namespace garnet
 {
 
+namespace
+{
+
+// Two-sided 95% quantiles of Student's t distribution for 1..30 degrees
+// of freedom. Larger samples use the normal quantile.
+const double tQuantile95[] = {
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042
+};
+
+// Mean and 95% confidence interval half-width of a set of batch means
+std::pair<double, double>
+confidenceInterval(const std::vector<double> &samples)
+{
+    int n = samples.size();
+    assert(n > 1);
+    double mean = std::accumulate(samples.begin(), samples.end(), 0.0) / n;
+    double var = 0;
+    for (double x : samples)
+        var += (x - mean) * (x - mean);
+    var /= n - 1;
+
+    double t = (n - 1 <= 30) ? tQuantile95[n - 2] : 1.960;
+    return std::make_pair(mean, t * std::sqrt(var / n));
+}
+
+} // anonymous namespace
+
 /*
  * GarnetNetwork sets up the routers and links and collects stats.
  * Default parameters (GarnetNetwork.py) can be overwritten from command line
@@ -62,21 +102,57 @@ namespace garnet
  */
 
 GarnetNetwork::GarnetNetwork(const Params &p)
-    : Network(p)
+    : Network(p),
+      m_measure_end_event([this]{ endMeasurement(); },
+                          "GarnetNetwork measurement end"),
+      m_measure_drain_event([this]{ checkMeasurementDrained(); },
+                            "GarnetNetwork measurement drain check"),
+      m_convergence_event([this]{ checkConvergence(); },
+                          "GarnetNetwork convergence monitor"),
+      m_sample_event([this]{ takeSample(); }, "GarnetNetwork sampler")
 {
     m_num_rows = p.num_rows;
     m_num_pods = p.num_pods;
+    m_tree_children = p.tree_children;
+    m_tree_parents = p.tree_parents;
     m_ni_flit_size = p.ni_flit_size;
     m_max_vcs_per_vnet = 0;
     m_buffers_per_data_vc = p.buffers_per_data_vc;
     m_buffers_per_ctrl_vc = p.buffers_per_ctrl_vc;
     m_routing_algorithm = p.routing_algorithm;
+    m_activity_tracking = p.activity_tracking;
+
+    m_sa_policy = p.switch_allocator;
+    m_islip_iterations = p.islip_iterations;
+    fatal_if(m_islip_iterations < 1,
+             "%s: islip_iterations must be at least 1\n", name());
     m_next_packet_id = 0;
 
     m_enable_fault_model = p.enable_fault_model;
     if (m_enable_fault_model)
         fault_model = p.fault_model;
 
+    m_warmup_cycles = p.warmup_cycles;
+    m_measure_cycles = p.measure_cycles;
+    m_measure_start = 0;
+    m_measure_end = MaxTick;
+    m_measure_ended = false;
+    m_measured_in_flight = 0;
+
+    m_convergence_window = p.convergence_window;
+    m_convergence_tolerance = p.convergence_tolerance;
+    m_convergence_min_windows = p.convergence_min_windows;
+    m_saturation_growth = p.saturation_latency_growth;
+    fatal_if(m_convergence_min_windows < 2,
+             "%s: convergence_min_windows must be at least 2\n", name());
+    m_last_received_packets = 0;
+    m_last_packet_latency = 0;
+    m_windows_elapsed = 0;
+
+    m_sample_interval = p.sample_interval;
+    m_sample_file_name = p.sample_file;
+    m_sample_stream = nullptr;
+
     m_vnet_type.resize(m_virtual_networks);
 
     for (int i = 0 ; i < m_virtual_networks ; i++) {
@@ -87,17 +163,17 @@ GarnetNetwork::GarnetNetwork(const Params &p)
     }
 
     // record the routers
-    m_router_congestion_values.resize(0); 
     for (std::vector<BasicRouter*>::const_iterator i =  p.routers.begin();
          i != p.routers.end(); ++i) {
         Router* router = safe_cast<Router*>(*i);
         m_routers.push_back(router);
-        m_router_congestion_values.push_back(0); /// Lab4: Initialize congestion values
 
         // initialize the router's network pointers
         router->init_net_ptr(this);
     }
 
+    makeIntLinkTable(p);
+
     // record the network interfaces
     for (std::vector<ClockedObject*>::const_iterator i = p.netifs.begin();
          i != p.netifs.end(); ++i) {
@@ -110,6 +186,86 @@ GarnetNetwork::GarnetNetwork(const Params &p)
     inform("Garnet version %s\n", garnetVersion);
 }
 
+// Create the internal links described by the int_link_table parameters
+// (see GarnetNetwork.py: set_int_link_table()) and hand them to the
+// topology together with the GarnetIntLinks made in Python. The links are
+// set up exactly like GarnetIntLinks without bridges: the flit link runs
+// on the event queue of the source router, the credit link on the one of
+// the destination router.
+void
+GarnetNetwork::makeIntLinkTable(const Params &p)
+{
+    size_t num_links = p.int_link_table_src.size();
+    fatal_if(p.int_link_table_dst.size() != num_links ||
+             p.int_link_table_src_outport.size() != num_links ||
+             p.int_link_table_dst_inport.size() != num_links ||
+             p.int_link_table_latency.size() != num_links ||
+             p.int_link_table_weight.size() != num_links,
+             "%s: the int_link_table columns differ in length\n", name());
+    if (num_links == 0)
+        return;
+
+    std::unordered_map<int, BasicRouter *> routers;
+    for (BasicRouter *router : p.routers)
+        routers[router->params().router_id] = router;
+    auto find_router = [&](int router_id) {
+        auto it = routers.find(router_id);
+        fatal_if(it == routers.end(), "%s: int_link_table refers to "
+                 "unknown router %d\n", name(), router_id);
+        return it->second;
+    };
+
+    for (size_t i = 0; i < num_links; i++) {
+        BasicRouter *src = find_router(p.int_link_table_src[i]);
+        BasicRouter *dst = find_router(p.int_link_table_dst[i]);
+        int link_id = p.int_link_table_first_id + i;
+        std::string link_name = csprintf("%s.int_link_table%d", name(), i);
+
+        NetworkLinkParams &net_p =
+            m_table_network_link_params.emplace_back();
+        net_p.name = link_name + ".network_link";
+        net_p.eventq_index = src->params().eventq_index;
+        net_p.clk_domain = p.clk_domain;
+        net_p.power_state = p.power_state;
+        net_p.link_id = link_id;
+        net_p.link_latency = p.int_link_table_latency[i];
+        net_p.vcs_per_vnet = p.vcs_per_vnet;
+        net_p.virt_nets = p.number_of_virtual_networks;
+        net_p.width = p.ni_flit_size;
+
+        CreditLinkParams &credit_p =
+            m_table_credit_link_params.emplace_back();
+        static_cast<NetworkLinkParams &>(credit_p) = net_p;
+        credit_p.name = link_name + ".credit_link";
+        credit_p.eventq_index = dst->params().eventq_index;
+
+        GarnetIntLinkParams &link_p = m_table_int_link_params.emplace_back();
+        link_p.name = link_name;
+        link_p.eventq_index = p.eventq_index;
+        link_p.link_id = link_id;
+        link_p.latency = p.int_link_table_latency[i];
+        link_p.bandwidth_factor = 16;
+        link_p.weight = p.int_link_table_weight[i];
+        link_p.src_node = src;
+        link_p.dst_node = dst;
+        link_p.src_outport = p.int_link_table_src_outport[i];
+        link_p.dst_inport = p.int_link_table_dst_inport[i];
+        link_p.network_link = net_p.create();
+        link_p.credit_link = credit_p.create();
+        link_p.src_cdc = false;
+        link_p.dst_cdc = false;
+        link_p.src_serdes = false;
+        link_p.dst_serdes = false;
+        link_p.src_net_bridge = nullptr;
+        link_p.dst_net_bridge = nullptr;
+        link_p.src_cred_bridge = nullptr;
+        link_p.dst_cred_bridge = nullptr;
+        link_p.width = p.ni_flit_size;
+
+        m_topology_ptr->addIntLink(link_p.create());
+    }
+}
+
 void
 GarnetNetwork::init()
 {
@@ -143,6 +299,26 @@ GarnetNetwork::init()
         m_num_pods = -1;
     }
 
+    // FatTree routing looks routes up in per-router tables built here
+    if (m_routing_algorithm == FATTREE_ ||
+        m_routing_algorithm == FATTREE_ADAPTIVE_) {
+        fatal_if(m_num_pods <= 0,
+                 "FatTree routing requires num_pods to be set\n");
+        for (auto &router : m_routers)
+            router->init_fattree_routes(m_num_pods);
+    }
+
+    // Folded-Clos routing works out each route from the tree shape
+    if (m_routing_algorithm == TREE_ ||
+        m_routing_algorithm == TREE_ADAPTIVE_) {
+        fatal_if(m_tree_children.empty() ||
+                 m_tree_parents.size() + 1 != m_tree_children.size(),
+                 "Tree routing requires tree_children and one fewer "
+                 "tree_parents to be set\n");
+        for (auto &router : m_routers)
+            router->init_tree_routes();
+    }
+
     // FaultModel: declare each router to the fault model
     if (isFaultModelEnabled()) {
         for (std::vector<Router*>::const_iterator i= m_routers.begin();
@@ -161,6 +337,151 @@ GarnetNetwork::init()
     }
 }
 
+void
+GarnetNetwork::startup()
+{
+    Network::startup();
+
+    // Warm-up: the stats of the cold-start transient are discarded
+    if (m_warmup_cycles > 0) {
+        m_measure_start = clockEdge(m_warmup_cycles);
+        statistics::schedStatEvent(false, true, m_measure_start);
+    }
+    if (m_measure_cycles > 0) {
+        m_measure_end = clockEdge(m_warmup_cycles + m_measure_cycles);
+        schedule(m_measure_end_event, m_measure_end);
+    }
+
+    if (m_convergence_window > 0)
+        schedule(m_convergence_event, clockEdge(m_convergence_window));
+
+    if (m_sample_interval > 0) {
+        // The sampler reads the counters of every router from the
+        // network's event queue
+        for (Router *router : m_routers) {
+            fatal_if(router->eventQueue() != eventQueue(),
+                     "%s: sample_interval does not work with routers on "
+                     "several event queues\n", name());
+        }
+        openSampleFile();
+        schedule(m_sample_event, clockEdge(m_sample_interval));
+    }
+}
+
+void
+GarnetNetwork::measuredPacketReceived()
+{
+    assert(m_measured_in_flight > 0);
+    m_measured_in_flight--;
+    if (m_measure_ended)
+        checkMeasurementDrained();
+}
+
+/*
+ * Packets created after the measurement window keep being injected so that
+ * the measured packets drain under the same load. The simulation ends when
+ * the last measured packet has been received.
+ */
+
+void
+GarnetNetwork::endMeasurement()
+{
+    m_measure_ended = true;
+    checkMeasurementDrained();
+}
+
+void
+GarnetNetwork::checkMeasurementDrained()
+{
+    // Each measured packet received checks again
+    if (m_measured_in_flight > 0)
+        return;
+
+    // Packets still queued in the NIs are not received by themselves, so
+    // look again every cycle until they are injected
+    for (auto *ni : m_nis) {
+        if (ni->hasQueuedMessageBefore(m_measure_end)) {
+            if (!m_measure_drain_event.scheduled())
+                schedule(m_measure_drain_event, clockEdge(Cycles(1)));
+            return;
+        }
+    }
+
+    exitSimLoop(csprintf("garnet measurement window drained after %d "
+                         "cycles", uint64_t(curCycle())));
+}
+
+/*
+ * The convergence monitor treats every window of m_convergence_window
+ * cycles as one batch. The first window after start-up or a stats reset
+ * holds the cold-start transient and is dropped. Once enough batches are
+ * available the run ends if either
+ *  - the latency grew in each of the last m_convergence_min_windows
+ *    windows and by more than m_saturation_growth overall (saturation,
+ *    the latency grows without bound), or
+ *  - the 95% confidence intervals of the batch means of latency and
+ *    throughput are within m_convergence_tolerance of their means.
+ */
+
+void
+GarnetNetwork::checkConvergence()
+{
+    double received = m_packets_received.total();
+    double latency = m_packet_network_latency.total() +
+        m_packet_queueing_latency.total();
+
+    double window_received = received - m_last_received_packets;
+    double window_latency = latency - m_last_packet_latency;
+    m_last_received_packets = received;
+    m_last_packet_latency = latency;
+
+    if (m_windows_elapsed++ > 0 && window_received > 0) {
+        m_window_latency.push_back(
+            window_latency / window_received / clockPeriod());
+        m_window_throughput.push_back(
+            window_received / m_nodes / m_convergence_window);
+    }
+
+    int n = m_window_latency.size();
+    int min_windows = m_convergence_min_windows;
+    if (n >= min_windows) {
+        int first = n - min_windows;
+        bool growing = m_window_latency[n - 1] >
+            (1 + m_saturation_growth) * m_window_latency[first];
+        for (int i = first + 1; growing && i < n; i++)
+            growing = m_window_latency[i] > m_window_latency[i - 1];
+
+        if (growing) {
+            std::string cause = csprintf("garnet network saturated after "
+                "%d cycles: packet latency grew from %.1f to %.1f cycles "
+                "over the last %d windows", uint64_t(curCycle()),
+                m_window_latency[first], m_window_latency[n - 1],
+                min_windows);
+            inform("%s\n", cause);
+            exitSimLoop(cause);
+            return;
+        }
+
+        auto latency_ci = confidenceInterval(m_window_latency);
+        auto throughput_ci = confidenceInterval(m_window_throughput);
+        if (latency_ci.second <=
+                m_convergence_tolerance * latency_ci.first &&
+            throughput_ci.second <=
+                m_convergence_tolerance * throughput_ci.first) {
+            std::string cause = csprintf("garnet network reached steady "
+                "state after %d cycles: packet latency %.2f +/- %.2f "
+                "cycles, throughput %.4f +/- %.4f packets/node/cycle",
+                uint64_t(curCycle()), latency_ci.first, latency_ci.second,
+                throughput_ci.first, throughput_ci.second);
+            inform("%s\n", cause);
+            exitSimLoop(cause);
+            return;
+        }
+    }
+
+    schedule(m_convergence_event, clockEdge(m_convergence_window));
+}
+
 /*
  * This function creates a link from the Network Interface (NI)
  * into the Network.
@@ -168,6 +489,106 @@ GarnetNetwork::init()
  * the Router to the NI
 */
 
+// Sample file: a header, the ends of each link and the location of each
+// VC, followed by one fixed-size record per sample. All values are
+// little-endian; util/garnet_samples.py reads the file into NumPy arrays.
+//
+//   header:  char magic[8] = "GNSAMPL1", uint32 num_routers, num_links,
+//            num_vcs, sample interval (cycles), uint64 ticks per cycle
+//   links:   int32 src router, int32 dst router (-1: an NI), per link
+//   VCs:     uint32 router, uint16 inport, uint16 vc, per VC
+//   records: uint64 tick, then uint32 per router (flits buffered at the
+//            sample), per link (flits sent since the last sample) and
+//            per VC (cycles its flits waited in switch allocation since
+//            the last sample, including a wait still in progress)
+void
+GarnetNetwork::openSampleFile()
+{
+    m_sample_stream = simout.create(m_sample_file_name, true);
+    std::ostream &os = *m_sample_stream->stream();
+    auto put = [&os](auto value) {
+        os.write(reinterpret_cast<const char *>(&value), sizeof(value));
+    };
+
+    int num_vcs = 0;
+    for (Router *router : m_routers)
+        num_vcs += router->get_num_inports() * router->get_num_vcs();
+
+    os.write("GNSAMPL1", 8);
+    put(uint32_t(m_routers.size()));
+    put(uint32_t(m_networklinks.size()));
+    put(uint32_t(num_vcs));
+    put(uint32_t(m_sample_interval));
+    put(uint64_t(clockPeriod()));
+    for (const auto &ends : m_networklink_ends) {
+        put(int32_t(ends.first));
+        put(int32_t(ends.second));
+    }
+    for (Router *router : m_routers) {
+        for (int inport = 0; inport < router->get_num_inports(); inport++) {
+            for (int vc = 0; vc < router->get_num_vcs(); vc++) {
+                put(uint32_t(router->get_id()));
+                put(uint16_t(inport));
+                put(uint16_t(vc));
+            }
+        }
+    }
+
+    m_sample_last_link.assign(m_networklinks.size(), 0);
+    m_sample_last_stall.assign(num_vcs, 0);
+    m_sample_record.resize(m_routers.size() + m_networklinks.size() +
+                           num_vcs);
+}
+
+// Only counters the routers and links keep anyway are read, so a sample
+// costs one pass over the routers, links and VCs.
+void
+GarnetNetwork::takeSample()
+{
+    uint32_t *value = m_sample_record.data();
+    for (Router *router : m_routers) {
+        int buffered = 0;
+        for (int inport = 0; inport < router->get_num_inports(); inport++) {
+            buffered +=
+                router->getInputUnit(inport)->get_num_buffered_flits();
+        }
+        *value++ = buffered;
+    }
+    for (int i = 0; i < m_networklinks.size(); i++) {
+        unsigned int utilized = m_networklinks[i]->getLinkUtilization();
+        *value++ = utilized - m_sample_last_link[i];
+        m_sample_last_link[i] = utilized;
+    }
+    int vc_index = 0;
+    for (Router *router : m_routers) {
+        for (int inport = 0; inport < router->get_num_inports(); inport++) {
+            InputUnit *input_unit = router->getInputUnit(inport);
+            for (int vc = 0; vc < router->get_num_vcs(); vc++) {
+                // A flit is only charged its wait once it is granted,
+                // so a flit still waiting has its wait so far counted
+                // here, and the remainder at its grant
+                uint64_t stall = input_unit->get_stall_cycles(vc);
+                if (input_unit->need_stage(vc, SA_, curTick())) {
+                    Tick since = input_unit->peekTopFlit(vc)->get_stage()
+                                     .second;
+                    stall += router->ticksToCycles(curTick() - since);
+                }
+                *value++ = stall - m_sample_last_stall[vc_index];
+                m_sample_last_stall[vc_index++] = stall;
+            }
+        }
+    }
+
+    std::ostream &os = *m_sample_stream->stream();
+    uint64_t tick = curTick();
+    os.write(reinterpret_cast<const char *>(&tick), sizeof(tick));
+    os.write(reinterpret_cast<const char *>(m_sample_record.data()),
+             m_sample_record.size() * sizeof(uint32_t));
+    os.flush();
+
+    schedule(m_sample_event, clockEdge(m_sample_interval));
+}
+
 void
 GarnetNetwork::makeExtInLink(NodeID global_src, SwitchID dest, BasicLink* link,
                              std::vector<NetDest>& routing_table_entry)
@@ -183,6 +604,7 @@ GarnetNetwork::makeExtInLink(NodeID global_src, SwitchID dest, BasicLink* link,
     CreditLink* credit_link = garnet_link->m_credit_links[LinkDirection_In];
 
     m_networklinks.push_back(net_link);
+    m_networklink_ends.emplace_back(-1, (int)dest);
     m_creditlinks.push_back(credit_link);
 
     PortDirection dst_inport_dirn = "Local";
@@ -256,6 +678,7 @@ GarnetNetwork::makeExtOutLink(SwitchID src, NodeID global_dest,
     CreditLink* credit_link = garnet_link->m_credit_links[LinkDirection_Out];
 
     m_networklinks.push_back(net_link);
+    m_networklink_ends.emplace_back((int)src, -1);
     m_creditlinks.push_back(credit_link);
 
     PortDirection src_outport_dirn = "Local";
@@ -326,6 +749,7 @@ GarnetNetwork::makeInternalLink(SwitchID src, SwitchID dest, BasicLink* link,
     CreditLink* credit_link = garnet_link->m_credit_link;
 
     m_networklinks.push_back(net_link);
+    m_networklink_ends.emplace_back((int)src, (int)dest);
     m_creditlinks.push_back(credit_link);
 
     m_max_vcs_per_vnet = std::max(m_max_vcs_per_vnet,
@@ -537,6 +961,22 @@ GarnetNetwork::regStats()
         .desc("Average number of hops traversed by packets");
     m_avg_hops = m_total_hops / sum(m_flits_received);
 
+    // Flit and credit allocation
+    m_flit_pool_hits
+        .name(name() + ".flit_pool_hits")
+        .unit(statistics::units::Count::get())
+        .desc("Flits and credits allocated from the free lists");
+    m_flit_pool_misses
+        .name(name() + ".flit_pool_misses")
+        .unit(statistics::units::Count::get())
+        .desc("Flits and credits allocated from the heap");
+    m_flit_pool_hit_rate
+        .name(name() + ".flit_pool_hit_rate")
+        .unit(statistics::units::Ratio::get())
+        .desc("Fraction of flit and credit allocations from the free lists");
+    m_flit_pool_hit_rate =
+        m_flit_pool_hits / (m_flit_pool_hits + m_flit_pool_misses);
+
     /// Reception Rate; Lab1-2
     // m_reception_rate.name(name() + ".reception_rate")
         // .unit(statistics::units::Count::get())
@@ -608,6 +1048,10 @@ GarnetNetwork::collateStats()
         }
     }
 
+    FlitPool::Counters pool = FlitPool::counters();
+    m_flit_pool_hits = pool.hits - m_flit_pool_base.hits;
+    m_flit_pool_misses = pool.misses - m_flit_pool_base.misses;
+
     // Ask the routers to collate their statistics
     for (int i = 0; i < m_routers.size(); i++) {
         m_routers[i]->collateStats();
@@ -617,12 +1061,24 @@ GarnetNetwork::collateStats()
 void
 GarnetNetwork::resetStats()
 {
+    // Restart the convergence monitor on the fresh statistics
+    m_last_received_packets = 0;
+    m_last_packet_latency = 0;
+    m_windows_elapsed = 0;
+    m_window_latency.clear();
+    m_window_throughput.clear();
+
+    // The pool counters are process-wide, count from here on
+    m_flit_pool_base = FlitPool::counters();
+
     for (int i = 0; i < m_routers.size(); i++) {
         m_routers[i]->resetStats();
     }
     for (int i = 0; i < m_networklinks.size(); i++) {
         m_networklinks[i]->resetStats();
     }
+    // The sampler takes link utilization relative to its last sample
+    std::fill(m_sample_last_link.begin(), m_sample_last_link.end(), 0);
     for (int i = 0; i < m_creditlinks.size(); i++) {
         m_creditlinks[i]->resetStats();
     }
@@ -32,13 +32,23 @@
 #ifndef __MEM_RUBY_NETWORK_GARNET_0_GARNETNETWORK_HH__
 #define __MEM_RUBY_NETWORK_GARNET_0_GARNETNETWORK_HH__
 
+#include <deque>
 #include <iostream>
+#include <string>
+#include <utility>
 #include <vector>
 
+#include "base/output.hh"
 #include "mem/ruby/network/Network.hh"
 #include "mem/ruby/network/fault_model/FaultModel.hh"
+#include "enums/SwitchAllocatorPolicy.hh"
 #include "mem/ruby/network/garnet/CommonTypes.hh"
+#include "mem/ruby/network/garnet/FlitPool.hh"
+#include "params/CreditLink.hh"
+#include "params/GarnetIntLink.hh"
 #include "params/GarnetNetwork.hh"
+#include "params/NetworkLink.hh"
+#include "sim/eventq.hh"
 
 namespace gem5
 {
@@ -66,6 +76,7 @@ class GarnetNetwork : public Network
     ~GarnetNetwork() = default;
 
     void init();
+    void startup();
 
     const char *garnetVersion = "3.0";
 
@@ -78,11 +89,30 @@ class GarnetNetwork : public Network
     /// for FatTree
     int getNumPods() const { return m_num_pods; }
 
+    /// for folded-Clos trees
+    const std::vector<uint32_t> &
+    getTreeChildren() const
+    {
+        return m_tree_children;
+    }
+    const std::vector<uint32_t> &
+    getTreeParents() const
+    {
+        return m_tree_parents;
+    }
+
     // for network
     uint32_t getNiFlitSize() const { return m_ni_flit_size; }
     uint32_t getBuffersPerDataVC() { return m_buffers_per_data_vc; }
     uint32_t getBuffersPerCtrlVC() { return m_buffers_per_ctrl_vc; }
     int getRoutingAlgorithm() const { return m_routing_algorithm; }
+    bool isActivityTracking() const { return m_activity_tracking; }
+    enums::SwitchAllocatorPolicy
+    getSwitchAllocPolicy() const
+    {
+        return m_sa_policy;
+    }
+    int getIslipIterations() const { return m_islip_iterations; }
 
     bool isFaultModelEnabled() const { return m_enable_fault_model; }
     FaultModel* fault_model;
@@ -160,10 +190,15 @@ class GarnetNetwork : public Network
     void update_traffic_distribution(RouteInfo route);
     int getNextPacketID() { return m_next_packet_id++; }
 
-    /// Lab4: An api for accessing router using id
-    void add_router_congestion_value(int id) { m_router_congestion_values[id]++; }
-    void sub_router_congestion_value(int id) { m_router_congestion_values[id]--; }
-    int get_router_congestion_value(int id) { return m_router_congestion_values[id]; }
+    // Measurement window: only packets created in
+    // [m_measure_start, m_measure_end) are counted in the stats
+    bool
+    isMeasuredPacket(Tick created) const
+    {
+        return created >= m_measure_start && created < m_measure_end;
+    }
+    void measuredPacketInjected() { m_measured_in_flight++; }
+    void measuredPacketReceived();
 
   protected:
     // Configuration
@@ -171,12 +206,17 @@ class GarnetNetwork : public Network
     int m_num_cols;
     /// Lab4: FatTree
     int m_num_pods;
+    std::vector<uint32_t> m_tree_children;
+    std::vector<uint32_t> m_tree_parents;
     uint32_t m_ni_flit_size;
     uint32_t m_max_vcs_per_vnet;
     uint32_t m_buffers_per_ctrl_vc;
     uint32_t m_buffers_per_data_vc;
     int m_routing_algorithm;
     bool m_enable_fault_model;
+    bool m_activity_tracking;
+    enums::SwitchAllocatorPolicy m_sa_policy;
+    int m_islip_iterations;
 
     // Statistical variables
     statistics::Vector m_packets_received;
@@ -210,6 +250,10 @@ class GarnetNetwork : public Network
     statistics::Scalar  m_total_hops;
     statistics::Formula m_avg_hops;
 
+    statistics::Scalar m_flit_pool_hits;
+    statistics::Scalar m_flit_pool_misses;
+    statistics::Formula m_flit_pool_hit_rate;
+
     /// Lab1-2
     // statistics::Scalar m_reception_rate;
 
@@ -222,12 +266,68 @@ class GarnetNetwork : public Network
 
     std::vector<VNET_type > m_vnet_type;
     std::vector<Router *> m_routers;   // All Routers in Network
-    std::vector<uint32_t> m_router_congestion_values; /// Lab4: All Router congestion values
     std::vector<NetworkLink *> m_networklinks; // All flit links in the network
+    // (src, dst) router of each flit link, -1 for a network interface
+    std::vector<std::pair<int, int>> m_networklink_ends;
     std::vector<NetworkBridge *> m_networkbridges; // All network bridges
     std::vector<CreditLink *> m_creditlinks; // All credit links in the network
     std::vector<NetworkInterface *> m_nis;   // All NI's in Network
     int m_next_packet_id; // static vairable for packet id allocation
+
+    // Links of the int_link_table parameters. The SimObjects keep a
+    // reference to their params, so these are owned by the network.
+    void makeIntLinkTable(const Params &p);
+    std::deque<NetworkLinkParams> m_table_network_link_params;
+    std::deque<CreditLinkParams> m_table_credit_link_params;
+    std::deque<GarnetIntLinkParams> m_table_int_link_params;
+
+    // FlitPool counters at the last stats reset
+    FlitPool::Counters m_flit_pool_base;
+
+    // End of the measurement window; the simulation ends once all
+    // measured packets have drained from the network
+    void endMeasurement();
+    void checkMeasurementDrained();
+
+    Cycles m_warmup_cycles;
+    Cycles m_measure_cycles;
+    Tick m_measure_start;
+    Tick m_measure_end;
+    bool m_measure_ended;
+    uint64_t m_measured_in_flight;
+    EventFunctionWrapper m_measure_end_event;
+    EventFunctionWrapper m_measure_drain_event;
+
+    // Steady-state convergence monitor: samples latency and throughput
+    // every m_convergence_window cycles and ends the simulation once the
+    // batch means have converged or the network is saturated.
+    void checkConvergence();
+
+    Cycles m_convergence_window;
+    double m_convergence_tolerance;
+    uint32_t m_convergence_min_windows;
+    double m_saturation_growth;
+    EventFunctionWrapper m_convergence_event;
+
+    double m_last_received_packets;
+    double m_last_packet_latency;
+    std::vector<double> m_window_latency;    // batch means, in cycles
+    std::vector<double> m_window_throughput; // packets/node/cycle
+    int m_windows_elapsed;
+
+    // Periodic sampler: every m_sample_interval cycles the flits buffered
+    // per router, flits sent per link and switch allocation stall cycles
+    // per VC go to m_sample_file_name (format in openSampleFile()).
+    void openSampleFile();
+    void takeSample();
+
+    Cycles m_sample_interval;
+    std::string m_sample_file_name;
+    OutputStream *m_sample_stream;
+    std::vector<uint32_t> m_sample_record;
+    std::vector<unsigned int> m_sample_last_link;
+    std::vector<uint64_t> m_sample_last_stall;
+    EventFunctionWrapper m_sample_event;
 };
 
 inline std::ostream&
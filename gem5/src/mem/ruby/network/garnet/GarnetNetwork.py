@@ -35,6 +35,13 @@ from m5.objects.BasicRouter import BasicRouter
 from m5.objects.ClockedObject import ClockedObject
 
 
+# round_robin is a separable allocator that loops over all ports, bitmask
+# makes the same allocation on request bitmasks and islip runs iterative
+# matching on request bitmasks
+class SwitchAllocatorPolicy(Enum):
+    vals = ["round_robin", "bitmask", "islip"]
+
+
 class GarnetNetwork(RubyNetwork):
     type = "GarnetNetwork"
     cxx_header = "mem/ruby/network/garnet/GarnetNetwork.hh"
@@ -43,6 +50,29 @@ class GarnetNetwork(RubyNetwork):
     num_rows = Param.Int(0, "number of rows if 2D (mesh/torus/..) topology")
     num_pods = Param.Int(0, "number of pods if Fat-Tree topology")
     # ring_length = Param.Int(0, "length of the ring if ring topology")
+    tree_children = VectorParam.UInt32(
+        [],
+        "folded-Clos topology: children per switch of each level, from the "
+        "hosts per edge switch up (see configs/topologies/FoldedClos.py)",
+    )
+    tree_parents = VectorParam.UInt32(
+        [],
+        "folded-Clos topology: parents per switch of each level below the "
+        "top, from the edge switches up",
+    )
+    # Internal links given as columns of a table rather than GarnetIntLink
+    # objects, see set_int_link_table()
+    int_link_table_src = VectorParam.UInt32([], "link table: src router id")
+    int_link_table_dst = VectorParam.UInt32([], "link table: dst router id")
+    int_link_table_src_outport = VectorParam.String(
+        [], "link table: outport direction at the src router"
+    )
+    int_link_table_dst_inport = VectorParam.String(
+        [], "link table: inport direction at the dst router"
+    )
+    int_link_table_latency = VectorParam.Cycles([], "link table: latency")
+    int_link_table_weight = VectorParam.Int([], "link table: routing weight")
+    int_link_table_first_id = Param.Int(0, "link table: id of the first link")
     ni_flit_size = Param.UInt32(16, "network interface flit size in bytes")
     vcs_per_vnet = Param.UInt32(4, "virtual channels per virtual network")
     buffers_per_data_vc = Param.UInt32(4, "buffers per data virtual channel")
@@ -53,6 +83,75 @@ class GarnetNetwork(RubyNetwork):
     garnet_deadlock_threshold = Param.UInt32(
         50000, "network-level deadlock threshold"
     )
+    activity_tracking = Param.Bool(
+        False,
+        "routers only visit ports with pending flits or credits, and NIs "
+        "do not poll for a free VC or credits while they wait for one",
+    )
+    switch_allocator = Param.SwitchAllocatorPolicy(
+        "round_robin", "switch allocation policy of the routers"
+    )
+    islip_iterations = Param.UInt32(
+        1, "matching iterations per cycle of the islip switch allocator"
+    )
+    warmup_cycles = Param.Cycles(
+        0, "cycles before the network stats are reset and measuring starts"
+    )
+    measure_cycles = Param.Cycles(
+        0,
+        "cycles in which created packets are measured, the simulation ends "
+        "once they drained (0 measures until the end of the simulation)",
+    )
+    convergence_window = Param.Cycles(
+        0,
+        "cycles per steady-state sample window, the simulation ends early "
+        "once latency and throughput converged or the network saturated "
+        "(0 disables early termination)",
+    )
+    convergence_tolerance = Param.Float(
+        0.05,
+        "relative 95% confidence interval half-width of latency and "
+        "throughput at which the run counts as converged",
+    )
+    convergence_min_windows = Param.UInt32(
+        5, "sample windows needed before the run may end early"
+    )
+    saturation_latency_growth = Param.Float(
+        1.0,
+        "relative latency growth over the last convergence_min_windows "
+        "windows that marks the network as saturated",
+    )
+
+    sample_interval = Param.Cycles(
+        0,
+        "cycles between two samples of the flits buffered per router, flits "
+        "sent per link and switch allocation stall cycles per VC, written "
+        "to sample_file (0 disables sampling)",
+    )
+    sample_file = Param.String(
+        "garnet_samples.bin",
+        "sample file in the output directory (see util/garnet_samples.py)",
+    )
+
+    def set_int_link_table(self, links, first_link_id=0):
+        """Describe the internal links as a table instead of as a list of
+        GarnetIntLinks.
+
+        links holds one (src router id, dst router id, src outport, dst
+        inport, latency, weight) row per uni-directional link. The network
+        builds the same links as the equivalent GarnetIntLinks in C++, so
+        no SimObjects have to be created, named and instantiated per link.
+        Table links support all vnets and have no CDC or SerDes bridges.
+        Link i gets the id first_link_id + i.
+        """
+        columns = list(zip(*links)) if links else [[]] * 6
+        self.int_link_table_src = list(columns[0])
+        self.int_link_table_dst = list(columns[1])
+        self.int_link_table_src_outport = list(columns[2])
+        self.int_link_table_dst_inport = list(columns[3])
+        self.int_link_table_latency = list(columns[4])
+        self.int_link_table_weight = list(columns[5])
+        self.int_link_table_first_id = first_link_id
 
 
 class GarnetNetworkInterface(ClockedObject):
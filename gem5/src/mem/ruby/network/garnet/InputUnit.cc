@@ -46,7 +46,7 @@ namespace garnet
 
 InputUnit::InputUnit(int id, PortDirection direction, Router *router)
   : Consumer(router), m_router(router), m_id(id), m_direction(direction),
-    m_vc_per_vnet(m_router->get_vc_per_vnet())
+    m_vc_per_vnet(m_router->get_vc_per_vnet()), m_num_buffered_flits(0)
 {
     const int m_num_vcs = m_router->get_num_vcs();
     m_num_buffer_reads.resize(m_num_vcs/m_vc_per_vnet);
@@ -56,10 +56,16 @@ InputUnit::InputUnit(int id, PortDirection direction, Router *router)
         m_num_buffer_writes[i] = 0;
     }
 
-    // Instantiating the virtual channels
+    // Instantiating the virtual channels. Credit-based flow control
+    // bounds their occupancy by the buffers per VC of their vnet.
+    GarnetNetwork *net_ptr = m_router->get_net_ptr();
     virtualChannels.reserve(m_num_vcs);
     for (int i=0; i < m_num_vcs; i++) {
-        virtualChannels.emplace_back();
+        int vnet = i / m_vc_per_vnet;
+        if (net_ptr->get_vnet_type(vnet) == DATA_VNET_)
+            virtualChannels.emplace_back(net_ptr->getBuffersPerDataVC());
+        else
+            virtualChannels.emplace_back(net_ptr->getBuffersPerCtrlVC());
     }
 }
 
@@ -109,6 +115,8 @@ InputUnit::wakeup()
 
         // Buffer the flit
         virtualChannels[vc].insertFlit(t_flit);
+        if (m_num_buffered_flits++ == 0)
+            m_router->getBufferedInports().set(m_id);
 
         int vnet = vc/m_vc_per_vnet;
         // number of writes same as reads
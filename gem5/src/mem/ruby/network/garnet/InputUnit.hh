@@ -61,7 +61,7 @@ class InputUnit : public Consumer
     void wakeup();
     void print(std::ostream& out) const {};
 
-    inline PortDirection get_direction() { return m_direction; }
+    inline const PortDirection &get_direction() { return m_direction; }
 
     inline void
     set_vc_idle(int vc, Tick curTime)
@@ -116,6 +116,8 @@ class InputUnit : public Consumer
     inline flit*
     getTopFlit(int vc)
     {
+        if (--m_num_buffered_flits == 0)
+            m_router->getBufferedInports().clear(m_id);
         return virtualChannels[vc].getTopFlit();
     }
 
@@ -125,6 +127,20 @@ class InputUnit : public Consumer
         return virtualChannels[vc].need_stage(stage, time);
     }
 
+    inline void
+    add_stall_cycles(int invc, Cycles cycles)
+    {
+        virtualChannels[invc].add_stall_cycles(cycles);
+    }
+
+    inline uint64_t
+    get_stall_cycles(int invc) const
+    {
+        return virtualChannels[invc].get_stall_cycles();
+    }
+
+    int get_num_buffered_flits() const { return m_num_buffered_flits; }
+
     inline bool
     isReady(int invc, Tick curTime)
     {
@@ -141,6 +157,12 @@ class InputUnit : public Consumer
 
     inline int get_inlink_id() { return m_in_link->get_id(); }
 
+    inline bool
+    has_incoming_flits()
+    {
+        return !m_in_link->getBuffer()->isEmpty();
+    }
+
     inline void
     set_credit_link(CreditLink *credit_link)
     {
@@ -165,6 +187,7 @@ class InputUnit : public Consumer
     NetworkLink *m_in_link;
     CreditLink *m_credit_link;
     flitBuffer creditQueue;
+    int m_num_buffered_flits; // over all VCs
 
     // Input Virtual channels
     std::vector<VirtualChannel> virtualChannels;
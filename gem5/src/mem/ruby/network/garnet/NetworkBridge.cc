@@ -111,8 +111,12 @@ NetworkBridge::scheduleFlit(flit *t_flit, Cycles latency)
     sendTime = std::max(nextAvailTick, sendTime);
     t_flit->set_time(sendTime);
     lastScheduledAt = sendTime;
-    linkBuffer.insert(t_flit);
-    link_consumer->scheduleEventAbsolute(sendTime);
+    if (m_consumer_queue) {
+        sendAcross(t_flit);
+    } else {
+        linkBuffer.insert(t_flit);
+        notifyConsumer(sendTime);
+    }
 }
 
 void
@@ -153,6 +153,11 @@ NetworkInterface::dequeueCallback()
 void
 NetworkInterface::incrementStats(flit *t_flit)
 {
+    // Only packets created inside the measurement window are counted
+    Tick created = t_flit->get_enqueue_time() - t_flit->get_src_delay();
+    if (!m_net_ptr->isMeasuredPacket(created))
+        return;
+
     int vnet = t_flit->get_vnet();
 
     // Latency
@@ -171,6 +176,7 @@ NetworkInterface::incrementStats(flit *t_flit)
         m_net_ptr->increment_received_packets(vnet);
         m_net_ptr->increment_packet_network_latency(network_delay, vnet);
         m_net_ptr->increment_packet_queueing_latency(queueing_delay, vnet);
+        m_net_ptr->measuredPacketReceived();
     }
 
     // Hops
@@ -434,11 +440,16 @@ NetworkInterface::flitisizeMessage(MsgPtr msg_ptr, int vnet)
         // so that the first router increments it to 0
         route.hops_traversed = -1;
 
-        m_net_ptr->increment_injected_packets(vnet);
+        bool measured = m_net_ptr->isMeasuredPacket(msg_ptr->getTime());
+        if (measured) {
+            m_net_ptr->increment_injected_packets(vnet);
+            m_net_ptr->measuredPacketInjected();
+        }
         m_net_ptr->update_traffic_distribution(route);
         int packet_id = m_net_ptr->getNextPacketID();
         for (int i = 0; i < num_flits; i++) {
-            m_net_ptr->increment_injected_flits(vnet);
+            if (measured)
+                m_net_ptr->increment_injected_flits(vnet);
             flit *fl = new flit(packet_id,
                 i, vc, vnet, route, num_flits, new_msg_ptr,
                 m_net_ptr->MessageSizeType_to_int(
@@ -455,6 +466,18 @@ NetworkInterface::flitisizeMessage(MsgPtr msg_ptr, int vnet)
     return true ;
 }
 
+bool
+NetworkInterface::hasQueuedMessageBefore(Tick time) const
+{
+    for (auto *b : inNode_ptr) {
+        if (b != nullptr && !b->isEmpty() &&
+            b->peekMsgPtr()->getTime() < time) {
+            return true;
+        }
+    }
+    return false;
+}
+
 // Looking for a free output vc
 int
 NetworkInterface::calculateVC(int vnet)
@@ -480,6 +503,16 @@ NetworkInterface::calculateVC(int vnet)
     return -1;
 }
 
+bool
+NetworkInterface::hasIdleVC(int vnet, Tick time)
+{
+    for (int i = 0; i < m_vc_per_vnet; i++) {
+        if (outVcState[(vnet*m_vc_per_vnet) + i].isInState(IDLE_, time))
+            return true;
+    }
+    return false;
+}
+
 void
 NetworkInterface::scheduleOutputPort(OutputPort *oPort)
 {
@@ -621,22 +654,35 @@ NetworkInterface::get_vnet(int vc)
 // output VC buffer.
 // Also check if we have to reschedule because of a clock period
 // difference.
+// With activity tracking, messages waiting for a free VC and flits
+// waiting for credits do not keep the NI polling: the credit that
+// unblocks them arrives over a credit link, which wakes the NI.
 void
 NetworkInterface::checkReschedule()
 {
-    for (const auto& it : inNode_ptr) {
-        if (it == nullptr) {
+    bool activity_tracking = m_net_ptr->isActivityTracking();
+
+    for (int vnet = 0; vnet < inNode_ptr.size(); ++vnet) {
+        MessageBuffer *b = inNode_ptr[vnet];
+        if (b == nullptr) {
+            continue;
+        }
+        if (activity_tracking && !hasIdleVC(vnet, clockEdge(Cycles(1)))) {
             continue;
         }
 
-        while (it->isReady(clockEdge())) { // Is there a message waiting
+        if (b->isReady(clockEdge())) { // Is there a message waiting
             scheduleEvent(Cycles(1));
             return;
         }
     }
 
-    for (auto& ni_out_vc : niOutVcs) {
-        if (ni_out_vc.isReady(clockEdge(Cycles(1)))) {
+    for (int vc = 0; vc < niOutVcs.size(); vc++) {
+        if (activity_tracking && !outVcState[vc].has_credit()) {
+            continue;
+        }
+
+        if (niOutVcs[vc].isReady(clockEdge(Cycles(1)))) {
             scheduleEvent(Cycles(1));
             return;
         }
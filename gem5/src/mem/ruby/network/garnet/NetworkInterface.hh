@@ -84,6 +84,10 @@ class NetworkInterface : public ClockedObject, public Consumer
 
     void scheduleFlit(flit *t_flit);
 
+    // Whether a message created before the given time still waits in one
+    // of the protocol buffers of this NI
+    bool hasQueuedMessageBefore(Tick time) const;
+
     int get_router_id(int vnet)
     {
         OutputPort *oPort = getOutportForVnet(vnet);
@@ -296,6 +300,7 @@ class NetworkInterface : public ClockedObject, public Consumer
     void checkStallQueue();
     bool flitisizeMessage(MsgPtr msg_ptr, int vnet);
     int calculateVC(int vnet);
+    bool hasIdleVC(int vnet, Tick time);
 
 
     void scheduleOutputPort(OutputPort *oPort);
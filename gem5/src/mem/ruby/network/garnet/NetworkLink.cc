@@ -49,8 +49,16 @@ NetworkLink::NetworkLink(const Params &p)
     : ClockedObject(p), Consumer(this), m_id(p.link_id),
       m_type(NUM_LINK_TYPES_),
       m_latency(p.link_latency), m_link_utilized(0),
+      m_arrival_events{
+          {[this]{ deliverArrivals(); }, name() + ".arrival", false,
+           Event::Delayed_Writeback_Pri},
+          {[this]{ deliverArrivals(); }, name() + ".arrival", false,
+           Event::Delayed_Writeback_Pri}},
+      m_next_arrival_event(0), m_arrival_scheduled(false),
       m_virt_nets(p.virt_nets), linkBuffer(),
-      link_consumer(nullptr), link_srcQueue(nullptr)
+      link_consumer(nullptr), m_consumer_mask(nullptr),
+      m_consumer_port(-1), m_consumer_queue(nullptr),
+      link_srcQueue(nullptr)
 {
     int num_vnets = (p.supported_vnets).size();
     mVnets.resize(num_vnets);
@@ -64,6 +72,31 @@ void
 NetworkLink::setLinkConsumer(Consumer *consumer)
 {
     link_consumer = consumer;
+
+    // A link runs on the event queue of its source. If its consumer was
+    // put on another one, the flits cross over at their arrival, which
+    // has to be at least one quantum away so that the consumer's queue
+    // cannot be past it yet.
+    EventQueue *queue = consumer->getObject()->eventQueue();
+    m_consumer_queue = (queue != eventQueue()) ? queue : nullptr;
+    fatal_if(m_consumer_queue && cyclesToTicks(m_latency) < simQuantum,
+             "%s: links between event queues need a latency of at least "
+             "the simulation quantum (%d ticks)\n", name(), simQuantum);
+}
+
+void
+NetworkLink::setConsumerPort(PortMask *mask, int port)
+{
+    m_consumer_mask = mask;
+    m_consumer_port = port;
+}
+
+void
+NetworkLink::notifyConsumer(Tick when)
+{
+    if (m_consumer_mask)
+        m_consumer_mask->set(m_consumer_port);
+    link_consumer->scheduleEventAbsolute(when);
 }
 
 void
@@ -98,8 +131,12 @@ NetworkLink::wakeup()
                 (mVnets.size() == 0));
         }
         t_flit->set_time(clockEdge(m_latency));
-        linkBuffer.insert(t_flit);
-        link_consumer->scheduleEventAbsolute(clockEdge(m_latency));
+        if (m_consumer_queue) {
+            sendAcross(t_flit);
+        } else {
+            linkBuffer.insert(t_flit);
+            notifyConsumer(clockEdge(m_latency));
+        }
         m_link_utilized++;
         m_vc_load[t_flit->get_vc()]++;
     }
@@ -109,6 +146,46 @@ NetworkLink::wakeup()
     }
 }
 
+void
+NetworkLink::sendAcross(flit *t_flit)
+{
+    // linkBuffer belongs to the consumer's thread, so the flit is put
+    // into it by an event on the consumer's queue. It runs before the
+    // consumer's wakeup at the same tick, like the local path that
+    // buffers the flit ahead of time.
+    std::lock_guard<std::mutex> guard(m_arrivals_lock);
+    assert(m_arrivals.empty() ||
+           m_arrivals.back()->get_time() <= t_flit->get_time());
+    m_arrivals.push_back(t_flit);
+    if (!m_arrival_scheduled)
+        scheduleArrival(t_flit->get_time(), true);
+}
+
+void
+NetworkLink::scheduleArrival(Tick when, bool global)
+{
+    m_consumer_queue->schedule(&m_arrival_events[m_next_arrival_event],
+                               when, global);
+    m_next_arrival_event = 1 - m_next_arrival_event;
+    m_arrival_scheduled = true;
+}
+
+void
+NetworkLink::deliverArrivals()
+{
+    std::lock_guard<std::mutex> guard(m_arrivals_lock);
+    while (!m_arrivals.empty() &&
+           m_arrivals.front()->get_time() <= curTick()) {
+        linkBuffer.insert(m_arrivals.front());
+        m_arrivals.pop_front();
+        notifyConsumer(curTick());
+    }
+
+    m_arrival_scheduled = false;
+    if (!m_arrivals.empty())
+        scheduleArrival(m_arrivals.front()->get_time(), false);
+}
+
 void
 NetworkLink::resetStats()
 {
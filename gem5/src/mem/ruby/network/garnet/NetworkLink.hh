@@ -33,7 +33,9 @@
 #ifndef __MEM_RUBY_NETWORK_GARNET_0_NETWORKLINK_HH__
 #define __MEM_RUBY_NETWORK_GARNET_0_NETWORKLINK_HH__
 
+#include <deque>
 #include <iostream>
+#include <mutex>
 #include <vector>
 
 #include "mem/ruby/common/Consumer.hh"
@@ -41,6 +43,7 @@
 #include "mem/ruby/network/garnet/flitBuffer.hh"
 #include "params/NetworkLink.hh"
 #include "sim/clocked_object.hh"
+#include "sim/eventq.hh"
 
 namespace gem5
 {
@@ -61,6 +64,9 @@ class NetworkLink : public ClockedObject, public Consumer
     ~NetworkLink() = default;
 
     void setLinkConsumer(Consumer *consumer);
+    // Port of the consumer router fed by this link, marked in mask
+    // whenever a flit/credit is put on the link
+    void setConsumerPort(PortMask *mask, int port);
     void setSourceQueue(flitBuffer *src_queue, ClockedObject *srcClockObject);
     virtual void setVcsPerVnet(uint32_t consumerVcs);
     void setType(link_type type) { m_type = type; }
@@ -99,10 +105,33 @@ class NetworkLink : public ClockedObject, public Consumer
     unsigned int m_link_utilized;
     std::vector<unsigned int> m_vc_load;
 
+    // Flits on their way to a consumer on another event queue, in the
+    // order of their arrival. The source's thread appends to it and the
+    // consumer's thread takes them off, hence the lock.
+    std::deque<flit *> m_arrivals;
+    std::mutex m_arrivals_lock;
+    // The arrivals are delivered by two events in turn, so that the
+    // source never schedules the event the consumer may still be
+    // finishing. Only one of them is scheduled at a time.
+    EventFunctionWrapper m_arrival_events[2];
+    int m_next_arrival_event;
+    bool m_arrival_scheduled;
+
+    void scheduleArrival(Tick when, bool global);
+    void deliverArrivals();
+
   protected:
+    void notifyConsumer(Tick when);
+    // Hands a flit over to a consumer on another event queue at the
+    // time set in the flit
+    void sendAcross(flit *t_flit);
+
     uint32_t m_virt_nets;
     flitBuffer linkBuffer;
     Consumer *link_consumer;
+    PortMask *m_consumer_mask;
+    int m_consumer_port;
+    EventQueue *m_consumer_queue; // set if the consumer is on another one
     flitBuffer *link_srcQueue;
 
 };
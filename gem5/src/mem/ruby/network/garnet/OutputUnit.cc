@@ -49,7 +49,7 @@ namespace garnet
 OutputUnit::OutputUnit(int id, PortDirection direction, Router *router,
   uint32_t consumerVcs)
   : Consumer(router), m_router(router), m_id(id), m_direction(direction),
-    m_vc_per_vnet(consumerVcs)
+    m_vc_per_vnet(consumerVcs), m_used_credits(0)
 {
     const int m_num_vcs = consumerVcs * m_router->get_num_vnets();
     outVcState.reserve(m_num_vcs);
@@ -68,6 +68,7 @@ OutputUnit::decrement_credit(int out_vc)
             out_vc, m_router->curCycle(), m_credit_link->name());
 
     outVcState[out_vc].decrement_credit();
+    m_used_credits++;
 }
 
 void
@@ -80,6 +81,7 @@ OutputUnit::increment_credit(int out_vc)
             out_vc, m_router->curCycle(), m_credit_link->name());
 
     outVcState[out_vc].increment_credit();
+    m_used_credits--;
 }
 
 // Check if the output VC (i.e., input VC at next router)
@@ -147,6 +149,12 @@ OutputUnit::wakeup()
     }
 }
 
+bool
+OutputUnit::has_incoming_credits()
+{
+    return !m_credit_link->getBuffer()->isEmpty();
+}
+
 flitBuffer*
 OutputUnit::getOutQueue()
 {
@@ -63,6 +63,7 @@ class OutputUnit : public Consumer
     void set_credit_link(CreditLink *credit_link);
     void wakeup();
     flitBuffer* getOutQueue();
+    bool has_incoming_credits();
     void print(std::ostream& out) const {};
     void decrement_credit(int out_vc);
     void increment_credit(int out_vc);
@@ -78,6 +79,10 @@ class OutputUnit : public Consumer
         return outVcState[vc].get_credit_count();
     }
 
+    // Number of downstream buffer slots occupied by flits sent through
+    // this port, i.e. the credits in use over all output VCs
+    int get_congestion() const { return m_used_credits; }
+
     inline int
     get_outlink_id()
     {
@@ -112,6 +117,7 @@ class OutputUnit : public Consumer
     GEM5_CLASS_VAR_USED int m_id;
     PortDirection m_direction;
     int m_vc_per_vnet;
+    int m_used_credits;
     NetworkLink *m_out_link;
     CreditLink *m_credit_link;
 
@@ -52,26 +52,26 @@ Router::Router(const Params &p)
   : BasicRouter(p), Consumer(this), m_latency(p.latency),
     m_virtual_networks(p.virt_nets), m_vc_per_vnet(p.vcs_per_vnet),
     m_num_vcs(m_virtual_networks * m_vc_per_vnet), m_bit_width(p.width),
-    m_network_ptr(nullptr), routingUnit(this), switchAllocator(this),
-    crossbarSwitch(this)
+    m_network_ptr(nullptr), m_random(p.router_id),
+    m_activity_tracking(false), routingUnit(this),
+    switchAllocator(this), crossbarSwitch(this)
 {
     m_input_unit.clear();
     m_output_unit.clear();
 }
 
-/// Lab4: Congestion value
-// void Router::init_congestion_value() {m_congestion_value = 0;}
-// void Router::add_congestion_value() {m_congestion_value++;}
-// void Router::sub_congestion_value() {m_congestion_value--;}
-// int Router::get_congestion_value() {return m_congestion_value;}
-
 void
 Router::init()
 {
     BasicRouter::init();
-    // init_congestion_value();
     switchAllocator.init();
     crossbarSwitch.init();
+
+    m_activity_tracking = m_network_ptr->isActivityTracking();
+    m_active_inports.resize(m_input_unit.size());
+    m_active_outports.resize(m_output_unit.size());
+    m_buffered_inports.resize(m_input_unit.size());
+    m_switch_inports.resize(m_input_unit.size());
 }
 
 void
@@ -80,6 +80,11 @@ Router::wakeup()
     DPRINTF(RubyNetwork, "Router %d woke up\n", m_id);
     assert(clockEdge() == curTick());
 
+    if (m_activity_tracking) {
+        wakeupActivePorts();
+        return;
+    }
+
     // check for incoming flits
     for (int inport = 0; inport < m_input_unit.size(); inport++) {
         m_input_unit[inport]->wakeup();
@@ -102,6 +107,27 @@ Router::wakeup()
     crossbarSwitch.wakeup();
 }
 
+// Same as wakeup(), but only visits the ports with incoming flits or
+// credits. A port stays active until its link has been drained.
+void
+Router::wakeupActivePorts()
+{
+    m_active_inports.forEach([this](int inport) {
+        m_input_unit[inport]->wakeup();
+        if (!m_input_unit[inport]->has_incoming_flits())
+            m_active_inports.clear(inport);
+    });
+
+    m_active_outports.forEach([this](int outport) {
+        m_output_unit[outport]->wakeup();
+        if (!m_output_unit[outport]->has_incoming_credits())
+            m_active_outports.clear(outport);
+    });
+
+    switchAllocator.wakeup();
+    crossbarSwitch.wakeup();
+}
+
 void
 Router::addInPort(PortDirection inport_dirn,
                   NetworkLink *in_link, CreditLink *credit_link)
@@ -116,6 +142,7 @@ Router::addInPort(PortDirection inport_dirn,
     input_unit->set_in_link(in_link);
     input_unit->set_credit_link(credit_link);
     in_link->setLinkConsumer(this);
+    in_link->setConsumerPort(&m_active_inports, port_num);
     in_link->setVcsPerVnet(get_vc_per_vnet());
     credit_link->setSourceQueue(input_unit->getCreditQueue(), this);
     credit_link->setVcsPerVnet(get_vc_per_vnet());
@@ -141,6 +168,7 @@ Router::addOutPort(PortDirection outport_dirn,
     output_unit->set_out_link(out_link);
     output_unit->set_credit_link(credit_link);
     credit_link->setLinkConsumer(this);
+    credit_link->setConsumerPort(&m_active_outports, port_num);
     credit_link->setVcsPerVnet(consumerVcs);
     out_link->setSourceQueue(output_unit->getOutQueue(), this);
     out_link->setVcsPerVnet(consumerVcs);
@@ -158,6 +186,19 @@ Router::getOutportDirection(int outport)
     return m_output_unit[outport]->get_direction();
 }
 
+/*
+ * The congestion of an output port is the occupancy of the input buffers
+ * it feeds at the downstream router, tracked through the credits in use.
+ * It rises when a flit wins the switch and falls as soon as the
+ * downstream router frees the slot, so it follows the actual flit
+ * movement without any extra bookkeeping.
+ */
+int
+Router::get_outport_congestion(int outport)
+{
+    return m_output_unit[outport]->get_congestion();
+}
+
 PortDirection
 Router::getInportDirection(int inport)
 {
@@ -165,7 +206,8 @@ Router::getInportDirection(int inport)
 }
 
 int
-Router::route_compute(RouteInfo route, int inport, PortDirection inport_dirn)
+Router::route_compute(const RouteInfo &route, int inport,
+                      const PortDirection &inport_dirn)
 {
     return routingUnit.outportCompute(route, inport, inport_dirn);
 }
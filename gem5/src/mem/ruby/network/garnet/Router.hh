@@ -36,6 +36,7 @@
 #include <memory>
 #include <vector>
 
+#include "base/random.hh"
 #include "mem/ruby/common/Consumer.hh"
 #include "mem/ruby/common/NetDest.hh"
 #include "mem/ruby/network/BasicRouter.hh"
@@ -116,8 +117,22 @@ class Router : public BasicRouter, public Consumer
     PortDirection getOutportDirection(int outport);
     PortDirection getInportDirection(int inport);
 
-    int route_compute(RouteInfo route, int inport, PortDirection direction);
+    int route_compute(const RouteInfo &route, int inport,
+                      const PortDirection &direction);
     void grant_switch(int inport, flit *t_flit);
+    // Activity tracking (GarnetNetwork.activity_tracking): inports with
+    // flits in their VCs and in the crossbar, used by the
+    // SwitchAllocator and CrossbarSwitch to skip empty inports
+    bool isActivityTracking() const { return m_activity_tracking; }
+    PortMask &getBufferedInports() { return m_buffered_inports; }
+    PortMask &getSwitchInports() { return m_switch_inports; }
+
+    void
+    init_fattree_routes(int num_pods)
+    {
+        routingUnit.initFatTreeRoutes(num_pods);
+    }
+    void init_tree_routes() { routingUnit.initTreeRoutes(); }
     void schedule_wakeup(Cycles time);
 
     std::string getPortDirectionName(PortDirection direction);
@@ -128,11 +143,13 @@ class Router : public BasicRouter, public Consumer
     void collateStats();
     void resetStats();
 
-    /// Lab4: Congestion value
-    // void init_congestion_value();
-    // void add_congestion_value();
-    // void sub_congestion_value();
-    // int get_congestion_value();
+    // Congestion seen through an output port, used by adaptive routing
+    int get_outport_congestion(int outport);
+
+    // Random choices of the routing unit. Each router has its own
+    // generator, seeded from its id, so that the routes do not depend on
+    // which event queue (thread) the routers run on.
+    Random &getRandom() { return m_random; }
 
     // For Fault Model:
     bool get_fault_vector(int temperature, float fault_vector[]) {
@@ -149,14 +166,22 @@ class Router : public BasicRouter, public Consumer
     uint32_t functionalWrite(Packet *);
 
   private:
+    void wakeupActivePorts();
+
     Cycles m_latency;
     uint32_t m_virtual_networks, m_vc_per_vnet, m_num_vcs;
     uint32_t m_bit_width;
-    
-    /// Lab4: Congestion value
-    // uint32_t m_congestion_value;
 
     GarnetNetwork *m_network_ptr;
+    Random m_random;
+
+    // Ports whose input link holds flits or whose credit link holds
+    // credits; set by the links (see NetworkLink::setConsumerPort())
+    bool m_activity_tracking;
+    PortMask m_active_inports;
+    PortMask m_active_outports;
+    PortMask m_buffered_inports;
+    PortMask m_switch_inports;
 
     RoutingUnit routingUnit;
     SwitchAllocator switchAllocator;
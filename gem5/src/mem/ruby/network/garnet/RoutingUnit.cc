@@ -30,6 +30,10 @@
 
 #include "mem/ruby/network/garnet/RoutingUnit.hh"
 
+#include <algorithm>
+#include <cctype>
+#include <climits>
+
 #include "base/cast.hh"
 #include "base/compiler.hh"
 #include "debug/RubyNetwork.hh"
@@ -46,6 +50,43 @@ namespace ruby
 namespace garnet
 {
 
+namespace
+{
+
+// Position encoded in a direction name like "Agg3", or -1 if the
+// direction does not start with prefix followed by a number
+int
+directionIndex(const PortDirection &dirn, const std::string &prefix)
+{
+    if (dirn.size() <= prefix.size() ||
+        dirn.compare(0, prefix.size(), prefix) != 0) {
+        return -1;
+    }
+    int pos = 0;
+    for (size_t i = prefix.size(); i < dirn.size(); i++) {
+        if (!isdigit(dirn[i]))
+            return -1;
+        pos = pos * 10 + (dirn[i] - '0');
+    }
+    return pos;
+}
+
+// Record outport_idx at the position of dirn in outports, if dirn is
+// prefix followed by a number
+void
+indexDirection(const PortDirection &dirn, const std::string &prefix,
+               int outport_idx, std::vector<int> &outports)
+{
+    int pos = directionIndex(dirn, prefix);
+    if (pos >= 0) {
+        if ((int)outports.size() <= pos)
+            outports.resize(pos + 1, -1);
+        outports[pos] = outport_idx;
+    }
+}
+
+} // anonymous namespace
+
 RoutingUnit::RoutingUnit(Router *router)
 {
     m_router = router;
@@ -94,7 +135,7 @@ RoutingUnit::supportsVnet(int vnet, std::vector<int> sVnets)
  * Correct weight assignments are critical to provide deadlock avoidance.
  */
 int
-RoutingUnit::lookupRoutingTable(int vnet, NetDest msg_destination)
+RoutingUnit::lookupRoutingTable(int vnet, const NetDest &msg_destination)
 {
     // First find all possible output link candidates
     // For ordered vnet, just choose the first
@@ -138,7 +179,8 @@ RoutingUnit::lookupRoutingTable(int vnet, NetDest msg_destination)
     // Randomly select any candidate output link
     int candidate = 0;
     if (!(m_router->get_net_ptr())->isVNetOrdered(vnet))
-        candidate = rand() % num_candidates;
+        candidate = m_router->getRandom().random<int>(
+            0, num_candidates - 1);
 
     output_link = output_link_candidates.at(candidate);
     return output_link;
@@ -157,6 +199,19 @@ RoutingUnit::addOutDirection(PortDirection outport_dirn, int outport_idx)
 {
     m_outports_dirn2idx[outport_dirn] = outport_idx;
     m_outports_idx2dirn[outport_idx]  = outport_dirn;
+
+    // Index the FatTree and folded-Clos ports by type and position so
+    // that route compute does not have to build and look up direction
+    // names
+    static const std::pair<std::string, FatTreePortType> fattree_ports[] = {
+        {"Edge", FT_EDGE_}, {"Agg", FT_AGG_}, {"Core", FT_CORE_}
+    };
+    for (const auto &port : fattree_ports) {
+        indexDirection(outport_dirn, port.first, outport_idx,
+                       m_fattree_outports[port.second]);
+    }
+    indexDirection(outport_dirn, "Up", outport_idx, m_tree_up_outports);
+    indexDirection(outport_dirn, "Down", outport_idx, m_tree_down_outports);
 }
 
 // outportCompute() is called by the InputUnit
@@ -166,8 +221,8 @@ RoutingUnit::addOutDirection(PortDirection outport_dirn, int outport_idx)
 // table is provided here.
 
 int
-RoutingUnit::outportCompute(RouteInfo route, int inport,
-                            PortDirection inport_dirn)
+RoutingUnit::outportCompute(const RouteInfo &route, int inport,
+                            const PortDirection &inport_dirn)
 {
     int outport = -1;
 
@@ -198,6 +253,10 @@ RoutingUnit::outportCompute(RouteInfo route, int inport,
             outportComputeFatTree(route, inport, inport_dirn); break;
         case FATTREE_ADAPTIVE_: outport =
             outportComputeFatTreeAdaptive(route, inport, inport_dirn); break;
+        case TREE_: outport =
+            outportComputeTree(route, false); break;
+        case TREE_ADAPTIVE_: outport =
+            outportComputeTree(route, true); break;
 
         default: outport =
             lookupRoutingTable(route.vnet, route.net_dest); break;
@@ -211,9 +270,9 @@ RoutingUnit::outportCompute(RouteInfo route, int inport,
 // Only for reference purpose in a Mesh
 // By default Garnet uses the routing table
 int
-RoutingUnit::outportComputeXY(RouteInfo route,
+RoutingUnit::outportComputeXY(const RouteInfo &route,
                               int inport,
-                              PortDirection inport_dirn)
+                              const PortDirection &inport_dirn)
 {
     PortDirection outport_dirn = "Unknown";
 
@@ -269,185 +328,202 @@ RoutingUnit::outportComputeXY(RouteInfo route,
 // Template for implementing custom routing algorithm
 // using port directions. (Example adaptive)
 int
-RoutingUnit::outportComputeCustom(RouteInfo route,
+RoutingUnit::outportComputeCustom(const RouteInfo &route,
                                  int inport,
-                                 PortDirection inport_dirn)
+                                 const PortDirection &inport_dirn)
 {
     panic("%s placeholder executed", __FUNCTION__);
 }
 
 /// Base of lab4: FatTree Routing
+// Routes are precomputed per router by initFatTreeRoutes(), so route
+// compute is a single table lookup.
 int
-RoutingUnit::outportComputeFatTree(RouteInfo route,
+RoutingUnit::outportComputeFatTree(const RouteInfo &route,
                                    int inport,
-                                   PortDirection inport_dirn)
+                                   const PortDirection &inport_dirn)
 {
-    PortDirection outport_dirn = "Unknown";
-    int k = m_router->get_net_ptr()->getNumPods(); // tree degree, num_pods, k
+    assert(route.dest_router < (int)m_fattree_routes.size());
+    return m_fattree_routes[route.dest_router].outport;
+}
+
+
+/// lab4: FatTree Adaptive Routing
+// Same paths as outportComputeFatTree(), but the two upward hops take the
+// least congested of the k/2 equivalent ports.
+int
+RoutingUnit::outportComputeFatTreeAdaptive(const RouteInfo &route,
+                                           int inport,
+                                           const PortDirection &inport_dirn)
+{
+    assert(route.dest_router < (int)m_fattree_routes.size());
+    const FatTreeRoute &entry = m_fattree_routes[route.dest_router];
+    if (entry.up)
+        return chooseLeastCongested(m_fattree_up_outports);
+    return entry.outport;
+}
+
+// Build the FatTree routes of this router to every edge router
+// (the only possible destinations, see configs/topologies/FatTree.py).
+// Called once from GarnetNetwork::init() after the links are created.
+void
+RoutingUnit::initFatTreeRoutes(int num_pods)
+{
+    int k = num_pods; // tree degree, num_pods, k
     int half_k = k / 2;
     int num_edge_layer = half_k * k;
     int num_agg_layer = half_k * k;
-    int num_core_layer = half_k * half_k;
     int my_id = m_router->get_id();
+    int my_pos = my_id % half_k;
 
-    // This function calculates the next direction if we want to go from 
-    //   the current router to the desired route.dest_router, which must 
-    //   be an edge router. 
-    // Determine layer of current router
-
-    int my_layer;
+    m_fattree_routes.assign(num_edge_layer, FatTreeRoute());
+    m_fattree_up_outports.clear();
     if (my_id < num_edge_layer) {
-        my_layer = 0; // EDGE
+        m_fattree_up_outports = m_fattree_outports[FT_AGG_];
     } else if (my_id < num_edge_layer + num_agg_layer) {
-        my_layer = 1; // AGGREGATION
-    } else {
-        my_layer = 2; // CORE
+        m_fattree_up_outports = m_fattree_outports[FT_CORE_];
     }
 
-    // srand((int)time(0));
-    // std :: cout << "my_layer: " << my_layer << " dest_layer: " << dest_layer << std :: endl;
-    // std :: cout << "k: " << k << "num_edge_layer: " << num_edge_layer << std::endl;
-    // std :: cout << "my_id: " << my_id << "dest_id: " << dest_id << std :: endl; 
-    // assert(dest_id < num_edge_layer);
-    
-    if (my_layer == 0) { // EDGE
-        int my_pos = my_id % half_k;
-        /// Upwards to my aggregation router; Can become adaptive later
-        outport_dirn = "Agg" + std::to_string(my_pos);
-    } else if (my_layer == 1) { // AGGREGATION
-        int my_pod = (my_id - num_edge_layer) / half_k;
-        int my_pos = my_id % half_k;
-        int dest_id = route.dest_router;
-        if (dest_id / half_k == my_pod) {
-            // Destination is an edge router in the same pod
-            outport_dirn = "Edge" + std::to_string(dest_id % half_k);
-        } else {
-            // Upwards to my core router; Can become adaptive later
-            outport_dirn = "Core" + std::to_string(my_pos);
+    for (int dest_id = 0; dest_id < num_edge_layer; dest_id++) {
+        FatTreeRoute &entry = m_fattree_routes[dest_id];
+        if (dest_id == my_id) {
+            // Ejection is resolved by outportCompute() itself
+            continue;
         }
-    } else if (my_layer == 2) { // CORE
-        // Downwards to the correct aggregation router in the destination pod
-        int dest_id = route.dest_router;
-        int dest_pod = dest_id / half_k;
-        outport_dirn = "Agg" + std::to_string(dest_pod);
-    } else {
-        panic("Invalid router layer determined");
+        if (my_id < num_edge_layer) { // EDGE
+            /// Upwards to my aggregation router
+            entry = {fatTreeOutport(FT_AGG_, my_pos), true};
+        } else if (my_id < num_edge_layer + num_agg_layer) { // AGGREGATION
+            int my_pod = (my_id - num_edge_layer) / half_k;
+            if (dest_id / half_k == my_pod) {
+                // Destination is an edge router in the same pod
+                entry = {fatTreeOutport(FT_EDGE_, dest_id % half_k), false};
+            } else {
+                // Upwards to my core router
+                entry = {fatTreeOutport(FT_CORE_, my_pos), true};
+            }
+        } else { // CORE
+            // Downwards to the aggregation router in the destination pod
+            entry = {fatTreeOutport(FT_AGG_, dest_id / half_k), false};
+        }
+        DPRINTF(RubyNetwork, "FatTree route: router %d dest %d outport %s "
+                "up %d\n", my_id, dest_id,
+                m_outports_idx2dirn[entry.outport], entry.up);
     }
-
-    return m_outports_dirn2idx[outport_dirn];
 }
 
+int
+RoutingUnit::fatTreeOutport(FatTreePortType type, int pos) const
+{
+    assert(pos < (int)m_fattree_outports[type].size());
+    int outport = m_fattree_outports[type][pos];
+    assert(outport != -1);
+    return outport;
+}
 
-/// lab4: FatTree Adaptive Routing
-
+// Folded-Clos routing: up until the destination edge router lies in
+// the subtree of the current router, then down towards it. Nothing is
+// tabulated, so routers of very large trees take no per-destination
+// state. Deterministic routing spreads the destinations over the up
+// ports by their index, adaptive routing takes the least congested.
 int
-RoutingUnit::outportComputeFatTreeAdaptive(RouteInfo route,
-                                           int inport,
-                                           PortDirection inport_dirn)
+RoutingUnit::outportComputeTree(const RouteInfo &route, bool adaptive)
 {
-    PortDirection outport_dirn = "Unknown";
-// printf("outportComputeFatTreeAdaptive\n");
-    int k = m_router->get_net_ptr()->getNumPods(); // tree degree, num_pods, k
-// printf("Step 1\n");
-    int half_k = k / 2;
-    int num_edge_layer = half_k * k;
-    int num_agg_layer = half_k * k;
-    int num_core_layer = half_k * half_k;
-    int my_id = m_router->get_id();
+    int dest_id = route.dest_router;
+    if (dest_id / m_tree_span == m_tree_subtree) {
+        // Down to the child subtree holding the destination
+        int child = (dest_id / m_tree_child_span) %
+                    (int)m_tree_down_outports.size();
+        return m_tree_down_outports[child];
+    }
 
-    // Add my congestion value
-    m_router->get_net_ptr()->add_router_congestion_value(my_id);
-// printf("Step 2\n");
+    assert(!m_tree_up_outports.empty());
+    if (adaptive)
+        return chooseLeastCongested(m_tree_up_outports);
+    int up = (dest_id / m_tree_up_divisor) %
+             (int)m_tree_up_outports.size();
+    return m_tree_up_outports[up];
+}
 
-    // This function calculates the next direction if we want to go from 
-    //   the current router to the desired route.dest_router, which must 
-    //   be an edge router. 
-    // Determine layer of current router
+// Locate this router in the tree described by
+// GarnetNetwork.tree_children and tree_parents. Routers are numbered
+// level by level from the edge switches up; within a level, switch
+// subtree * (parents per subtree) + y sits above subtree of edge routers.
+// Called once from GarnetNetwork::init() after the links are created.
+void
+RoutingUnit::initTreeRoutes()
+{
+    GarnetNetwork *net_ptr = m_router->get_net_ptr();
+    const std::vector<uint32_t> &children = net_ptr->getTreeChildren();
+    const std::vector<uint32_t> &parents = net_ptr->getTreeParents();
+    int num_levels = children.size();
 
-    int my_layer;
-    if (my_id < num_edge_layer) {
-        my_layer = 0; // EDGE
-    } else if (my_id < num_edge_layer + num_agg_layer) {
-        my_layer = 1; // AGGREGATION
-    } else {
-        my_layer = 2; // CORE
-    }
+    // Number of level-l subtrees and of switches above each of them
+    int num_subtrees = 1;
+    for (int l = 1; l < num_levels; l++)
+        num_subtrees *= children[l];
+    int switches_per_subtree = 1;
 
-    // srand((int)time(0));
-    // std :: cout << "my_layer: " << my_layer << " dest_layer: " << dest_layer << std :: endl;
-    // std :: cout << "k: " << k << "num_edge_layer: " << num_edge_layer << std::endl;
-    // std :: cout << "my_id: " << my_id << "dest_id: " << dest_id << std :: endl; 
-    // assert(dest_id < num_edge_layer);
-    
-    if (my_layer == 0) { // EDGE
-        int my_pos = my_id % half_k;
-        int my_pod = my_id / half_k;
-        /// Upwards to an adaptive aggregation router
-// printf("Case 1, my_pod: %d\n", my_pod);
-        std::string least_congested_port = chooseLeastCongested("Agg", num_edge_layer + my_pod * half_k, half_k);
-// printf("least_congested_port: %s\n", least_congested_port.c_str());
-        outport_dirn = least_congested_port;
-    } else if (my_layer == 1) { // AGGREGATION
-        int my_pod = (my_id - num_edge_layer) / half_k;
-        int my_pos = my_id % half_k;
-        int dest_id = route.dest_router;
-        if (dest_id / half_k == my_pod) {
-// printf("Case 2\n");
-            // Destination is an edge router in the same pod
-            outport_dirn = "Edge" + std::to_string(dest_id % half_k);
-        } else {
-            // Upwards to an adaptive aggregation router
-// printf("Case 3\n");
-            std::string least_congested_port = chooseLeastCongested("Core", num_edge_layer + num_agg_layer + my_pos * half_k, half_k);
-// printf("least_congested_port: %s\n", least_congested_port.c_str());
-            outport_dirn = least_congested_port;
+    int my_id = m_router->get_id();
+    int first_id = 0;
+    m_tree_child_span = 1;
+    m_tree_span = 1;
+    for (int level = 1; level <= num_levels; level++) {
+        int num_switches = num_subtrees * switches_per_subtree;
+        if (my_id < first_id + num_switches) {
+            m_tree_level = level;
+            m_tree_subtree = (my_id - first_id) / switches_per_subtree;
+            m_tree_up_divisor = switches_per_subtree;
+            break;
         }
-    } else if (my_layer == 2) { // CORE
-        // Downwards to the correct aggregation router in the destination pod
-        int dest_id = route.dest_router;
-        int dest_pod = dest_id / half_k;
-// printf("Case 4, dest_pod: %d\n", dest_pod);
-        outport_dirn = "Agg" + std::to_string(dest_pod);
-    } else {
-        panic("Invalid router layer determined");
+        fatal_if(level == num_levels, "Router %d is not part of the "
+                 "folded-Clos tree\n", my_id);
+        first_id += num_switches;
+        m_tree_child_span = m_tree_span;
+        m_tree_span *= children[level];
+        num_subtrees /= children[level];
+        switches_per_subtree *= parents[level - 1];
     }
 
-    // Subtract my congestion value
-    m_router->get_net_ptr()->sub_router_congestion_value(my_id);
-
-    return m_outports_dirn2idx[outport_dirn];
+    int num_up = m_tree_level < num_levels ? parents[m_tree_level - 1] : 0;
+    int num_down = m_tree_level > 1 ? children[m_tree_level - 1] : 0;
+    fatal_if((int)m_tree_up_outports.size() != num_up ||
+             (int)m_tree_down_outports.size() != num_down ||
+             std::count(m_tree_up_outports.begin(),
+                        m_tree_up_outports.end(), -1) ||
+             std::count(m_tree_down_outports.begin(),
+                        m_tree_down_outports.end(), -1),
+             "Router %d at tree level %d needs ports Up0-Up%d and "
+             "Down0-Down%d\n", my_id, m_tree_level, num_up - 1,
+             num_down - 1);
+
+    DPRINTF(RubyNetwork, "Tree router %d: level %d subtree %d span %d "
+            "up %d down %d\n", my_id, m_tree_level, m_tree_subtree,
+            m_tree_span, num_up, num_down);
 }
 
-std::string RoutingUnit::chooseLeastCongested(std::string prefix, int start, int len) {
+// Pick the least congested of the given outports, see
+// Router::get_outport_congestion(). Ties are broken uniformly at random
+// (reservoir sampling, so no candidate list has to be built).
+int
+RoutingUnit::chooseLeastCongested(const std::vector<int> &outports)
+{
+    int least_congested_port = -1;
     int min_congestion = INT_MAX;
-    std::vector<std::string> least_congested_ports;
-    least_congested_ports.resize(0);
-    for (int i = 0; i < len; i++) {
-        std::string current_port = prefix + std::to_string(i);
-        int current_idx = m_outports_dirn2idx[current_port];
-        int current_port_congestion = m_router->get_net_ptr()->get_router_congestion_value(current_idx);
-        if (current_port_congestion < min_congestion) {
-            min_congestion = current_port_congestion;
-            least_congested_ports.resize(0);
-            least_congested_ports.push_back(current_port);
-        }
-        else if (current_port_congestion == min_congestion) {
-            least_congested_ports.push_back(current_port);
+    int num_ties = 0;
+    for (int outport : outports) {
+        assert(outport != -1);
+        int congestion = m_router->get_outport_congestion(outport);
+        if (congestion < min_congestion) {
+            min_congestion = congestion;
+            least_congested_port = outport;
+            num_ties = 1;
+        } else if (congestion == min_congestion &&
+                   m_router->getRandom().random<int>(0, num_ties++) == 0) {
+            least_congested_port = outport;
         }
     }
-    // Randomly select any candidate output link
-    int layer_id = prefix == "Agg" ? 1 : 2; // offsets
-    int candidate = (rand() + layer_id) % least_congested_ports.size();
-    std::string least_congested_port = least_congested_ports[candidate];
-
-    // if (rand() % 100 < 5) {
-    //     std :: cout << min_congestion << std :: endl;
-    //     for (auto port : least_congested_ports) {
-    //         std :: cout << port << " ";
-    //     }
-    //     std :: cout << std :: endl;
-    // }
-
+    assert(least_congested_port != -1);
     return least_congested_port;
 }
 
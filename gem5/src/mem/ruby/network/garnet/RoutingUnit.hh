@@ -53,49 +53,55 @@ class RoutingUnit
 {
   public:
     RoutingUnit(Router *router);
-    int outportCompute(RouteInfo route,
+    int outportCompute(const RouteInfo &route,
                       int inport,
-                      PortDirection inport_dirn);
+                      const PortDirection &inport_dirn);
 
     // Topology-agnostic Routing Table based routing (default)
     void addRoute(std::vector<NetDest>& routing_table_entry);
     void addWeight(int link_weight);
 
     // get output port from routing table
-    int  lookupRoutingTable(int vnet, NetDest net_dest);
+    int  lookupRoutingTable(int vnet, const NetDest &net_dest);
 
     // Topology-specific direction based routing
     void addInDirection(PortDirection inport_dirn, int inport);
     void addOutDirection(PortDirection outport_dirn, int outport);
 
     // Routing for Mesh
-    int outportComputeXY(RouteInfo route,
+    int outportComputeXY(const RouteInfo &route,
                          int inport,
-                         PortDirection inport_dirn);
+                         const PortDirection &inport_dirn);
 
     // Custom Routing Algorithm using Port Directions
-    int outportComputeCustom(RouteInfo route,
+    int outportComputeCustom(const RouteInfo &route,
                              int inport,
-                             PortDirection inport_dirn);
+                             const PortDirection &inport_dirn);
 
-    int outportComputeFatTree(RouteInfo route,
+    // Routing for FatTree (see configs/topologies/FatTree.py)
+    int outportComputeFatTree(const RouteInfo &route,
                              int inport,
-                             PortDirection inport_dirn);
-    int outportComputeFatTreeAdaptive(RouteInfo route,
+                             const PortDirection &inport_dirn);
+    int outportComputeFatTreeAdaptive(const RouteInfo &route,
                              int inport,
-                             PortDirection inport_dirn);
-    std::string chooseLeastCongested(std::string prefix, int start, int len);
+                             const PortDirection &inport_dirn);
+    int chooseLeastCongested(const std::vector<int> &outports);
+    void initFatTreeRoutes(int num_pods);
+
+    // Routing for folded-Clos trees (see configs/topologies/FoldedClos.py)
+    int outportComputeTree(const RouteInfo &route, bool adaptive);
+    void initTreeRoutes();
+
     // Returns true if vnet is present in the vector
     // of vnets or if the vector supports all vnets.
     bool supportsVnet(int vnet, std::vector<int> sVnets);
 
-    /// Lab4: Congestion value
-    // void init_congestion_value(int num_routers);
-    // void add_congestion_value(int router_id);
-    // void sub_congestion_value(int router_id);
-    // int get_congestion_value(int router_id);
-
   private:
+    // Types of the FatTree port directions "Edge<i>", "Agg<i>", "Core<i>"
+    enum FatTreePortType { FT_EDGE_, FT_AGG_, FT_CORE_, NUM_FT_PORT_TYPES_ };
+
+    int fatTreeOutport(FatTreePortType type, int pos) const;
+
     Router *m_router;
 
     // Routing Table
@@ -108,8 +114,33 @@ class RoutingUnit
     std::map<int, PortDirection> m_outports_idx2dirn;
     std::map<PortDirection, int> m_outports_dirn2idx;
 
-    /// Lab4: Congestion value
-    // std::vector<int> m_congestion_value;
+    // Outport indices of the FatTree directions by type and position,
+    // e.g. "Agg2" is m_fattree_outports[FT_AGG_][2]
+    std::vector<int> m_fattree_outports[NUM_FT_PORT_TYPES_];
+
+    // FatTree route of each destination edge router: the deterministic
+    // outport, and whether the hop goes up, in which case any of
+    // m_fattree_up_outports is an equal-cost alternative
+    struct FatTreeRoute
+    {
+        int outport = -1;
+        bool up = false;
+    };
+    std::vector<FatTreeRoute> m_fattree_routes;
+    std::vector<int> m_fattree_up_outports;
+
+    // Position of this router in a folded-Clos tree: its level (1 for
+    // edge switches), the subtree of edge routers below it, and the
+    // number of edge routers per subtree at its level and the one below
+    int m_tree_level;
+    int m_tree_subtree;
+    int m_tree_span;
+    int m_tree_child_span;
+    // Up-port choice of deterministic routing: (dest / divisor) % parents
+    int m_tree_up_divisor;
+    // Outport indices of the directions "Up<j>" and "Down<c>"
+    std::vector<int> m_tree_up_outports;
+    std::vector<int> m_tree_down_outports;
 };
 
 } // namespace garnet
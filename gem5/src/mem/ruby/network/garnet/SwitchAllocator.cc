@@ -66,6 +66,28 @@ SwitchAllocator::init()
     m_round_robin_invc.resize(m_num_inports);
     m_port_requests.resize(m_num_inports);
     m_vc_winners.resize(m_num_inports);
+    m_requested_outports.resize(m_num_outports);
+
+    m_policy = m_router->get_net_ptr()->getSwitchAllocPolicy();
+    m_islip_iterations = m_router->get_net_ptr()->getIslipIterations();
+    if (m_policy != enums::round_robin) {
+        m_outport_requests.resize(m_num_outports);
+        for (auto &requests : m_outport_requests)
+            requests.resize(m_num_inports);
+    }
+    if (m_policy == enums::islip) {
+        m_inport_requests.resize(m_num_inports);
+        m_inport_grants.resize(m_num_inports);
+        for (int i = 0; i < m_num_inports; i++) {
+            m_inport_requests[i].resize(m_num_outports);
+            m_inport_grants[i].resize(m_num_outports);
+        }
+        m_requesting_inports.resize(m_num_inports);
+        m_granted_inports.resize(m_num_inports);
+        m_islip_vc.assign(m_num_inports,
+                          std::vector<int>(m_num_outports, -1));
+        m_round_robin_outport.assign(m_num_inports, 0);
+    }
 
     for (int i = 0; i < m_num_inports; i++) {
         m_round_robin_invc[i] = 0;
@@ -90,8 +112,13 @@ SwitchAllocator::init()
 void
 SwitchAllocator::wakeup()
 {
-    arbitrate_inports(); // First stage of allocation
-    arbitrate_outports(); // Second stage of allocation
+    if (m_policy == enums::islip) {
+        islip_request();
+        islip_match();
+    } else {
+        arbitrate_inports(); // First stage of allocation
+        arbitrate_outports(); // Second stage of allocation
+    }
 
     clear_request_vector();
     check_for_wakeup();
@@ -112,7 +139,13 @@ SwitchAllocator::arbitrate_inports()
 {
     // Select a VC from each input in a round robin manner
     // Independent arbiter at each input port
+    bool activity_tracking = m_router->isActivityTracking();
+    const PortMask &buffered_inports = m_router->getBufferedInports();
     for (int inport = 0; inport < m_num_inports; inport++) {
+        // With activity tracking, skip inports without buffered flits
+        if (activity_tracking && !buffered_inports.test(inport))
+            continue;
+
         int invc = m_round_robin_invc[inport];
 
         for (int invc_iter = 0; invc_iter < m_num_vcs; invc_iter++) {
@@ -133,6 +166,9 @@ SwitchAllocator::arbitrate_inports()
                     m_input_arbiter_activity++;
                     m_port_requests[inport] = outport;
                     m_vc_winners[inport] = invc;
+                    m_requested_outports.set(outport);
+                    if (m_policy == enums::bitmask)
+                        m_outport_requests[outport].set(inport);
 
                     break; // got one vc winner for this port
                 }
@@ -162,10 +198,21 @@ SwitchAllocator::arbitrate_inports()
 void
 SwitchAllocator::arbitrate_outports()
 {
+    if (m_policy == enums::bitmask) {
+        arbitrate_outports_bitmask();
+        return;
+    }
+
     // Now there are a set of input vc requests for output vcs.
     // Again do round robin arbitration on these requests
     // Independent arbiter at each output port
+    bool activity_tracking = m_router->isActivityTracking();
     for (int outport = 0; outport < m_num_outports; outport++) {
+        // With activity tracking, skip outports nobody requested in SA-I
+        if (activity_tracking && !m_requested_outports.test(outport))
+            continue;
+        m_requested_outports.clear(outport);
+
         int inport = m_round_robin_inport[outport];
 
         for (int inport_iter = 0; inport_iter < m_num_inports;
@@ -173,71 +220,8 @@ SwitchAllocator::arbitrate_outports()
 
             // inport has a request this cycle for outport
             if (m_port_requests[inport] == outport) {
-                auto output_unit = m_router->getOutputUnit(outport);
-                auto input_unit = m_router->getInputUnit(inport);
-
                 // grant this outport to this inport
-                int invc = m_vc_winners[inport];
-
-                int outvc = input_unit->get_outvc(invc);
-                if (outvc == -1) {
-                    // VC Allocation - select any free VC from outport
-                    outvc = vc_allocate(outport, inport, invc);
-                }
-
-                // remove flit from Input VC
-                flit *t_flit = input_unit->getTopFlit(invc);
-
-                DPRINTF(RubyNetwork, "SwitchAllocator at Router %d "
-                                     "granted outvc %d at outport %d "
-                                     "to invc %d at inport %d to flit %s at "
-                                     "cycle: %lld\n",
-                        m_router->get_id(), outvc,
-                        m_router->getPortDirectionName(
-                            output_unit->get_direction()),
-                        invc,
-                        m_router->getPortDirectionName(
-                            input_unit->get_direction()),
-                            *t_flit,
-                        m_router->curCycle());
-
-
-                // Update outport field in the flit since this is
-                // used by CrossbarSwitch code to send it out of
-                // correct outport.
-                // Note: post route compute in InputUnit,
-                // outport is updated in VC, but not in flit
-                t_flit->set_outport(outport);
-
-                // set outvc (i.e., invc for next hop) in flit
-                // (This was updated in VC by vc_allocate, but not in flit)
-                t_flit->set_vc(outvc);
-
-                // decrement credit in outvc
-                output_unit->decrement_credit(outvc);
-
-                // flit ready for Switch Traversal
-                t_flit->advance_stage(ST_, curTick());
-                m_router->grant_switch(inport, t_flit);
-                m_output_arbiter_activity++;
-
-                if ((t_flit->get_type() == TAIL_) ||
-                    t_flit->get_type() == HEAD_TAIL_) {
-
-                    // This Input VC should now be empty
-                    assert(!(input_unit->isReady(invc, curTick())));
-
-                    // Free this VC
-                    input_unit->set_vc_idle(invc, curTick());
-
-                    // Send a credit back
-                    // along with the information that this VC is now idle
-                    input_unit->increment_credit(invc, true, curTick());
-                } else {
-                    // Send a credit back
-                    // but do not indicate that the VC is idle
-                    input_unit->increment_credit(invc, false, curTick());
-                }
+                grant(inport, m_vc_winners[inport], outport);
 
                 // remove this request
                 m_port_requests[inport] = -1;
@@ -247,15 +231,6 @@ SwitchAllocator::arbitrate_outports()
                 if (m_round_robin_inport[outport] >= m_num_inports)
                     m_round_robin_inport[outport] = 0;
 
-                // Update Round Robin pointer to the next VC
-                // We do it here to keep it fair.
-                // Only the VC which got switch traversal
-                // is updated.
-                m_round_robin_invc[inport] = invc + 1;
-                if (m_round_robin_invc[inport] >= m_num_vcs)
-                    m_round_robin_invc[inport] = 0;
-
-
                 break; // got a input winner for this outport
             }
 
@@ -266,6 +241,236 @@ SwitchAllocator::arbitrate_outports()
     }
 }
 
+/*
+ * SA-II of the bitmask policy. Makes the same decisions as
+ * arbitrate_outports(), but only visits the requested outports and
+ * finds the round-robin winner among the requesting inports with a
+ * find-first-set, instead of looping over all outports x inports.
+ */
+
+void
+SwitchAllocator::arbitrate_outports_bitmask()
+{
+    m_requested_outports.forEach([&](int outport) {
+        m_requested_outports.clear(outport);
+        PortMask &requests = m_outport_requests[outport];
+
+        int inport = requests.findNext(m_round_robin_inport[outport]);
+        requests.clearAll();
+
+        grant(inport, m_vc_winners[inport], outport);
+        m_port_requests[inport] = -1;
+
+        m_round_robin_inport[outport] = inport + 1;
+        if (m_round_robin_inport[outport] >= m_num_inports)
+            m_round_robin_inport[outport] = 0;
+    });
+}
+
+/*
+ * Request phase of iSLIP. Unlike SA-I, an inport requests every outport
+ * that one of its input VCs can send to (the round-robin first such VC
+ * per outport), so that an inport whose first choice is taken can still
+ * be matched to another outport.
+ */
+
+void
+SwitchAllocator::islip_request()
+{
+    bool activity_tracking = m_router->isActivityTracking();
+    const PortMask &buffered_inports = m_router->getBufferedInports();
+    for (int inport = 0; inport < m_num_inports; inport++) {
+        if (activity_tracking && !buffered_inports.test(inport))
+            continue;
+
+        auto input_unit = m_router->getInputUnit(inport);
+        int invc = m_round_robin_invc[inport];
+
+        for (int invc_iter = 0; invc_iter < m_num_vcs; invc_iter++) {
+            if (input_unit->need_stage(invc, SA_, curTick())) {
+                int outport = input_unit->get_outport(invc);
+                int outvc = input_unit->get_outvc(invc);
+
+                if (m_islip_vc[inport][outport] == -1 &&
+                    send_allowed(inport, invc, outport, outvc)) {
+                    m_input_arbiter_activity++;
+                    m_islip_vc[inport][outport] = invc;
+                    m_inport_requests[inport].set(outport);
+                    m_outport_requests[outport].set(inport);
+                    m_requested_outports.set(outport);
+                    m_requesting_inports.set(inport);
+                }
+            }
+
+            invc++;
+            if (invc >= m_num_vcs)
+                invc = 0;
+        }
+    }
+}
+
+/*
+ * Grant and accept phases of iSLIP. Every unmatched outport grants the
+ * round-robin next of its requesting inports, and every inport accepts
+ * the round-robin next of its granting outports. Matched ports drop out
+ * and the remaining ones try again, for up to islip_iterations rounds.
+ * As in iSLIP, the round-robin pointers only move on matches of the
+ * first round, which desynchronizes them under load.
+ */
+
+void
+SwitchAllocator::islip_match()
+{
+    for (int iter = 0; iter < m_islip_iterations; iter++) {
+        // Grant
+        m_requested_outports.forEach([&](int outport) {
+            int inport = m_outport_requests[outport].findNext(
+                m_round_robin_inport[outport]);
+            m_inport_grants[inport].set(outport);
+            m_granted_inports.set(inport);
+        });
+
+        // Accept
+        bool matched = false;
+        m_granted_inports.forEach([&](int inport) {
+            m_granted_inports.clear(inport);
+            int outport = m_inport_grants[inport].findNext(
+                m_round_robin_outport[inport]);
+            m_inport_grants[inport].clearAll();
+            int invc = m_islip_vc[inport][outport];
+
+            if (iter == 0) {
+                m_round_robin_inport[outport] = inport + 1;
+                if (m_round_robin_inport[outport] >= m_num_inports)
+                    m_round_robin_inport[outport] = 0;
+                m_round_robin_outport[inport] = outport + 1;
+                if (m_round_robin_outport[inport] >= m_num_outports)
+                    m_round_robin_outport[inport] = 0;
+            }
+
+            // Withdraw the other requests of this inport
+            m_inport_requests[inport].forEach([&](int other) {
+                m_islip_vc[inport][other] = -1;
+                m_outport_requests[other].clear(inport);
+                if (m_outport_requests[other].empty())
+                    m_requested_outports.clear(other);
+            });
+            m_inport_requests[inport].clearAll();
+            m_requesting_inports.clear(inport);
+
+            // and take this outport out of the matching
+            m_outport_requests[outport].forEach([&](int other) {
+                m_inport_requests[other].clear(outport);
+                m_islip_vc[other][outport] = -1;
+            });
+            m_outport_requests[outport].clearAll();
+            m_requested_outports.clear(outport);
+
+            grant(inport, invc, outport);
+            matched = true;
+        });
+
+        if (!matched)
+            break;
+    }
+
+    // Drop the requests that were not matched this cycle
+    m_requesting_inports.forEach([&](int inport) {
+        m_inport_requests[inport].forEach([&](int outport) {
+            m_islip_vc[inport][outport] = -1;
+            m_outport_requests[outport].clear(inport);
+        });
+        m_inport_requests[inport].clearAll();
+    });
+    m_requesting_inports.clearAll();
+    m_requested_outports.clearAll();
+}
+
+/*
+ * Switch traversal of a granted flit: performs simplified outvc
+ * allocation for HEAD/HEAD_TAIL flits, reads the flit out of the input VC,
+ * sends it to the CrossbarSwitch and a credit to the upstream router.
+ */
+
+void
+SwitchAllocator::grant(int inport, int invc, int outport)
+{
+    auto output_unit = m_router->getOutputUnit(outport);
+    auto input_unit = m_router->getInputUnit(inport);
+
+    int outvc = input_unit->get_outvc(invc);
+    if (outvc == -1) {
+        // VC Allocation - select any free VC from outport
+        outvc = vc_allocate(outport, inport, invc);
+    }
+
+    // remove flit from Input VC
+    flit *t_flit = input_unit->getTopFlit(invc);
+
+    DPRINTF(RubyNetwork, "SwitchAllocator at Router %d "
+                         "granted outvc %d at outport %d "
+                         "to invc %d at inport %d to flit %s at "
+                         "cycle: %lld\n",
+            m_router->get_id(), outvc,
+            m_router->getPortDirectionName(
+                output_unit->get_direction()),
+            invc,
+            m_router->getPortDirectionName(
+                input_unit->get_direction()),
+                *t_flit,
+            m_router->curCycle());
+
+
+    // Update outport field in the flit since this is
+    // used by CrossbarSwitch code to send it out of
+    // correct outport.
+    // Note: post route compute in InputUnit,
+    // outport is updated in VC, but not in flit
+    t_flit->set_outport(outport);
+
+    // set outvc (i.e., invc for next hop) in flit
+    // (This was updated in VC by vc_allocate, but not in flit)
+    t_flit->set_vc(outvc);
+
+    // decrement credit in outvc
+    output_unit->decrement_credit(outvc);
+
+    // cycles the flit waited for this grant
+    input_unit->add_stall_cycles(invc,
+        m_router->ticksToCycles(curTick() - t_flit->get_stage().second));
+
+    // flit ready for Switch Traversal
+    t_flit->advance_stage(ST_, curTick());
+    m_router->grant_switch(inport, t_flit);
+    m_output_arbiter_activity++;
+
+    if ((t_flit->get_type() == TAIL_) ||
+        t_flit->get_type() == HEAD_TAIL_) {
+
+        // This Input VC should now be empty
+        assert(!(input_unit->isReady(invc, curTick())));
+
+        // Free this VC
+        input_unit->set_vc_idle(invc, curTick());
+
+        // Send a credit back
+        // along with the information that this VC is now idle
+        input_unit->increment_credit(invc, true, curTick());
+    } else {
+        // Send a credit back
+        // but do not indicate that the VC is idle
+        input_unit->increment_credit(invc, false, curTick());
+    }
+
+    // Update Round Robin pointer to the next VC
+    // We do it here to keep it fair.
+    // Only the VC which got switch traversal
+    // is updated.
+    m_round_robin_invc[inport] = invc + 1;
+    if (m_round_robin_invc[inport] >= m_num_vcs)
+        m_round_robin_invc[inport] = 0;
+}
+
 /*
  * A flit can be sent only if
  * (1) there is at least one free output VC at the
@@ -362,7 +567,11 @@ SwitchAllocator::check_for_wakeup()
         return;
     }
 
+    bool activity_tracking = m_router->isActivityTracking();
+    const PortMask &buffered_inports = m_router->getBufferedInports();
     for (int i = 0; i < m_num_inports; i++) {
+        if (activity_tracking && !buffered_inports.test(i))
+            continue;
         for (int j = 0; j < m_num_vcs; j++) {
             if (m_router->getInputUnit(i)->need_stage(j, SA_, nextCycle)) {
                 m_router->schedule_wakeup(Cycles(1));
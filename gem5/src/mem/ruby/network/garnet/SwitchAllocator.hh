@@ -35,6 +35,7 @@
 #include <iostream>
 #include <vector>
 
+#include "enums/SwitchAllocatorPolicy.hh"
 #include "mem/ruby/common/Consumer.hh"
 #include "mem/ruby/network/garnet/CommonTypes.hh"
 
@@ -63,6 +64,9 @@ class SwitchAllocator : public Consumer
     void print(std::ostream& out) const {};
     void arbitrate_inports();
     void arbitrate_outports();
+    void arbitrate_outports_bitmask();
+    void islip_request();
+    void islip_match();
     bool send_allowed(int inport, int invc, int outport, int outvc);
     int vc_allocate(int outport, int inport, int invc);
 
@@ -80,6 +84,9 @@ class SwitchAllocator : public Consumer
     void resetStats();
 
   private:
+    // Moves the flit of invc at inport to the crossbar towards outport
+    void grant(int inport, int invc, int outport);
+
     int m_num_inports, m_num_outports;
     int m_num_vcs, m_vc_per_vnet;
 
@@ -90,6 +97,18 @@ class SwitchAllocator : public Consumer
     std::vector<int> m_round_robin_inport;
     std::vector<int> m_port_requests;
     std::vector<int> m_vc_winners;
+    PortMask m_requested_outports; // outports requested in SA-I
+
+    // Bitmask allocators (bitmask and islip policies)
+    enums::SwitchAllocatorPolicy m_policy;
+    int m_islip_iterations;
+    std::vector<PortMask> m_outport_requests; // inports requesting outport
+    std::vector<PortMask> m_inport_requests;  // outports requested, islip
+    std::vector<PortMask> m_inport_grants;    // outports granting, islip
+    PortMask m_requesting_inports;
+    PortMask m_granted_inports;
+    std::vector<std::vector<int>> m_islip_vc; // [inport][outport] -> invc
+    std::vector<int> m_round_robin_outport;   // islip accept pointers
 };
 
 } // namespace garnet
@@ -40,9 +40,9 @@ namespace ruby
 namespace garnet
 {
 
-VirtualChannel::VirtualChannel()
-  : inputBuffer(), m_vc_state(IDLE_, Tick(0)), m_output_port(-1),
-    m_enqueue_time(INFINITE_), m_output_vc(-1)
+VirtualChannel::VirtualChannel(int buffer_size)
+  : inputBuffer(buffer_size), m_vc_state(IDLE_, Tick(0)), m_output_port(-1),
+    m_enqueue_time(INFINITE_), m_output_vc(-1), m_stall_cycles(0)
 {
 }
 
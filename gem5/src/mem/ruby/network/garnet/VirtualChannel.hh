@@ -49,7 +49,7 @@ namespace garnet
 class VirtualChannel
 {
   public:
-    VirtualChannel();
+    VirtualChannel(int buffer_size);
     ~VirtualChannel() = default;
 
     bool need_stage(flit_stage stage, Tick time);
@@ -64,6 +64,11 @@ class VirtualChannel
     inline void set_enqueue_time(Tick time) { m_enqueue_time = time; }
     inline VC_state_type get_state()        { return m_vc_state.first; }
 
+    // Cycles flits of this VC were ready for switch allocation but had
+    // to wait for it (see SwitchAllocator::grant())
+    inline void add_stall_cycles(Cycles cycles) { m_stall_cycles += cycles; }
+    inline uint64_t get_stall_cycles() const    { return m_stall_cycles; }
+
     inline bool
     isReady(Tick curTime)
     {
@@ -104,6 +109,7 @@ class VirtualChannel
     int m_output_port;
     Tick m_enqueue_time;
     int m_output_vc;
+    uint64_t m_stall_cycles;
 };
 
 } // namespace garnet
@@ -32,10 +32,12 @@
 #define __MEM_RUBY_NETWORK_GARNET_0_FLIT_HH__
 
 #include <cassert>
+#include <cstddef>
 #include <iostream>
 
 #include "base/types.hh"
 #include "mem/ruby/network/garnet/CommonTypes.hh"
+#include "mem/ruby/network/garnet/FlitPool.hh"
 #include "mem/ruby/slicc_interface/Message.hh"
 
 namespace gem5
@@ -56,6 +58,19 @@ class flit
 
     virtual ~flit(){};
 
+    // Flits and credits are recycled through FlitPool
+    static void *
+    operator new(std::size_t size)
+    {
+        return FlitPool::allocate(size);
+    }
+
+    static void
+    operator delete(void *ptr, std::size_t size)
+    {
+        FlitPool::release(ptr, size);
+    }
+
     int get_outport() {return m_outport; }
     int get_size() { return m_size; }
     Tick get_enqueue_time() { return m_enqueue_time; }
@@ -65,7 +80,7 @@ class flit
     Tick get_time() { return m_time; }
     int get_vnet() { return m_vnet; }
     int get_vc() { return m_vc; }
-    RouteInfo get_route() { return m_route; }
+    const RouteInfo &get_route() const { return m_route; }
     MsgPtr& get_msg_ptr() { return m_msg_ptr; }
     flit_type get_type() { return m_type; }
     std::pair<flit_stage, Tick> get_stage() { return m_stage; }
@@ -31,6 +31,8 @@
 
 #include "mem/ruby/network/garnet/flitBuffer.hh"
 
+#include "base/intmath.hh"
+
 namespace gem5
 {
 
@@ -40,26 +42,48 @@ namespace ruby
 namespace garnet
 {
 
+// Initial capacity of buffers without a known maximum occupancy
+static const int defaultCapacity = 4;
+
 flitBuffer::flitBuffer()
+    : m_head(0), m_size(0), m_mask(0)
 {
     max_size = INFINITE_;
+    grow(defaultCapacity);
 }
 
 flitBuffer::flitBuffer(int maximum_size)
+    : m_head(0), m_size(0), m_mask(0)
 {
     max_size = maximum_size;
+    grow(maximum_size);
+}
+
+void
+flitBuffer::grow(int capacity)
+{
+    int new_capacity = 1 << ceilLog2(std::max(capacity, 1));
+    if (new_capacity <= (int)m_ring.size())
+        return;
+
+    std::vector<flit *> ring(new_capacity, nullptr);
+    for (int i = 0; i < m_size; i++)
+        ring[i] = at(i);
+    m_ring.swap(ring);
+    m_head = 0;
+    m_mask = new_capacity - 1;
 }
 
 bool
 flitBuffer::isEmpty()
 {
-    return (m_buffer.size() == 0);
+    return (m_size == 0);
 }
 
 bool
 flitBuffer::isReady(Tick curTime)
 {
-    if (m_buffer.size() != 0 ) {
+    if (m_size != 0) {
         flit *t_flit = peekTopFlit();
         if (t_flit->get_time() <= curTime)
             return true;
@@ -70,27 +94,28 @@ flitBuffer::isReady(Tick curTime)
 void
 flitBuffer::print(std::ostream& out) const
 {
-    out << "[flitBuffer: " << m_buffer.size() << "] " << std::endl;
+    out << "[flitBuffer: " << m_size << "] " << std::endl;
 }
 
 bool
 flitBuffer::isFull()
 {
-    return (m_buffer.size() >= max_size);
+    return (m_size >= max_size);
 }
 
 void
 flitBuffer::setMaxSize(int maximum)
 {
     max_size = maximum;
+    grow(maximum);
 }
 
 bool
 flitBuffer::functionalRead(Packet *pkt, WriteMask &mask)
 {
     bool read = false;
-    for (unsigned int i = 0; i < m_buffer.size(); ++i) {
-        if (m_buffer[i]->functionalRead(pkt, mask)) {
+    for (int i = 0; i < m_size; ++i) {
+        if (at(i)->functionalRead(pkt, mask)) {
             read = true;
         }
     }
@@ -103,8 +128,8 @@ flitBuffer::functionalWrite(Packet *pkt)
 {
     uint32_t num_functional_writes = 0;
 
-    for (unsigned int i = 0; i < m_buffer.size(); ++i) {
-        if (m_buffer[i]->functionalWrite(pkt)) {
+    for (int i = 0; i < m_size; ++i) {
+        if (at(i)->functionalWrite(pkt)) {
             num_functional_writes++;
         }
     }
@@ -32,6 +32,7 @@
 #define __MEM_RUBY_NETWORK_GARNET_0_FLITBUFFER_HH__
 
 #include <algorithm>
+#include <cassert>
 #include <iostream>
 #include <vector>
 
@@ -47,6 +48,10 @@ namespace ruby
 namespace garnet
 {
 
+// FIFO of flits, backed by a circular array. The array is sized from
+// the maximum occupancy (e.g. the buffers per VC) up front, so the
+// buffer operations do not allocate; it only grows in the rare case
+// that a buffer holds more flits than that.
 class flitBuffer
 {
   public:
@@ -58,33 +63,48 @@ class flitBuffer
     void print(std::ostream& out) const;
     bool isFull();
     void setMaxSize(int maximum);
-    int getSize() const { return m_buffer.size(); }
+    int getSize() const { return m_size; }
 
     flit *
     getTopFlit()
     {
-        flit *f = m_buffer.front();
-        m_buffer.pop_front();
+        assert(m_size > 0);
+        flit *f = m_ring[m_head];
+        m_head = (m_head + 1) & m_mask;
+        m_size--;
         return f;
     }
 
     flit *
     peekTopFlit()
     {
-        return m_buffer.front();
+        assert(m_size > 0);
+        return m_ring[m_head];
     }
 
     void
     insert(flit *flt)
     {
-        m_buffer.push_back(flt);
+        if (m_size == (int)m_ring.size())
+            grow(m_size + 1);
+        m_ring[(m_head + m_size) & m_mask] = flt;
+        m_size++;
     }
 
     bool functionalRead(Packet *pkt, WriteMask &mask);
     uint32_t functionalWrite(Packet *pkt);
 
   private:
-    std::deque<flit *> m_buffer;
+    // Resize the ring to hold at least capacity flits
+    void grow(int capacity);
+
+    flit *at(int i) const { return m_ring[(m_head + i) & m_mask]; }
+
+    // The capacity is a power of two; m_head indexes the oldest flit
+    std::vector<flit *> m_ring;
+    int m_head;
+    int m_size;
+    int m_mask;
     int max_size;
 };
 
@@ -27,7 +27,10 @@
 import importlib
 import importlib.abc
 import importlib.util
+import marshal
 import os
+import struct
+import sys
 
 
 class ByteCodeLoader(importlib.abc.Loader):
@@ -39,6 +42,56 @@ class ByteCodeLoader(importlib.abc.Loader):
         exec(self.code, module.__dict__)
 
 
+# On-disk cache of the code compiled from the source files that
+# M5_OVERRIDE_PY_SOURCE substitutes for the embedded code. An entry is
+# only used if the magic number of the interpreter and the modification
+# time and size of the source file match its header. Entries are written
+# to a temporary file and renamed into place, so concurrent processes
+# never see a partial one.
+class CodeCache(object):
+    header = struct.Struct("<4sqq")
+
+    def __init__(self, path):
+        self.path = path
+
+    def entry(self, abspath):
+        name = f"{abspath}.{sys.implementation.cache_tag}.pyc"
+        return os.path.join(self.path, name.lstrip(os.sep))
+
+    def compile(self, abspath):
+        st = os.stat(abspath)
+        key = (importlib.util.MAGIC_NUMBER, st.st_mtime_ns, st.st_size)
+        entry = self.entry(abspath)
+
+        try:
+            with open(entry, "rb") as f:
+                data = f.read()
+            if self.header.unpack_from(data) == key:
+                return marshal.loads(data[self.header.size :])
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            pass
+
+        with open(abspath, "r") as f:
+            code = compile(f.read(), abspath, "exec")
+
+        import tempfile
+
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(entry))
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.header.pack(*key))
+                f.write(marshal.dumps(code))
+            os.replace(tmp, entry)
+        except OSError:
+            # The cache is only an optimisation
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+
+        return code
+
+
 # Simple importer that allows python to import data from a dict of
 # code objects.  The keys are the module path, and the items are the
 # filename and bytecode of the file.
@@ -47,6 +100,17 @@ class CodeImporter(object):
         self.modules = {}
         override_var = os.environ.get("M5_OVERRIDE_PY_SOURCE", "false")
         self.override = override_var.lower() in ("true", "yes")
+        self.cache = None
+        if self.override:
+            cache_home = os.environ.get(
+                "XDG_CACHE_HOME", os.path.expanduser("~/.cache")
+            )
+            cache_dir = os.environ.get(
+                "M5_OVERRIDE_PY_CACHE",
+                os.path.join(cache_home, "gem5", "pycache"),
+            )
+            if cache_dir:
+                self.cache = CodeCache(cache_dir)
 
     def add_module(self, abspath, modpath, code):
         if modpath in self.modules:
@@ -61,8 +125,11 @@ class CodeImporter(object):
         abspath, code = self.modules[fullname]
 
         if self.override and os.path.exists(abspath):
-            src = open(abspath, "r").read()
-            code = compile(src, abspath, "exec")
+            if self.cache:
+                code = self.cache.compile(abspath)
+            else:
+                src = open(abspath, "r").read()
+                code = compile(src, abspath, "exec")
 
         is_package = os.path.basename(abspath) == "__init__.py"
         spec = importlib.util.spec_from_loader(
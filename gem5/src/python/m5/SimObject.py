@@ -118,6 +118,11 @@ instanceDict = {}
 # Did any of the SimObjects lack a header file?
 noCxxHeader = False
 
+# Names of the params of a SimObject class whose type is a subclass of a
+# given type, keyed by (class, type), for find_any(). Cleared whenever a
+# class gets a new param.
+_params_of_type = {}
+
 
 def public_value(key, value):
     return key.startswith("_") or isinstance(
@@ -306,6 +311,7 @@ class MetaSimObject(type):
         assert not hasattr(pdesc, "name")
         pdesc.name = name
         cls._params[name] = pdesc
+        _params_of_type.clear()
         if hasattr(pdesc, "default"):
             cls._set_param(name, pdesc.default, pdesc)
 
@@ -733,12 +739,16 @@ class SimObject(object, metaclass=MetaSimObject):
         self._ccParams = None
         self._instantiated = False  # really "cloned"
         self._init_called = True  # Checked so subclasses don't forget __init__
+        self._visited = False  # Set while a proxy of this object is resolved
 
         # Clone children specified at class level.  No need for a
         # multidict here since we will be cloning everything.
         # Do children before parameter values so that children that
         # are also param values get cloned properly.
         self._children = {}
+        # Children of each type find_any() looked for; reset when the
+        # children change
+        self._children_of_type = {}
         for key, val in ancestor._children.items():
             newval = val(_memo=memo_dict)
             if not newval.has_parent():
@@ -952,6 +962,7 @@ class SimObject(object, metaclass=MetaSimObject):
         child = self._children[name]
         child.clear_parent(self)
         del self._children[name]
+        self._children_of_type.clear()
 
     # Add a new child to this object.
     def add_child(self, name, child):
@@ -972,6 +983,7 @@ class SimObject(object, metaclass=MetaSimObject):
         if not isNullPointer(child):
             child.set_parent(self, name)
             self._children[name] = child
+            self._children_of_type.clear()
 
     # Take SimObject-valued parameters that haven't been explicitly
     # assigned as children and make them children of the object that
@@ -1020,13 +1032,29 @@ class SimObject(object, metaclass=MetaSimObject):
         if isinstance(self, ptype):
             return self, True
 
-        found_obj = None
-        for child in self._children.values():
-            visited = False
-            if hasattr(child, "_visited"):
-                visited = getattr(child, "_visited")
+        # Proxies of every object below this one search it for the same
+        # few types, so remember which children and params can match
+        children = self._children_of_type.get(ptype)
+        if children is None:
+            children = [
+                child
+                for child in self._children.values()
+                if isinstance(child, ptype)
+            ]
+            self._children_of_type[ptype] = children
+        key = (self.__class__, ptype)
+        pnames = _params_of_type.get(key)
+        if pnames is None:
+            pnames = [
+                pname
+                for pname, pdesc in self._params.items()
+                if issubclass(pdesc.ptype, ptype)
+            ]
+            _params_of_type[key] = pnames
 
-            if isinstance(child, ptype) and not visited:
+        found_obj = None
+        for child in children:
+            if not child._visited:
                 if found_obj != None and child != found_obj:
                     raise AttributeError(
                         "parent.any matched more than one: %s %s"
@@ -1034,15 +1062,14 @@ class SimObject(object, metaclass=MetaSimObject):
                     )
                 found_obj = child
         # search param space
-        for pname, pdesc in self._params.items():
-            if issubclass(pdesc.ptype, ptype):
-                match_obj = self._values[pname]
-                if found_obj != None and found_obj != match_obj:
-                    raise AttributeError(
-                        "parent.any matched more than one: %s and %s"
-                        % (found_obj.path, match_obj.path)
-                    )
-                found_obj = match_obj
+        for pname in pnames:
+            match_obj = self._values[pname]
+            if found_obj != None and found_obj != match_obj:
+                raise AttributeError(
+                    "parent.any matched more than one: %s and %s"
+                    % (found_obj.path, match_obj.path)
+                )
+            found_obj = match_obj
         return found_obj, found_obj != None
 
     def find_all(self, ptype):
@@ -1244,13 +1271,23 @@ class SimObject(object, metaclass=MetaSimObject):
         return self._ccObject
 
     def descendants(self):
-        yield self
-        # The order of the dict is implementation dependent, so sort
-        # it based on the key (name) to ensure the order is the same
-        # on all hosts
-        for (name, child) in sorted(self._children.items()):
-            for obj in child.descendants():
-                yield obj
+        # Walk the hierarchy with an explicit stack rather than nested
+        # generators, which would pass every object up through one
+        # generator per level
+        stack = [self]
+        while stack:
+            obj = stack.pop()
+            yield obj
+            # The order of the dict is implementation dependent, so sort
+            # it based on the key (name) to ensure the order is the same
+            # on all hosts. The stack is LIFO, so push in reverse.
+            for (name, child) in sorted(obj._children.items(), reverse=True):
+                if isSimObjectVector(child):
+                    stack.extend(
+                        v for v in reversed(child) if not isNullPointer(v)
+                    )
+                elif not isNullPointer(child):
+                    stack.append(child)
 
     # Call C++ to create C++ object corresponding to this object
     def createCCObject(self):
@@ -242,6 +242,13 @@ def parse_options():
         help="Create DOT & pdf outputs of the DVFS configuration"
         + " [Default: %default]",
     )
+    option(
+        "--config-timing",
+        metavar="FILE",
+        default=None,
+        help="Write the time spent in each phase of the configuration and"
+        + " m5.instantiate() to FILE [Default: %default]",
+    )
 
     # Debugging options
     group("Debugging Options")
@@ -442,7 +449,11 @@ def main():
         debug.help()
 
     if options.list_sim_objects:
-        from . import SimObject
+        from . import SimObject, objects
+
+        # SimObject modules are imported lazily, so import all of them
+        # to list every class
+        objects.__all__
 
         done = True
         print("SimObjects:")
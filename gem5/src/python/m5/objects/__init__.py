@@ -24,6 +24,85 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-for module in __spec__.loader_state:
-    if module.startswith("m5.objects."):
-        exec(f"from {module} import *")
+import importlib
+import sys
+import types
+
+from m5.object_index import index as _all_classes
+
+# SimObject modules are imported on first use of a class they define rather
+# than all at once, so that a configuration only pays for the SimObjects it
+# uses. The index of the classes is generated at build time from the module
+# sources; modules left out of this build are dropped from it.
+_modules = [
+    module
+    for module in __spec__.loader_state
+    if module.startswith(f"{__name__}.")
+]
+_index = {
+    name: module
+    for name, module in _all_classes.items()
+    if module in __spec__.loader_state
+}
+
+# Names every SimObject module gets from "from m5.params import *",
+# "from m5.proxy import *" and "from m5.SimObject import *" don't need any
+# of them imported.
+_common = ("m5.params", "m5.proxy", "m5.SimObject")
+
+
+def _import_all():
+    """Import every SimObject module like "from m5.objects import *" used
+    to, and set __all__ to the public names of the package."""
+    names = set(_index)
+    for module in _modules:
+        module = importlib.import_module(module)
+        public = getattr(module, "__all__", None)
+        if public is None:
+            public = [name for name in vars(module) if name[0] != "_"]
+        for name in public:
+            globals()[name] = getattr(module, name)
+        names.update(public)
+    globals()["__all__"] = sorted(names)
+
+
+def __getattr__(name):
+    if name in _index:
+        value = getattr(importlib.import_module(_index[name]), name)
+    elif name in _all_classes or name.startswith("__") and name != "__all__":
+        # Classes of modules left out of this build are known not to exist,
+        # which spares the probes of configs for them importing everything
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    else:
+        for module in _common:
+            module = importlib.import_module(module)
+            if name in module.__all__:
+                value = getattr(module, name)
+                break
+        else:
+            # Some other name defined by a SimObject module
+            if "__all__" not in globals():
+                _import_all()
+            if name not in globals():
+                raise AttributeError(
+                    f"module {__name__!r} has no attribute {name!r}"
+                )
+            return globals()[name]
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_index))
+
+
+class _ObjectsModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing m5.objects.Foo binds the module to Foo in this package,
+        # which would hide the SimObject Foo that the module defines.
+        if name in _index and value is sys.modules.get(f"{__name__}.{name}"):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _ObjectsModule
@@ -185,6 +185,12 @@ class ParamDesc(object):
         if attr == "ptype":
             from . import SimObject
 
+            if self.ptype_str not in SimObject.allClasses:
+                # The class may be in an m5.objects module that nothing has
+                # imported yet
+                from . import objects
+
+                getattr(objects, self.ptype_str, None)
             ptype = SimObject.allClasses[self.ptype_str]
             assert isSimObjectClass(ptype)
             self.ptype = ptype
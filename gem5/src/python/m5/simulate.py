@@ -40,6 +40,7 @@
 import atexit
 import os
 import sys
+import time
 
 # import the wrapped C++ functions
 import _m5.drain
@@ -60,20 +61,58 @@ from .util import attrdict
 # define a MaxTick parameter, unsigned 64 bit
 MaxTick = 2**64 - 1
 
+# Roughly when the configuration script started
+_config_start = time.perf_counter()
+
 _drain_manager = _m5.drain.DrainManager.instance()
 
 _instantiated = False  # Has m5.instantiate() been called?
 
+# Every SimObject under Root in descendants() order. instantiate() builds
+# the list once the hierarchy is complete, which it stays from then on, and
+# every later pass over the hierarchy reuses it.
+_descendants = None
+
+
+def _get_descendants(root):
+    if _descendants is not None and root is _descendants[0]:
+        return _descendants
+    return root.descendants()
+
+
+# Wall-clock time of the phases of setting up a simulation, written out
+# by instantiate() for --config-timing
+class _PhaseTimer(object):
+    def __init__(self, start):
+        self.last = start
+        self.phases = []
+
+    # End the phase called name, which started where the last one ended
+    def phase(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for name, seconds in self.phases:
+                print(f"{name:<24}{seconds:12.6f}", file=f)
+            total = sum(seconds for name, seconds in self.phases)
+            print(f"{'total':<24}{total:12.6f}", file=f)
+
+
 # The final call to instantiate the SimObject graph and initialize the
 # system.
 def instantiate(ckpt_dir=None):
-    global _instantiated
+    global _instantiated, _descendants
     from m5 import options
 
     if _instantiated:
         fatal("m5.instantiate() called twice.")
 
     _instantiated = True
+    timer = _PhaseTimer(_config_start)
+    timer.phase("configuration")
 
     root = objects.Root.getInstance()
 
@@ -88,14 +127,19 @@ def instantiate(ckpt_dir=None):
     for obj in root.descendants():
         obj.adoptOrphanParams()
 
+    # The hierarchy is complete, so walk it only once more
+    _descendants = tuple(root.descendants())
+    timer.phase("adoptOrphanParams")
+
     # Unproxy in sorted order for determinism
-    for obj in root.descendants():
+    for obj in _descendants:
         obj.unproxyParams()
+    timer.phase("unproxyParams")
 
     if options.dump_config:
         ini_file = open(os.path.join(options.outdir, options.dump_config), "w")
         # Print ini sections in sorted order for easier diffing
-        for obj in sorted(root.descendants(), key=lambda o: o.path()):
+        for obj in sorted(_descendants, key=lambda o: o.path()):
             obj.print_ini(ini_file)
         ini_file.close()
 
@@ -115,31 +159,37 @@ def instantiate(ckpt_dir=None):
     if options.dot_config:
         do_dot(root, options.outdir, options.dot_config)
         do_ruby_dot(root, options.outdir, options.dot_config)
+    timer.phase("config output")
 
     # Initialize the global statistics
     stats.initSimStats()
 
     # Create the C++ sim objects and connect ports
-    for obj in root.descendants():
+    for obj in _descendants:
         obj.createCCObject()
-    for obj in root.descendants():
+    timer.phase("createCCObject")
+    for obj in _descendants:
         obj.connectPorts()
+    timer.phase("connectPorts")
 
     # Do a second pass to finish initializing the sim objects
-    for obj in root.descendants():
+    for obj in _descendants:
         obj.init()
+    timer.phase("init")
 
     # Do a third pass to initialize statistics
-    stats._bindStatHierarchy(root)
+    stats._bindStatHierarchy(root, _descendants)
     root.regStats()
+    timer.phase("regStats")
 
     # Do a fourth pass to initialize probe points
-    for obj in root.descendants():
+    for obj in _descendants:
         obj.regProbePoints()
 
     # Do a fifth pass to connect probe listeners
-    for obj in root.descendants():
+    for obj in _descendants:
         obj.regProbeListeners()
+    timer.phase("probes")
 
     # We want to generate the DVFS diagram for the system. This can only be
     # done once all of the CPP objects have been created and initialised so
@@ -149,21 +199,27 @@ def instantiate(ckpt_dir=None):
 
     # We're done registering statistics.  Enable the stats package now.
     stats.enable()
+    timer.phase("stats enable")
 
     # Restore checkpoint (if any)
     if ckpt_dir:
         _drain_manager.preCheckpointRestore()
         ckpt = _m5.core.getCheckpoint(ckpt_dir)
-        for obj in root.descendants():
+        for obj in _descendants:
             obj.loadState(ckpt)
+        timer.phase("loadState")
     else:
-        for obj in root.descendants():
+        for obj in _descendants:
             obj.initState()
+        timer.phase("initState")
 
     # Check to see if any of the stat events are in the past after resuming from
     # a checkpoint, If so, this call will shift them to be at a valid time.
     updateStatEvents()
 
+    if options.config_timing:
+        timer.write(os.path.join(options.outdir, options.config_timing))
+
 
 need_startup = True
 
@@ -176,8 +232,7 @@ def simulate(*args, **kwargs):
         fatal("m5.instantiate() must be called before m5.simulate().")
 
     if need_startup:
-        root = objects.Root.getInstance()
-        for obj in root.descendants():
+        for obj in _descendants:
             obj.startup()
         need_startup = False
 
@@ -299,12 +354,12 @@ def drain():
 
 
 def memWriteback(root):
-    for obj in root.descendants():
+    for obj in _get_descendants(root):
         obj.memWriteback()
 
 
 def memInvalidate(root):
-    for obj in root.descendants():
+    for obj in _get_descendants(root):
         obj.memInvalidate()
 
 
@@ -411,7 +466,7 @@ def switchCpus(system, cpuList, verbose=True):
 
 
 def notifyFork(root):
-    for obj in root.descendants():
+    for obj in _get_descendants(root):
         obj.notifyFork()
 
 
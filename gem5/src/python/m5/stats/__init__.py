@@ -269,16 +269,20 @@ def _visit_stats(visitor, root=None):
     _visit_groups(for_each_stat, root=root)
 
 
-def _bindStatHierarchy(root):
-    def _bind_obj(name, obj):
+def _bindStatHierarchy(root, descendants=None):
+    """Add the stats group of every SimObject under root to the closest
+    ancestor that has one. descendants saves walking the hierarchy if
+    root.descendants() is already at hand."""
+
+    def _bind_obj(parent, name, obj):
         if isNullPointer(obj):
             return
         if m5.SimObject.isSimObjectVector(obj):
             if len(obj) == 1:
-                _bind_obj(name, obj[0])
+                _bind_obj(parent, name, obj[0])
             else:
                 for idx, obj in enumerate(obj):
-                    _bind_obj(f"{name}{idx}", obj)
+                    _bind_obj(parent, f"{name}{idx}", obj)
         else:
             # We need this check because not all obj.getCCObject() is an
             # instance of Stat::Group. For example, sc_core::sc_module, the C++
@@ -286,17 +290,17 @@ def _bindStatHierarchy(root):
             # it will cause a type error if obj is a SystemC_ScModule when
             # calling addStatGroup().
             if isinstance(obj.getCCObject(), _m5.stats.Group):
-                parent = root
                 while parent:
                     if hasattr(parent, "addStatGroup"):
                         parent.addStatGroup(name, obj.getCCObject())
                         break
                     parent = parent.get_parent()
 
-            _bindStatHierarchy(obj)
-
-    for name, obj in root._children.items():
-        _bind_obj(name, obj)
+    if descendants is None:
+        descendants = root.descendants()
+    for parent in descendants:
+        for name, obj in parent._children.items():
+            _bind_obj(parent, name, obj)
 
 
 names = []
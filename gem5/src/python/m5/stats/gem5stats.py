@@ -33,7 +33,7 @@ from datetime import datetime
 from typing import IO, List, Union
 
 import _m5.stats
-from m5.objects import *
+from m5.objects import Root, SimObject
 from m5.ext.pystats.group import *
 from m5.ext.pystats.simstat import *
 from m5.ext.pystats.statistic import *
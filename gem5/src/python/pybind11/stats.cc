@@ -123,7 +123,15 @@ pybind_init_stats(py::module_ &m_native)
         .def("processDumpQueue", &statistics::processDumpQueue)
         .def("enable", &statistics::enable)
         .def("enabled", &statistics::enabled)
-        .def("statsList", &statistics::statsList)
+        .def("statsList", []() -> std::vector<py::object> {
+                auto &stats = statistics::statsList();
+                std::vector<py::object> py_stats;
+                py_stats.reserve(stats.size());
+                std::transform(stats.begin(), stats.end(),
+                               std::back_inserter(py_stats),
+                               cast_stat_info);
+                return py_stats;
+            })
         ;
 
     py::class_<statistics::Output>(m, "Output")
@@ -268,7 +268,10 @@ Tick get_max_tick()
 void
 terminateEventQueueThreads()
 {
-    simulatorThreads->terminateThreads();
+    // There are no threads before the first call to simulate(), e.g. when
+    // forking straight after m5.instantiate()
+    if (simulatorThreads)
+        simulatorThreads->terminateThreads();
 }
 
 
@@ -0,0 +1,160 @@
+# Copyright (c) 2026 The gem5 Authors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), os.pardir, os.pardir, os.pardir, "configs"
+    ),
+)
+
+from topologies.FatTree import FatTree, check_route_trace, fattree_routes
+
+PODS = [4, 6, 8]
+
+
+class LinkTable:
+    """Stands in for a GarnetNetwork, keeping the internal link table."""
+
+    def set_int_link_table(self, rows, first_link_id):
+        self.rows = rows
+
+
+def wiring(k):
+    """{(router, outport): neighbour} of the k-pod FatTree built by
+    FatTree.makeTopology()."""
+    options = SimpleNamespace(
+        num_cpus=k * k // 2,
+        num_pods=k,
+        link_latency=1,
+        router_latency=1,
+        network="garnet",
+    )
+    network = LinkTable()
+    FatTree(list(range(options.num_cpus))).makeTopology(
+        options, network, None, SimpleNamespace, SimpleNamespace
+    )
+    return {(src, outport): dst for src, dst, outport, *_ in network.rows}
+
+
+def layer(k, router):
+    """0 for edge, 1 for aggregation and 2 for core routers."""
+    return min(router // (k * k // 2), 2)
+
+
+class FatTreeRoutesTestSuite(unittest.TestCase):
+    def test_deterministic_routes(self):
+        # Two hops within a pod, four across pods
+        for k in PODS:
+            routes = fattree_routes(k)
+            links = wiring(k)
+            for src in range(k * k // 2):
+                for dest in range(k * k // 2):
+                    router = src
+                    hops = 0
+                    while router != dest and hops <= 4:
+                        outport, _ = routes[router][dest]
+                        self.assertIn((router, outport), links)
+                        router = links[(router, outport)]
+                        hops += 1
+                    self.assertEqual(router, dest)
+                    same_pod = src // (k // 2) == dest // (k // 2)
+                    if src != dest:
+                        self.assertEqual(hops, 2 if same_pod else 4)
+
+    def test_adaptive_routes(self):
+        # Every upward choice still reaches the destination in four hops
+        for k in PODS:
+            routes = fattree_routes(k)
+            links = wiring(k)
+            for src in range(k * k // 2):
+                for dest in range(k * k // 2):
+                    paths = [(src, 0)]
+                    while paths:
+                        router, hops = paths.pop()
+                        if router == dest:
+                            continue
+                        self.assertLess(hops, 4)
+                        outport, up = routes[router][dest]
+                        for port in up or [outport]:
+                            paths.append((links[(router, port)], hops + 1))
+
+    def test_up_ports(self):
+        for k in PODS:
+            links = wiring(k)
+            for router, table in fattree_routes(k).items():
+                self.assertNotIn(router, table)
+                for dest, (outport, up) in table.items():
+                    next_layer = layer(k, links[(router, outport)])
+                    if up:
+                        self.assertIn(outport, up)
+                        self.assertEqual(len(up), k // 2)
+                        for port in up:
+                            self.assertEqual(
+                                layer(k, links[(router, port)]),
+                                layer(k, router) + 1,
+                            )
+                    else:
+                        self.assertEqual(next_layer, layer(k, router) - 1)
+
+
+class CheckRouteTraceTestSuite(unittest.TestCase):
+    def trace(self, k):
+        return [
+            f"1000: system.ruby.network.routers{router}: FatTree route: "
+            f"router {router} dest {dest} outport {outport} up {int(bool(up))}"
+            for router, table in fattree_routes(k).items()
+            for dest, (outport, up) in table.items()
+        ]
+
+    def test_full_trace(self):
+        self.assertEqual(check_route_trace(4, self.trace(4)), [])
+
+    def test_missing_route(self):
+        trace = self.trace(4)
+        del trace[0]
+        self.assertEqual(
+            check_route_trace(4, trace), [(0, 1, ("Agg0", True), None)]
+        )
+
+    def test_wrong_route(self):
+        trace = [
+            line.replace("outport Agg0", "outport Agg1")
+            for line in self.trace(4)
+            if "router 0 dest 1 " in line
+        ]
+        trace += [
+            line for line in self.trace(4) if "router 0 dest 1 " not in line
+        ]
+        self.assertEqual(
+            check_route_trace(4, trace),
+            [(0, 1, ("Agg0", True), ("Agg1", True))],
+        )
@@ -0,0 +1,132 @@
+# Copyright (c) 2026 The gem5 Authors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+from collections import Counter
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), os.pardir, os.pardir, os.pardir, "configs"
+    ),
+)
+
+from topologies.FoldedClos import tree_levels, tree_links
+
+# (children, parents): a 4-ary 3-tree, the 3-level FatTree with 4 pods,
+# an oversubscribed two-level tree and a single switch
+TREES = [
+    ([4, 4, 4], [4, 4]),
+    ([2, 2, 4], [2, 2]),
+    ([8, 4], [2]),
+    ([16], []),
+]
+
+
+def level_ranges(children, parents):
+    """Router ids of each level."""
+    ranges = []
+    first_id = 0
+    for num_subtrees, per_subtree in tree_levels(children, parents):
+        num_switches = num_subtrees * per_subtree
+        ranges.append(range(first_id, first_id + num_switches))
+        first_id += num_switches
+    return ranges
+
+
+class TreeLevelsTestSuite(unittest.TestCase):
+    def test_k_ary_n_tree(self):
+        # n * k^(n - 1) switches, k^(n - 1) per level
+        self.assertEqual(
+            tree_levels([4, 4, 4], [4, 4]), [(16, 1), (4, 4), (1, 16)]
+        )
+
+    def test_fattree(self):
+        # k^2 / 2 edge and aggregation switches in k pods, k^2 / 4 core
+        levels = tree_levels([2, 2, 4], [2, 2])
+        self.assertEqual(levels, [(8, 1), (4, 2), (1, 4)])
+
+    def test_bad_counts(self):
+        with self.assertRaises(ValueError):
+            tree_levels([4, 4], [4, 4])
+        with self.assertRaises(ValueError):
+            tree_levels([], [])
+
+
+class TreeLinksTestSuite(unittest.TestCase):
+    def test_link_count(self):
+        for children, parents in TREES:
+            levels = tree_levels(children, parents)
+            expected = sum(n * s * w for (n, s), w in zip(levels, parents))
+            links = list(tree_links(children, parents))
+            self.assertEqual(len(links), expected)
+            self.assertEqual(
+                len(set((c, p) for c, p, _, _ in links)), expected
+            )
+
+    def test_fattree_link_count(self):
+        # k^3 / 4 edge-aggregation and as many aggregation-core links
+        self.assertEqual(len(list(tree_links([2, 2, 4], [2, 2]))), 32)
+
+    def test_adjacent_levels(self):
+        for children, parents in TREES:
+            ranges = level_ranges(children, parents)
+            level_of = {
+                router: l for l, ids in enumerate(ranges) for router in ids
+            }
+            for child, parent, _, _ in tree_links(children, parents):
+                self.assertEqual(level_of[parent], level_of[child] + 1)
+
+    def test_port_symmetry(self):
+        # Every switch below the top uses each of its up ports once, and
+        # every switch above the edge each of its down ports once
+        for children, parents in TREES:
+            ranges = level_ranges(children, parents)
+            links = list(tree_links(children, parents))
+            up_ports = Counter((c, up) for c, _, up, _ in links)
+            down_ports = Counter((p, down) for _, p, _, down in links)
+            self.assertTrue(all(n == 1 for n in up_ports.values()))
+            self.assertTrue(all(n == 1 for n in down_ports.values()))
+            for l, w in enumerate(parents):
+                for router in ranges[l]:
+                    for up in range(w):
+                        self.assertIn((router, up), up_ports)
+                for router in ranges[l + 1]:
+                    for down in range(children[l + 1]):
+                        self.assertIn((router, down), down_ports)
+            self.assertEqual(
+                len(up_ports),
+                sum(len(ranges[l]) * w for l, w in enumerate(parents)),
+            )
+            self.assertEqual(
+                len(down_ports),
+                sum(
+                    len(ranges[l + 1]) * children[l + 1]
+                    for l in range(len(parents))
+                ),
+            )
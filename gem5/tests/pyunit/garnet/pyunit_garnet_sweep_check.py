@@ -0,0 +1,235 @@
+# Copyright (c) 2026 The gem5 Authors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir)
+)
+
+import garnet_sweep
+from garnet_sweep import SweepPoint
+
+
+class Curve:
+    """Synthetic latency-throughput curve of a network that saturates at
+    ``saturation``. As with GarnetSyntheticTraffic, the reception rate is
+    per network cycle, here ``acceptance`` times the injection rate."""
+
+    def __init__(self, saturation, latency=10.0, acceptance=0.5):
+        self.saturation = saturation
+        self.latency = latency
+        self.acceptance = acceptance
+
+    def __call__(self, rate):
+        if rate < self.saturation:
+            return {
+                "average_packet_latency": self.latency,
+                "reception_rate": self.acceptance * rate,
+            }
+        return {
+            "average_packet_latency": 100 * self.latency,
+            "reception_rate": self.acceptance * self.saturation,
+        }
+
+
+def search(curve, probes_per_round, low=0.01, high=1.0, tolerance=0.01):
+    """Run one saturation search on a curve. Returns the saturation found
+    and the rates of every round."""
+    search = garnet_sweep._search_saturation(
+        low, high, tolerance, probes_per_round, 3.0, 0.9
+    )
+    rounds = []
+    rates = next(search)
+    try:
+        while True:
+            rounds.append(rates)
+            rates = search.send([curve(rate) for rate in rates])
+    except StopIteration as done:
+        return done.value, rounds
+
+
+class FakeSweep:
+    """Stands in for garnet_sweep.run_sweep(), with a curve per topology."""
+
+    def __init__(self, curves):
+        self.curves = curves
+        self.calls = []
+
+    def __call__(self, points, jobs=None, **kwargs):
+        points = list(points)
+        self.calls.append(points)
+        return {
+            point: self.curves[point.topology](point.injection_rate)
+            for point in points
+        }
+
+
+def base_point(topology):
+    return SweepPoint(
+        topology=topology,
+        routing_algorithm=0,
+        num_cpus=16,
+        num_dirs=16,
+        injection_rate=0.0,
+    )
+
+
+class IsSaturatedTestSuite(unittest.TestCase):
+    def test_latency(self):
+        stats = {"average_packet_latency": 31.0, "reception_rate": 0.1}
+        self.assertTrue(garnet_sweep.is_saturated(stats, 0.2, 10.0, 0.5))
+        stats["average_packet_latency"] = 29.0
+        self.assertFalse(garnet_sweep.is_saturated(stats, 0.2, 10.0, 0.5))
+
+    def test_acceptance_is_scaled(self):
+        # Half the injection rate per network cycle is all of the load
+        stats = {"average_packet_latency": 10.0, "reception_rate": 0.2}
+        self.assertFalse(garnet_sweep.is_saturated(stats, 0.4, 10.0, 0.5))
+        self.assertTrue(garnet_sweep.is_saturated(stats, 0.4, 10.0, 1.0))
+
+    def test_nothing_received(self):
+        stats = {"average_packet_latency": float("nan"), "reception_rate": 0}
+        self.assertTrue(garnet_sweep.is_saturated(stats, 0.2, 10.0, 0.5))
+
+
+class SearchSaturationTestSuite(unittest.TestCase):
+    def test_within_tolerance(self):
+        for saturation in (0.137, 0.42, 0.815):
+            for probes in (1, 2, 3):
+                found, _ = search(Curve(saturation), probes)
+                self.assertLess(found, saturation)
+                self.assertLessEqual(saturation - found, 0.01)
+
+    def test_probes_per_round(self):
+        for probes in (1, 2, 3):
+            _, rounds = search(Curve(0.42), probes)
+            self.assertEqual(rounds[:2], [[0.01], [1.0]])
+            for rates in rounds[2:]:
+                self.assertLessEqual(len(rates), probes)
+                self.assertEqual(rates, sorted(rates))
+                for rate in rates:
+                    self.assertTrue(0.01 < rate < 1.0)
+
+    def test_one_probe_is_bisection(self):
+        _, rounds = search(Curve(0.42), 1)
+        self.assertEqual(rounds[2:4], [[0.505], [0.258]])
+
+    def test_more_probes_fewer_rounds(self):
+        _, bisection = search(Curve(0.42), 1)
+        _, three_probes = search(Curve(0.42), 3)
+        self.assertLess(len(three_probes), len(bisection))
+
+    def test_never_saturated(self):
+        found, rounds = search(Curve(2.0), 3)
+        self.assertEqual(found, 1.0)
+        self.assertEqual(rounds, [[0.01], [1.0]])
+
+    def test_nothing_received_at_zero_load(self):
+        def curve(rate):
+            return {
+                "average_packet_latency": float("nan"),
+                "reception_rate": 0.0,
+            }
+
+        found, rounds = search(curve, 3)
+        self.assertEqual(found, 0.01)
+        self.assertEqual(rounds, [[0.01]])
+
+    def test_acceptance_limit(self):
+        # The latency stays flat, but the network stops accepting more
+        # than 0.5 * 0.3 per network cycle: that is saturated once less
+        # than 90% of the offered load gets through, i.e. past 0.3 / 0.9
+        def curve(rate):
+            return {
+                "average_packet_latency": 10.0,
+                "reception_rate": 0.5 * min(rate, 0.3),
+            }
+
+        found, _ = search(curve, 3)
+        self.assertLessEqual(found, 0.3 / 0.9)
+        self.assertLessEqual(0.3 / 0.9 - found, 0.01)
+
+
+class FindSaturationsTestSuite(unittest.TestCase):
+    def test_series_in_lockstep(self):
+        curves = {"Mesh_XY": Curve(0.3), "FatTree": Curve(0.7)}
+        bases = [base_point(topology) for topology in curves]
+        sweep = FakeSweep(curves)
+        with mock.patch.object(garnet_sweep, "run_sweep", sweep):
+            saturations, results = garnet_sweep.find_saturations(bases, jobs=8)
+
+        for base in bases:
+            saturation = curves[base.topology].saturation
+            self.assertLess(saturations[base], saturation)
+            self.assertLessEqual(saturation - saturations[base], 0.01)
+
+        # Every round simulates all series that are still searching,
+        # with at most PROBES_PER_ROUND probes each
+        rounds = {
+            topology: len(search(curve, garnet_sweep.PROBES_PER_ROUND)[1])
+            for topology, curve in curves.items()
+        }
+        self.assertEqual(len(sweep.calls), max(rounds.values()))
+        for i, points in enumerate(sweep.calls):
+            for topology in curves:
+                series = [p for p in points if p.topology == topology]
+                if i < rounds[topology]:
+                    self.assertGreater(len(series), 0)
+                else:
+                    self.assertEqual(series, [])
+                self.assertLessEqual(
+                    len(series), garnet_sweep.PROBES_PER_ROUND
+                )
+        self.assertEqual(
+            len(results), sum(len(points) for points in sweep.calls)
+        )
+
+    def test_one_job_is_bisection(self):
+        curves = {"Mesh_XY": Curve(0.3), "FatTree": Curve(0.7)}
+        sweep = FakeSweep(curves)
+        with mock.patch.object(garnet_sweep, "run_sweep", sweep):
+            garnet_sweep.find_saturations(
+                [base_point(topology) for topology in curves], jobs=1
+            )
+        for points in sweep.calls:
+            self.assertLessEqual(len(points), len(curves))
+
+    def test_curve_below_saturation(self):
+        curves = {"Mesh_XY": Curve(0.3)}
+        base = base_point("Mesh_XY")
+        with mock.patch.object(garnet_sweep, "run_sweep", FakeSweep(curves)):
+            saturation, curve = garnet_sweep.sweep_saturation(
+                base, num_points=5, jobs=4
+            )
+        rates = [point.injection_rate for point in curve]
+        self.assertEqual(rates, sorted(rates))
+        step = (saturation - 0.01) / 4
+        for i in range(5):
+            self.assertIn(round(0.01 + step * i, 3), rates)
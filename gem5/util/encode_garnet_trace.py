@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 The gem5 Authors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# This script converts ASCII packet traces into the binary format read
+# by the GarnetTraceTraffic tester (see
+# src/cpu/testers/garnet_trace_traffic/GarnetTraceTraffic.hh).
+#
+# The ASCII trace format uses one line per packet on the format
+# cycle src dest vnet size, e.g.
+# 100 0 3 2 72
+# injects a 72-byte packet from source 0 to destination 3 in vnet 2 at
+# cycle 100. Lines starting with '#' are ignored. The packets of each
+# source must appear in cycle order; sources may be interleaved.
+#
+# The records are grouped per source in memory. Once FLUSH_BYTES of
+# them are buffered, they are appended to one temporary file per
+# source, so neither the trace has to fit in memory nor are more than
+# one of the files open at a time.
+#
+# Usage:
+#   encode_garnet_trace.py <ASCII input> <binary output>
+#   encode_garnet_trace.py --dump <binary input>
+
+import argparse
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+MAGIC = b"GNTRACE1"
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<QQ")
+RECORD = struct.Struct("<QIBBH")
+
+FLUSH_BYTES = 64 << 20
+
+
+def encode(ascii_in, binary_out):
+    tmpdir = tempfile.mkdtemp(prefix="garnet_trace_")
+    sources = {}  # source -> [num records, last cycle]
+    buffered = {}  # source -> records not yet in its temporary file
+    buffered_bytes = 0
+
+    def source_path(src):
+        return os.path.join(tmpdir, str(src))
+
+    def flush():
+        nonlocal buffered_bytes
+        for src, records in buffered.items():
+            with open(source_path(src), "ab") as tmp:
+                tmp.write(records)
+        buffered.clear()
+        buffered_bytes = 0
+
+    try:
+        for lineno, line in enumerate(ascii_in, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                cycle, src, dest, vnet, size = (int(f) for f in line.split())
+            except ValueError:
+                sys.exit(f"line {lineno}: expected 'cycle src dest vnet size'")
+            source = sources.setdefault(src, [0, 0])
+            if cycle < source[1]:
+                sys.exit(
+                    f"line {lineno}: cycle {cycle} of source {src} is "
+                    f"before its previous packet at cycle {source[1]}"
+                )
+            buffered.setdefault(src, bytearray()).extend(
+                RECORD.pack(cycle, dest, vnet, 0, size)
+            )
+            buffered_bytes += RECORD.size
+            source[0] += 1
+            source[1] = cycle
+            if buffered_bytes >= FLUSH_BYTES:
+                flush()
+
+        # Sources without packets get an empty section
+        num_sources = max(sources) + 1 if sources else 0
+        offset = HEADER.size + num_sources * SECTION.size
+        binary_out.write(HEADER.pack(MAGIC, num_sources, 0))
+        for src in range(num_sources):
+            num_records = sources[src][0] if src in sources else 0
+            binary_out.write(SECTION.pack(offset, num_records))
+            offset += num_records * RECORD.size
+        for src in range(num_sources):
+            path = source_path(src)
+            if os.path.exists(path):
+                with open(path, "rb") as tmp:
+                    shutil.copyfileobj(tmp, binary_out)
+            binary_out.write(buffered.get(src, b""))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def dump(binary_in):
+    magic, num_sources, _ = HEADER.unpack(binary_in.read(HEADER.size))
+    if magic != MAGIC:
+        sys.exit("not a Garnet trace")
+    sections = [
+        SECTION.unpack(binary_in.read(SECTION.size))
+        for _ in range(num_sources)
+    ]
+    for src, (offset, num_records) in enumerate(sections):
+        binary_in.seek(offset)
+        for _ in range(num_records):
+            cycle, dest, vnet, _, size = RECORD.unpack(
+                binary_in.read(RECORD.size)
+            )
+            print(cycle, src, dest, vnet, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert an ASCII packet trace for GarnetTraceTraffic"
+    )
+    parser.add_argument(
+        "--dump",
+        action="store_true",
+        help="Print a binary trace in the ASCII format instead",
+    )
+    parser.add_argument("input")
+    parser.add_argument("output", nargs="?")
+    args = parser.parse_args()
+
+    if args.dump:
+        with open(args.input, "rb") as binary_in:
+            dump(binary_in)
+        return
+
+    if args.output is None:
+        parser.error("an output file is needed")
+    with open(args.input, "r") as ascii_in:
+        with open(args.output, "wb") as binary_out:
+            encode(ascii_in, binary_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 The gem5 Authors
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# This script reads the samples GarnetNetwork writes every
+# GarnetNetwork.sample_interval cycles (--sample-interval) into NumPy
+# arrays, e.g. for heatmaps of where a network saturates over time. The
+# file format is described at GarnetNetwork::openSampleFile() in
+# src/mem/ruby/network/garnet/GarnetNetwork.cc.
+#
+# Usage:
+#   garnet_samples.py <sample file>             print the hottest links
+#                                               and routers
+#   garnet_samples.py <sample file> --npz <out> convert to an .npz file
+#
+# or, from Python:
+#   samples = garnet_samples.load("m5out/garnet_samples.bin")
+#   samples.link_flits[:, i]  # flits over link i, per sample
+
+import argparse
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+MAGIC = b"GNSAMPL1"
+HEADER = struct.Struct("<8sIIIIQ")
+LINK = np.dtype([("src", "<i4"), ("dst", "<i4")])
+VC = np.dtype([("router", "<u4"), ("inport", "<u2"), ("vc", "<u2")])
+
+
+@dataclass
+class GarnetSamples:
+    """Samples of one run, one row per sample in the per-sample arrays.
+
+    Routers are indexed by router id, links and VCs in the order of the
+    link_* and vc_* arrays. link_src / link_dst are -1 at a network
+    interface.
+    """
+
+    interval: int  # cycles between two samples
+    cycle_ticks: int
+    link_src: np.ndarray
+    link_dst: np.ndarray
+    vc_router: np.ndarray
+    vc_inport: np.ndarray
+    vc_index: np.ndarray
+    tick: np.ndarray  # (samples,)
+    buffered_flits: np.ndarray  # (samples, routers), at the sample
+    link_flits: np.ndarray  # (samples, links), since the last sample
+    vc_stall_cycles: np.ndarray  # (samples, VCs), since the last sample
+
+    @property
+    def cycle(self):
+        return self.tick // self.cycle_ticks
+
+    @property
+    def link_utilization(self):
+        """Fraction of the cycles each link sent a flit, per sample."""
+        return self.link_flits / self.interval
+
+
+def load(path):
+    """Read a sample file. A record cut short by the end of the
+    simulation is dropped."""
+    with open(path, "rb") as f:
+        data = f.read()
+    (
+        magic,
+        num_routers,
+        num_links,
+        num_vcs,
+        interval,
+        cycle_ticks,
+    ) = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a Garnet sample file")
+
+    offset = HEADER.size
+    links = np.frombuffer(data, LINK, num_links, offset)
+    offset += links.nbytes
+    vcs = np.frombuffer(data, VC, num_vcs, offset)
+    offset += vcs.nbytes
+
+    record = np.dtype(
+        [
+            ("tick", "<u8"),
+            ("buffered", "<u4", (num_routers,)),
+            ("link", "<u4", (num_links,)),
+            ("stall", "<u4", (num_vcs,)),
+        ]
+    )
+    num_samples = (len(data) - offset) // record.itemsize
+    records = np.frombuffer(data, record, num_samples, offset)
+
+    return GarnetSamples(
+        interval=interval,
+        cycle_ticks=cycle_ticks,
+        link_src=links["src"].copy(),
+        link_dst=links["dst"].copy(),
+        vc_router=vcs["router"].copy(),
+        vc_inport=vcs["inport"].copy(),
+        vc_index=vcs["vc"].copy(),
+        tick=records["tick"].copy(),
+        buffered_flits=records["buffered"].reshape(num_samples, -1).copy(),
+        link_flits=records["link"].reshape(num_samples, -1).copy(),
+        vc_stall_cycles=records["stall"].reshape(num_samples, -1).copy(),
+    )
+
+
+def save_npz(samples, path):
+    np.savez_compressed(path, **vars(samples))
+
+
+def summary(samples, top=10):
+    print(
+        f"{len(samples.tick)} samples every {samples.interval} cycles, "
+        f"{samples.buffered_flits.shape[1]} routers, "
+        f"{len(samples.link_src)} links, {len(samples.vc_router)} VCs"
+    )
+    if not len(samples.tick):
+        return
+
+    def end(router):
+        return "NI" if router < 0 else f"router {router}"
+
+    utilization = samples.link_utilization
+    print("\nBusiest links (mean / peak utilization):")
+    for link in np.argsort(-utilization.mean(axis=0))[:top]:
+        print(
+            f"  link {link:5d} {end(samples.link_src[link]):>11} -> "
+            f"{end(samples.link_dst[link]):<11} "
+            f"{utilization[:, link].mean():6.3f} "
+            f"{utilization[:, link].max():6.3f}"
+        )
+
+    buffered = samples.buffered_flits
+    print("\nFullest routers (mean / peak buffered flits):")
+    for router in np.argsort(-buffered.mean(axis=0))[:top]:
+        print(
+            f"  router {router:5d} {buffered[:, router].mean():8.1f} "
+            f"{buffered[:, router].max():6d}"
+        )
+
+    # Stall cycles summed over the VCs of each router
+    stalls = np.zeros(buffered.shape[1])
+    np.add.at(stalls, samples.vc_router, samples.vc_stall_cycles.sum(axis=0))
+    print("\nMost stalled routers (switch allocation stall cycles):")
+    for router in np.argsort(-stalls)[:top]:
+        print(f"  router {router:5d} {int(stalls[router]):12d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Read the samples of a Garnet network"
+    )
+    parser.add_argument("input")
+    parser.add_argument(
+        "--npz", metavar="FILE", help="Save the samples as a NumPy .npz file"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Entries per summary table"
+    )
+    args = parser.parse_args()
+
+    samples = load(args.input)
+    if args.npz:
+        save_npz(samples, args.npz)
+    else:
+        summary(samples, args.top)
+
+
+if __name__ == "__main__":
+    main()